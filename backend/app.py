@@ -13,7 +13,9 @@ from routes.product_routes import product_bp
 from routes.customer_routes import customer_bp
 from routes.cart_routes import cart_bp
 from routes.order_routes import order_bp
-from routes.forecast_routes import forecast_bp
+from routes.forecast_routes import (
+    forecast_bp, start_forecast_scheduler, start_model_warmup, get_model_readiness
+)
 from routes.analytics_routes import analytics_bp
 
 
@@ -43,11 +45,34 @@ def create_app():
     app.register_blueprint(forecast_bp, url_prefix="/api/forecast")
     app.register_blueprint(analytics_bp, url_prefix="/api/analytics")
 
+    # Load and warm the forecast models in the background
+    if os.getenv("MODEL_WARMUP_ENABLED", "true").lower() == "true":
+        start_model_warmup()
+
+    # Precompute the standard forecasts after the daily data cutoff
+    # (one worker per store holds the scheduler lock; the others skip it)
+    if os.getenv("FORECAST_SCHEDULER_ENABLED", "true").lower() == "true":
+        start_forecast_scheduler()
+
     # Health Check
     @app.route('/health')
     def health():
         return jsonify({"status": "healthy"}), 200
 
+    # Liveness: the process is up and serving requests
+    @app.route('/health/live')
+    def health_live():
+        return jsonify({"status": "alive"}), 200
+
+    # Readiness: models are loaded and warm, or load on first request when
+    # warm-up is disabled (503 until then)
+    @app.route('/health/ready')
+    def health_ready():
+        models = get_model_readiness()
+        if models['ready']:
+            return jsonify({"status": "ready", "models": models}), 200
+        return jsonify({"status": "not_ready", "models": models}), 503
+
     # Root API endpoint
     @app.route('/api')
     def api_root():
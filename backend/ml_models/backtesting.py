@@ -0,0 +1,373 @@
+"""
+Backtesting Module for Sales Forecasting
+Rolling-origin backtests: the ensemble forecasts from many historical cutoffs
+(as if the data ended there) and is scored against what actually sold
+
+Usage (from backend/):
+    python -m ml_models.backtesting                                  # 12 weekly cutoffs, 7-day horizon
+    python -m ml_models.backtesting --cutoffs 52 --model-dir ml_models/saved_models_incr_20251114_020000
+"""
+
+import argparse
+import json
+import multiprocessing
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+
+import pandas as pd
+
+from .feature_store import load_features
+from .forecast_engine import (
+    load_models, generate_future_dates, prepare_future_features_with_lags, predict_recursive, HISTORY_WINDOW
+)
+from .ensemble_inference import predict_ensemble
+from .save_trained_models import available_cores, DEFAULT_CSV_PATH, DEFAULT_MODEL_DIR, TRAINING_REPORT_NAME
+from .benchmark_pipeline import get_commit_id
+
+
+# ============================================
+# CONFIGURATION
+# ============================================
+
+BACKTEST_RESULTS_DIR = os.getenv(
+    'BACKTEST_RESULTS_DIR',
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), 'backtest_results')
+)
+
+BACKTEST_HORIZON = 7
+BACKTEST_CUTOFFS = 12
+BACKTEST_STEP_DAYS = 7
+
+# Everything the future features and the scoring read from the history
+# (workers receive only these columns, not the ~100 feature columns)
+HISTORY_COLUMNS = ['sale_date', 'product_name', 'category', 'season_affinity', 'price', 'cost_price', 'quantity_sold']
+
+
+# ============================================
+# CUTOFFS
+# ============================================
+
+def select_cutoffs(first_date, last_date, num_cutoffs=BACKTEST_CUTOFFS, step_days=BACKTEST_STEP_DAYS,
+                   horizon=BACKTEST_HORIZON):
+    """
+    Cutoff dates, step_days apart, ending where the last full horizon fits
+
+    Cutoffs with less than HISTORY_WINDOW days of history before them are
+    left out (their lag features would be mostly empty).
+
+    Returns:
+    --------
+    list of pandas.Timestamp in ascending order
+    """
+    first_date, last_date = pd.Timestamp(first_date), pd.Timestamp(last_date)
+    latest = last_date - pd.Timedelta(days=horizon)
+    earliest = first_date + pd.Timedelta(days=HISTORY_WINDOW - 1)
+    cutoffs = [latest - pd.Timedelta(days=step_days * i) for i in range(num_cutoffs)]
+    cutoffs = sorted(cutoff for cutoff in cutoffs if cutoff >= earliest)
+    if not cutoffs:
+        raise ValueError(
+            f"Not enough history for a {horizon}-day backtest ({first_date.date()} to {last_date.date()})"
+        )
+    return cutoffs
+
+
+# ============================================
+# ONE CUTOFF
+# ============================================
+
+def forecast_at_cutoff(history, cutoff, models, horizon=BACKTEST_HORIZON, recursive=False):
+    """
+    Forecast the horizon after cutoff from the history up to cutoff only
+
+    Builds the future features exactly like generate_forecast() does on a
+    CSV that ends at cutoff.
+
+    Parameters:
+    -----------
+    history : pandas.DataFrame
+        Sales history (at least HISTORY_COLUMNS), including dates after cutoff
+    cutoff : pandas.Timestamp
+        Last date treated as known
+    models : dict
+        Output of load_models()
+
+    Returns:
+    --------
+    pandas.DataFrame with sale_date, product_name, category, predicted_quantity
+    """
+    past = history[history['sale_date'] <= cutoff]
+    product_info = past.groupby('product_name').agg({
+        'category': 'first',
+        'season_affinity': 'first',
+        'price': 'first',
+        'cost_price': 'first'
+    }).to_dict('index')
+
+    future_df = generate_future_dates(cutoff, horizon, product_info)
+    future_df_features = prepare_future_features_with_lags(future_df, past)
+    feature_cols = models['feature_cols']
+    for col in set(feature_cols) - set(future_df_features.columns):
+        future_df_features[col] = 0
+
+    if recursive:
+        predictions = predict_recursive(future_df_features, past, models, feature_cols)
+    else:
+        predictions, _ = predict_ensemble(models, future_df_features[feature_cols].fillna(0))
+
+    forecast = future_df_features[['sale_date', 'product_name', 'category']].copy()
+    forecast['predicted_quantity'] = predictions.round().astype(int)
+    return forecast
+
+
+def backtest_cutoff(history, cutoff, models, horizon=BACKTEST_HORIZON, recursive=False):
+    """
+    Forecast from cutoff and join the actual sales of the horizon
+
+    Forecast days without a sales record are not scored.
+
+    Returns:
+    --------
+    pandas.DataFrame with cutoff, sale_date, horizon_day, product_name,
+    category, forecast and actual
+    """
+    forecast = forecast_at_cutoff(history, cutoff, models, horizon, recursive)
+    actuals = history[['sale_date', 'product_name', 'quantity_sold']]
+    scored = forecast.merge(actuals, on=['sale_date', 'product_name'], how='inner')
+    scored.insert(0, 'cutoff', cutoff)
+    scored.insert(2, 'horizon_day', (scored['sale_date'] - cutoff).dt.days)
+    return scored.rename(columns={'predicted_quantity': 'forecast', 'quantity_sold': 'actual'})
+
+
+# Per-process state of pool workers: history and models are sent once per
+# worker, not once per cutoff
+_WORKER = {}
+
+
+def _init_worker(history, model_dir, horizon, recursive):
+    _WORKER.update(
+        history=history, models=load_models(model_dir), horizon=horizon, recursive=recursive
+    )
+
+
+def _run_cutoff(cutoff):
+    return backtest_cutoff(_WORKER['history'], cutoff, _WORKER['models'], _WORKER['horizon'], _WORKER['recursive'])
+
+
+# ============================================
+# ERROR TABLES
+# ============================================
+
+def error_table(scored, by=None):
+    """
+    WAPE and bias of scored forecasts, overall or per group
+
+    WAPE = sum |forecast - actual| / sum actual, bias = (sum forecast - sum
+    actual) / sum actual, both in percent (positive bias: over-forecast).
+    Both are NaN for groups that sold nothing.
+
+    Parameters:
+    -----------
+    scored : pandas.DataFrame
+        backtest_cutoff() output (any number of cutoffs)
+    by : str or list (optional)
+        Grouping columns (e.g. 'category', ['product_name', 'category'])
+
+    Returns:
+    --------
+    pandas.DataFrame with rows, actual, forecast, abs_error, mae, wape, bias
+    """
+    totals = pd.DataFrame({
+        'rows': 1,
+        'actual': scored['actual'].astype(float),
+        'forecast': scored['forecast'].astype(float),
+        'abs_error': (scored['forecast'] - scored['actual']).abs().astype(float)
+    })
+    if by is None:
+        table = totals.sum().to_frame().T
+    else:
+        by = [by] if isinstance(by, str) else list(by)
+        table = totals.groupby([scored[col] for col in by]).sum().reset_index()
+
+    actual = table['actual'].where(table['actual'] > 0)
+    table['mae'] = table['abs_error'] / table['rows']
+    table['wape'] = table['abs_error'] / actual * 100
+    table['bias'] = (table['forecast'] - table['actual']) / actual * 100
+    table['rows'] = table['rows'].astype(int)
+    return table
+
+
+# ============================================
+# BACKTEST
+# ============================================
+
+def _training_end(model_dir):
+    """Last date the models were trained on (training_report.json), if recorded"""
+    path = os.path.join(model_dir, TRAINING_REPORT_NAME)
+    if not os.path.exists(path):
+        return None
+    with open(path) as f:
+        return pd.Timestamp(json.load(f)['data']['last_date'])
+
+
+def run_backtest(csv_path=DEFAULT_CSV_PATH, model_dir=DEFAULT_MODEL_DIR, cutoffs=None,
+                 num_cutoffs=BACKTEST_CUTOFFS, step_days=BACKTEST_STEP_DAYS, horizon=BACKTEST_HORIZON,
+                 recursive=False, workers=None):
+    """
+    Rolling-origin backtest of one model version
+
+    Features are built once (feature store); each cutoff only masks the
+    history after it. With more than one worker the cutoffs are scored in
+    parallel processes, each loading the models once.
+
+    Parameters:
+    -----------
+    csv_path : str
+        Sales history CSV
+    model_dir : str
+        Model version to evaluate
+    cutoffs : list (optional)
+        Cutoff dates (default: select_cutoffs() with num_cutoffs / step_days)
+    horizon : int
+        Days forecast after each cutoff
+    recursive : bool
+        Feed each day's predictions into the next day's lags
+    workers : int (optional)
+        Worker processes (default: one per core, at most one per cutoff)
+
+    Returns:
+    --------
+    dict with 'predictions' (scored rows), 'overall' and the error tables
+    'by_cutoff', 'by_horizon_day', 'by_category', 'by_product', plus run
+    settings and timings. Cutoffs inside the models' training data (when the
+    version has a training_report.json) are flagged in_training: their
+    errors are in-sample.
+    """
+    start = time.perf_counter()
+    df_features = load_features(csv_path)
+    history = df_features[HISTORY_COLUMNS].copy()
+    features_seconds = time.perf_counter() - start
+
+    if cutoffs is None:
+        cutoffs = select_cutoffs(history['sale_date'].min(), history['sale_date'].max(), num_cutoffs, step_days, horizon)
+    cutoffs = sorted(pd.Timestamp(cutoff) for cutoff in cutoffs)
+    workers = min(workers or available_cores(), len(cutoffs))
+
+    print(f"Backtesting {len(cutoffs)} cutoffs ({cutoffs[0].date()} to {cutoffs[-1].date()}), "
+          f"{horizon}-day horizon, {workers} worker(s)...")
+    scoring_start = time.perf_counter()
+    if workers > 1:
+        # spawn: forking after OpenMP has started in the parent can deadlock
+        context = multiprocessing.get_context('spawn')
+        with ProcessPoolExecutor(max_workers=workers, mp_context=context, initializer=_init_worker,
+                                 initargs=(history, model_dir, horizon, recursive)) as executor:
+            frames = list(executor.map(_run_cutoff, cutoffs))
+    else:
+        models = load_models(model_dir)
+        frames = [backtest_cutoff(history, cutoff, models, horizon, recursive) for cutoff in cutoffs]
+    scored = pd.concat(frames, ignore_index=True)
+    scoring_seconds = time.perf_counter() - scoring_start
+
+    by_cutoff = error_table(scored, 'cutoff')
+    training_end = _training_end(model_dir)
+    by_cutoff['in_training'] = (
+        by_cutoff['cutoff'] < training_end if training_end is not None else None
+    )
+    if training_end is not None and by_cutoff['in_training'].any():
+        print(f"[WARNING] {int(by_cutoff['in_training'].sum())} cutoff(s) fall inside the training data "
+              f"(up to {training_end.date()}); their errors are in-sample")
+
+    overall = error_table(scored).iloc[0]
+    print(f"[OK] WAPE {overall['wape']:.2f}%, bias {overall['bias']:+.2f}% "
+          f"over {int(overall['rows']):,} forecasts in {scoring_seconds:.1f}s")
+
+    return {
+        'predictions': scored,
+        'overall': {key: float(value) for key, value in overall.items()},
+        'by_cutoff': by_cutoff,
+        'by_horizon_day': error_table(scored, 'horizon_day'),
+        'by_category': error_table(scored, 'category'),
+        'by_product': error_table(scored, ['product_name', 'category']),
+        'model_dir': os.path.abspath(model_dir),
+        'horizon': horizon,
+        'recursive': recursive,
+        'workers': workers,
+        'seconds': {
+            'features': round(features_seconds, 2),
+            'cutoffs': round(scoring_seconds, 2),
+            'total': round(time.perf_counter() - start, 2)
+        }
+    }
+
+
+# ============================================
+# STORED RESULTS
+# ============================================
+
+def save_backtest(result, results_dir=None):
+    """
+    Write the error tables to <results_dir>/<commit>_<model>.json
+
+    Returns:
+    --------
+    str : path of the written file
+    """
+    results_dir = results_dir or BACKTEST_RESULTS_DIR
+    os.makedirs(results_dir, exist_ok=True)
+
+    def records(table):
+        table = table.copy()
+        for col in table.columns:
+            if pd.api.types.is_datetime64_any_dtype(table[col]):
+                table[col] = table[col].dt.strftime('%Y-%m-%d')
+        return json.loads(table.to_json(orient='records'))
+
+    payload = {
+        'commit': get_commit_id(),
+        'created_at': datetime.now().isoformat(timespec='seconds'),
+        **{key: result[key] for key in ('model_dir', 'horizon', 'recursive', 'workers', 'seconds', 'overall')},
+        **{key: records(result[key]) for key in ('by_cutoff', 'by_horizon_day', 'by_category', 'by_product')}
+    }
+    path = os.path.join(results_dir, f"{payload['commit']}_{os.path.basename(result['model_dir'])}.json")
+    with open(path, 'w') as f:
+        json.dump(payload, f, indent=2)
+    return path
+
+
+# ============================================
+# MAIN
+# ============================================
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Rolling-origin backtest of the forecasting ensemble')
+    parser.add_argument('--csv', default=DEFAULT_CSV_PATH, help='Sales history CSV')
+    parser.add_argument('--model-dir', default=DEFAULT_MODEL_DIR, help='Model version to evaluate')
+    parser.add_argument('--cutoffs', type=int, default=BACKTEST_CUTOFFS, help='Number of cutoffs')
+    parser.add_argument('--step-days', type=int, default=BACKTEST_STEP_DAYS, help='Days between cutoffs')
+    parser.add_argument('--horizon', type=int, default=BACKTEST_HORIZON, help='Days forecast per cutoff')
+    parser.add_argument('--recursive', action='store_true', help='Recursive multi-step prediction')
+    parser.add_argument('--workers', type=int, default=None, help='Worker processes (default: one per core)')
+    parser.add_argument('--results-dir', default=None)
+    args = parser.parse_args(argv)
+
+    result = run_backtest(
+        args.csv, args.model_dir, num_cutoffs=args.cutoffs, step_days=args.step_days,
+        horizon=args.horizon, recursive=args.recursive, workers=args.workers
+    )
+    float_format = lambda x: f"{x:.2f}"
+    print("\nBy category:")
+    print(result['by_category'].to_string(index=False, float_format=float_format))
+    print("\nWorst products (WAPE):")
+    print(result['by_product'].sort_values('wape', ascending=False).head(10).to_string(index=False, float_format=float_format))
+    print("\nBy cutoff:")
+    print(result['by_cutoff'].to_string(index=False, float_format=float_format))
+
+    path = save_backtest(result, args.results_dir)
+    print(f"\n[OK] Saved backtest results to {path}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
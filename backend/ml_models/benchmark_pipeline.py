@@ -0,0 +1,408 @@
+"""
+Pipeline Benchmark Module for Sales Forecasting
+Times each forecasting stage on synthetic data at increasing SKU counts and
+stores the results per commit so regressions can be compared
+
+Usage (from backend/):
+    python -m ml_models.benchmark_pipeline                      # 50, 500, 5000 SKUs
+    python -m ml_models.benchmark_pipeline --skus 50 500 --compare <commit>
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import signal
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import tracemalloc
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+from .data_loader import read_sales_csv, to_plain_frame
+from .feature_engineering import create_features
+from .feature_store import isolated_caches, store_features
+from .forecast_engine import generate_forecast, generate_future_dates, load_models, prepare_future_features_with_lags
+from .inventory_reorder import calculate_reorder_recommendations
+from .synthetic_data import write_sales_csv
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+
+# ============================================
+# CONFIGURATION
+# ============================================
+
+BENCHMARK_RESULTS_DIR = os.getenv(
+    'BENCHMARK_RESULTS_DIR',
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), 'benchmark_results')
+)
+
+BENCHMARK_SKU_COUNTS = [50, 500, 5000]
+
+# Half a year of history: well past the longest lag/rolling window (30 days)
+# while keeping 5,000 SKUs within a few GB
+BENCHMARK_YEARS = 0.5
+BENCHMARK_FORECAST_DAYS = 7
+
+# Wall-time cap per stage (all of its runs); a stage over it is recorded as
+# timed out and the stages that need its output are skipped
+STAGE_TIME_LIMIT = float(os.getenv('BENCHMARK_STAGE_TIME_LIMIT', 300))
+
+# Stages this much slower (or larger) than the baseline are reported as
+# regressions; single runs vary by ~10%, use --repeat for tighter checks
+REGRESSION_THRESHOLD = 0.20
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+# ============================================
+# MEASUREMENT
+# ============================================
+
+class StageTimeout(Exception):
+    """A benchmark stage ran past its time limit"""
+
+
+@contextlib.contextmanager
+def _time_limit(seconds):
+    """Raise StageTimeout in the block after `seconds` (main thread with SIGALRM only)"""
+    if not seconds or not hasattr(signal, 'setitimer') or threading.current_thread() is not threading.main_thread():
+        yield
+        return
+
+    def _expired(signum, frame):
+        raise StageTimeout(f"stage exceeded {seconds:g}s")
+
+    previous = signal.signal(signal.SIGALRM, _expired)
+    signal.setitimer(signal.ITIMER_REAL, seconds)
+    try:
+        yield
+    finally:
+        signal.setitimer(signal.ITIMER_REAL, 0)
+        signal.signal(signal.SIGALRM, previous)
+
+
+def measure(fn, repeat=1, quiet=True, time_limit=None):
+    """
+    Wall time and peak memory of a stage
+
+    The stage runs `repeat` times untraced (best time is kept), then once
+    more under tracemalloc for the peak. tracemalloc sees Python and NumPy
+    allocations but not Arrow buffers (pandas string columns), so peak_mb
+    is a lower bound; compare it between commits, not to RSS.
+
+    Raises:
+    -------
+    StageTimeout if all runs together take longer than time_limit seconds
+
+    Returns:
+    --------
+    tuple (result of the last run, seconds, peak_mb)
+    """
+    output = io.StringIO() if quiet else None
+    with contextlib.redirect_stdout(output) if quiet else contextlib.nullcontext(), _time_limit(time_limit):
+        best = None
+        for _ in range(max(repeat, 1)):
+            start = time.perf_counter()
+            fn()
+            elapsed = time.perf_counter() - start
+            best = elapsed if best is None else min(best, elapsed)
+
+        tracemalloc.start()
+        try:
+            result = fn()
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+
+    return result, best, peak / 1024 ** 2
+
+
+def _max_rss_mb():
+    """Process high-water RSS so far (None where unsupported)"""
+    if resource is None:
+        return None
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports KiB, macOS bytes
+    return rss / 1024 ** 2 if sys.platform == 'darwin' else rss / 1024
+
+
+# ============================================
+# BENCHMARKS
+# ============================================
+
+def benchmark_scale(num_skus, work_dir, models=None, years=BENCHMARK_YEARS,
+                    forecast_days=BENCHMARK_FORECAST_DAYS, repeat=1, seed=0, stage_time_limit=STAGE_TIME_LIMIT):
+    """
+    Time every pipeline stage for one SKU count
+
+    Parameters:
+    -----------
+    num_skus : int
+        Number of synthetic products
+    work_dir : str
+        Directory for the synthetic CSV and caches
+    models : dict (optional)
+        load_models() output; without it the generate_forecast and
+        calculate_reorder_recommendations stages are skipped
+    years, forecast_days, repeat, seed
+        History length, forecast horizon, timed runs per stage, data seed
+    stage_time_limit : float (optional)
+        Seconds per stage before it is recorded as timed out
+
+    Returns:
+    --------
+    dict with skus, history_rows and one entry per stage (seconds, peak_mb,
+    rows, status). Timed-out stages and the stages that need their output
+    have status 'timed_out' / 'skipped' and no measurements.
+    """
+    csv_path = os.path.join(work_dir, f'synthetic_{num_skus}_skus.csv')
+    df = write_sales_csv(csv_path, num_skus=num_skus, years=years, seed=seed)
+    stages = []
+
+    def record(stage, fn, *inputs):
+        entry = {'stage': stage, 'seconds': None, 'peak_mb': None, 'rows': None}
+        if any(value is None for value in inputs):
+            stages.append({**entry, 'status': 'skipped'})
+            print(f"   {stage:<36} {'skipped':>10}")
+            return None
+        try:
+            result, seconds, peak_mb = measure(fn, repeat, time_limit=stage_time_limit)
+        except StageTimeout:
+            stages.append({**entry, 'status': 'timed_out'})
+            print(f"   {stage:<36} {'timed out':>10} (>{stage_time_limit:g}s)")
+            return None
+        stages.append({
+            **entry,
+            'seconds': round(seconds, 4),
+            'peak_mb': round(peak_mb, 1),
+            'rows': int(len(result)),
+            'status': 'ok'
+        })
+        print(f"   {stage:<36} {seconds:9.3f}s {peak_mb:9.1f} MB")
+        return result
+
+    print(f"\n{num_skus:,} SKUs ({len(df):,} history rows)")
+
+    sales = record('read_sales_csv', lambda: read_sales_csv(csv_path, use_cache=False))
+    df_features = record('create_features', lambda: create_features(to_plain_frame(sales)), sales)
+
+    product_info, future_df, last_date = None, None, None
+    if df_features is not None:
+        product_info = df_features.groupby('product_name').agg({
+            'category': 'first',
+            'season_affinity': 'first',
+            'price': 'first',
+            'cost_price': 'first'
+        }).to_dict('index')
+        last_date = df_features['sale_date'].max()
+    future_df = record('generate_future_dates',
+                       lambda: generate_future_dates(last_date, forecast_days, product_info), product_info)
+    record('prepare_future_features_with_lags',
+           lambda: prepare_future_features_with_lags(future_df.copy(), df_features), future_df)
+
+    if models is not None:
+        # Forecasts are served from the feature store; store the features
+        # computed above instead of running create_features again
+        if df_features is not None:
+            store_features(csv_path, df_features)
+        forecast_df = record('generate_forecast',
+                             lambda: generate_forecast(csv_path, forecast_days, models), df_features)
+
+        stock = None
+        if product_info is not None:
+            rng = np.random.default_rng(seed)
+            stock = dict(zip(product_info, rng.integers(0, 200, len(product_info)).tolist()))
+        record('calculate_reorder_recommendations',
+               lambda: calculate_reorder_recommendations(forecast_df, stock), forecast_df, stock)
+
+    return {
+        'skus': num_skus,
+        'history_rows': int(len(df)),
+        'max_rss_mb': round(_max_rss_mb(), 1) if resource is not None else None,
+        'stages': stages
+    }
+
+
+def run_benchmarks(sku_counts=BENCHMARK_SKU_COUNTS, model_dir=None, use_models=True,
+                   years=BENCHMARK_YEARS, forecast_days=BENCHMARK_FORECAST_DAYS, repeat=1, seed=0,
+                   stage_time_limit=STAGE_TIME_LIMIT, on_scale=None):
+    """
+    Benchmark all SKU counts (smallest first)
+
+    Parameters:
+    -----------
+    stage_time_limit : float (optional)
+        Seconds per stage before it is recorded as timed out
+    on_scale : callable (optional)
+        Called with the results so far after each SKU count (e.g. to save
+        them, so an interrupted run keeps the finished scales)
+
+    Returns:
+    --------
+    dict : run metadata plus one benchmark_scale() entry per SKU count;
+    'complete' is False until every SKU count has run
+    """
+    models = None
+    if use_models:
+        try:
+            with contextlib.redirect_stdout(io.StringIO()):
+                models = load_models(model_dir)
+        except Exception as e:
+            print(f"[WARNING] Could not load models, skipping forecast stages: {e}")
+
+    results = {
+        'commit': get_commit_id(),
+        'timestamp': datetime.now().isoformat(timespec='seconds'),
+        'config': {
+            'years': years,
+            'forecast_days': forecast_days,
+            'repeat': repeat,
+            'seed': seed,
+            'stage_time_limit': stage_time_limit,
+            'model_version': models.get('model_version') if models else None
+        },
+        'environment': {
+            'python': platform.python_version(),
+            'pandas': pd.__version__,
+            'numpy': np.__version__,
+            'platform': platform.platform(),
+            'cpu_count': os.cpu_count()
+        },
+        'scales': [],
+        'complete': False
+    }
+
+    sku_counts = sorted(sku_counts)
+    with tempfile.TemporaryDirectory(prefix='kirana_bench_') as work_dir, isolated_caches(work_dir):
+        for i, num_skus in enumerate(sku_counts):
+            results['scales'].append(benchmark_scale(
+                num_skus, work_dir, models=models, years=years, forecast_days=forecast_days,
+                repeat=repeat, seed=seed, stage_time_limit=stage_time_limit
+            ))
+            results['complete'] = i == len(sku_counts) - 1
+            if on_scale is not None:
+                on_scale(results)
+
+    return results
+
+
+# ============================================
+# STORED RESULTS
+# ============================================
+
+def get_commit_id():
+    """Short hash of HEAD, with -dirty for uncommitted changes ('unknown' outside git)"""
+    try:
+        commit = subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'], cwd=REPO_DIR,
+            capture_output=True, text=True, check=True
+        ).stdout.strip()
+        dirty = subprocess.run(
+            ['git', 'status', '--porcelain', '--untracked-files=no'], cwd=REPO_DIR,
+            capture_output=True, text=True, check=True
+        ).stdout.strip()
+        return f"{commit}-dirty" if dirty else commit
+    except (OSError, subprocess.CalledProcessError):
+        return 'unknown'
+
+
+def save_results(results, results_dir=None):
+    """Write results to <results_dir>/<commit>.json and return the path"""
+    results_dir = results_dir or BENCHMARK_RESULTS_DIR
+    os.makedirs(results_dir, exist_ok=True)
+    path = os.path.join(results_dir, f"{results['commit']}.json")
+    with open(path, 'w') as f:
+        json.dump(results, f, indent=2)
+    return path
+
+
+def load_results(name, results_dir=None):
+    """Stored results by commit id or by file path"""
+    path = name if os.path.exists(name) else os.path.join(results_dir or BENCHMARK_RESULTS_DIR, f"{name}.json")
+    with open(path) as f:
+        return json.load(f)
+
+
+def compare_results(baseline, current, threshold=REGRESSION_THRESHOLD):
+    """
+    Stage-by-stage comparison of two benchmark runs
+
+    Returns:
+    --------
+    pandas.DataFrame with baseline/current seconds and peak MB, their ratios
+    and a regression flag (time or memory more than `threshold` worse, or
+    a stage that now times out or is skipped)
+    """
+    def _frame(results):
+        frame = pd.DataFrame([
+            {'skus': scale['skus'], 'status': 'ok', **stage}
+            for scale in results['scales'] for stage in scale['stages']
+        ]).set_index(['skus', 'stage'])
+        frame['measured'] = frame['status'] == 'ok'
+        return frame[['seconds', 'peak_mb', 'measured']].astype({'seconds': float, 'peak_mb': float})
+
+    table = _frame(baseline).join(_frame(current), lsuffix='_baseline', rsuffix='_current', how='inner')
+    table['time_ratio'] = table['seconds_current'] / table['seconds_baseline']
+    table['memory_ratio'] = table['peak_mb_current'] / table['peak_mb_baseline'].where(table['peak_mb_baseline'] > 0)
+    table['regression'] = (
+        (table['time_ratio'] > 1 + threshold) | (table['memory_ratio'] > 1 + threshold)
+        | (table['measured_baseline'] & ~table['measured_current'])
+    )
+    return table.drop(columns=['measured_baseline', 'measured_current']).reset_index()
+
+
+# ============================================
+# MAIN
+# ============================================
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Benchmark the forecasting pipeline on synthetic data')
+    parser.add_argument('--skus', type=int, nargs='+', default=BENCHMARK_SKU_COUNTS)
+    parser.add_argument('--years', type=float, default=BENCHMARK_YEARS, help='History length per SKU')
+    parser.add_argument('--days', type=int, default=BENCHMARK_FORECAST_DAYS, help='Forecast horizon')
+    parser.add_argument('--repeat', type=int, default=1, help='Timed runs per stage (best is kept)')
+    parser.add_argument('--stage-time-limit', type=float, default=STAGE_TIME_LIMIT,
+                        help='Seconds per stage before it is recorded as timed out (0: no limit)')
+    parser.add_argument('--model-dir', default=None)
+    parser.add_argument('--no-models', action='store_true', help='Skip generate_forecast and reorder stages')
+    parser.add_argument('--results-dir', default=None)
+    parser.add_argument('--compare', default=None, help='Baseline commit id or results file')
+    args = parser.parse_args(argv)
+
+    # Read the baseline first: it may be the file this run overwrites
+    baseline = load_results(args.compare, args.results_dir) if args.compare else None
+
+    # Saved after every SKU count, so an interrupted run keeps the finished ones
+    paths = []
+    results = run_benchmarks(
+        args.skus, model_dir=args.model_dir, use_models=not args.no_models,
+        years=args.years, forecast_days=args.days, repeat=args.repeat, stage_time_limit=args.stage_time_limit,
+        on_scale=lambda partial: paths.append(save_results(partial, args.results_dir))
+    )
+    print(f"\n[OK] Saved benchmark results to {paths[-1]}")
+
+    if baseline is not None:
+        table = compare_results(baseline, results)
+        print(f"\nCompared with {args.compare}:")
+        print(table.to_string(index=False, float_format=lambda x: f"{x:.3f}"))
+        for row in table[table['regression']].itertuples():
+            print(f"[WARNING] {row.stage} at {row.skus} SKUs: "
+                  f"{row.time_ratio:.2f}x time, {row.memory_ratio:.2f}x memory")
+        return 1 if table['regression'].any() else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,170 @@
+"""
+Data Loader Module for Sales Forecasting
+Typed, low-memory loading of the sales history CSV with a binary cache
+"""
+
+import pandas as pd
+import hashlib
+import os
+import tempfile
+import threading
+
+
+# ============================================
+# SCHEMA
+# ============================================
+
+# Explicit dtypes for the sales CSV. Text columns are categorical; integers are
+# downcast to the smallest type that holds their range. Monetary columns
+# (including price and cost_price, which may carry paise) stay float64 so
+# engineered features (and forecasts) are unchanged.
+SALES_SCHEMA = {
+    'product_id': 'int16',
+    'product_name': 'category',
+    'category': 'category',
+    'season_affinity': 'category',
+    'price': 'float64',
+    'cost_price': 'float64',
+    'quantity_sold': 'int32',
+    'discount_percent': 'float64',
+    'final_price': 'float64',
+    'revenue': 'float64',
+    'profit': 'float64',
+    'day_of_week': 'int8',
+    'is_weekend': 'int8',
+    'month': 'int8',
+    'year': 'int16',
+    'is_festival': 'int8',
+    'festival_name': 'category',
+}
+
+DATE_COLUMNS = ['sale_date']
+
+SALES_CACHE_DIR = os.getenv(
+    'SALES_CACHE_DIR',
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data_cache')
+)
+
+# Bump when SALES_SCHEMA or the parsing logic changes (invalidates cached copies)
+LOADER_VERSION = 2
+
+
+# (path, size, mtime_ns) -> content hash, so unchanged files are hashed once
+_HASH_CACHE = {}
+_HASH_LOCK = threading.Lock()
+
+
+def compute_file_hash(path, chunk_size=1 << 20):
+    """
+    SHA-256 of a file's content (memoized on path, size and mtime)
+    """
+    stat = os.stat(path)
+    cache_key = (os.path.abspath(path), stat.st_size, stat.st_mtime_ns)
+
+    with _HASH_LOCK:
+        if cache_key in _HASH_CACHE:
+            return _HASH_CACHE[cache_key]
+
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            digest.update(chunk)
+    content_hash = digest.hexdigest()
+
+    with _HASH_LOCK:
+        _HASH_CACHE[cache_key] = content_hash
+    return content_hash
+
+
+def _cache_path(csv_path):
+    return os.path.join(
+        SALES_CACHE_DIR, f"sales_{compute_file_hash(csv_path)[:16]}-v{LOADER_VERSION}.feather"
+    )
+
+
+# ============================================
+# LOADING
+# ============================================
+
+def _parse_sales_csv(csv_path):
+    """Parse the CSV with the explicit schema (pyarrow engine when installed)"""
+    header = pd.read_csv(csv_path, nrows=0).columns
+    dtypes = {col: dtype for col, dtype in SALES_SCHEMA.items() if col in header}
+    try:
+        return pd.read_csv(csv_path, dtype=dtypes, engine='pyarrow', parse_dates=DATE_COLUMNS)
+    except ImportError:
+        return pd.read_csv(csv_path, dtype=dtypes, parse_dates=DATE_COLUMNS)
+
+
+def _write_cache(df, cache_path):
+    """Atomically write the parsed history as uncompressed Feather"""
+    os.makedirs(SALES_CACHE_DIR, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=SALES_CACHE_DIR, suffix='.tmp')
+    os.close(fd)
+    try:
+        df.to_feather(tmp_path, compression='uncompressed')
+        os.replace(tmp_path, cache_path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+    # Only the copy for the current file content is useful
+    for name in os.listdir(SALES_CACHE_DIR):
+        path = os.path.join(SALES_CACHE_DIR, name)
+        if name.startswith('sales_') and path != cache_path:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+
+def read_sales_csv(csv_path, use_cache=True):
+    """
+    Load the sales history with typed, compact columns, sorted by sale_date
+
+    Parameters:
+    -----------
+    csv_path : str
+        Path to the sales CSV
+    use_cache : bool
+        Read/write a binary (Feather) copy keyed by the CSV content hash, so
+        repeated loads skip CSV parsing
+
+    Returns:
+    --------
+    pandas.DataFrame with SALES_SCHEMA dtypes and datetime sale_date
+    """
+    cache_path = _cache_path(csv_path) if use_cache else None
+
+    if cache_path and os.path.exists(cache_path):
+        try:
+            return pd.read_feather(cache_path)
+        except Exception as e:
+            print(f"[WARNING] Could not read cached sales history {cache_path}: {e}")
+
+    df = _parse_sales_csv(csv_path)
+    df = df.sort_values('sale_date').reset_index(drop=True)
+
+    if cache_path:
+        try:
+            _write_cache(df, cache_path)
+        except Exception as e:
+            # The cache is an optimization only
+            print(f"[WARNING] Could not cache sales history: {e}")
+
+    return df
+
+
+def to_plain_frame(df):
+    """
+    Convert categorical columns back to their plain (string) dtype
+
+    Use before code that does arithmetic or mapping on the text columns.
+    The downcast integer columns are kept, but feature engineering builds
+    new float64 columns, so the memory saving applies to the raw history
+    (read and cache) rather than to the feature frame.
+    """
+    categorical = [col for col in df.columns if isinstance(df[col].dtype, pd.CategoricalDtype)]
+    if not categorical:
+        return df
+    return df.astype({col: df[col].cat.categories.dtype for col in categorical})
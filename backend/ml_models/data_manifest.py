@@ -0,0 +1,188 @@
+"""
+Data Manifest Module for Sales Forecasting
+Small JSON summary of the sales history (last date, counts, content hash) for cheap status checks
+"""
+
+import hashlib
+import json
+import os
+import sys
+import tempfile
+import threading
+from datetime import datetime
+from .data_loader import compute_file_hash, read_sales_csv
+
+
+# ============================================
+# CONFIGURATION
+# ============================================
+
+DATA_MANIFEST_DIR = os.getenv(
+    'DATA_MANIFEST_DIR',
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data_cache')
+)
+
+# Bump when the manifest fields change
+MANIFEST_VERSION = 1
+
+
+def manifest_path(csv_path, manifest_dir=None):
+    """Manifest file for a sales CSV (one per absolute CSV path)"""
+    csv_path = os.path.abspath(csv_path)
+    stem = os.path.splitext(os.path.basename(csv_path))[0]
+    path_id = hashlib.sha1(csv_path.encode('utf-8')).hexdigest()[:8]
+    return os.path.join(manifest_dir or DATA_MANIFEST_DIR, f"manifest_{stem}_{path_id}.json")
+
+
+# ============================================
+# WRITE
+# ============================================
+
+def write_data_manifest(csv_path, df=None, manifest_dir=None):
+    """
+    Record last date, row/product counts and content hash of a sales CSV
+
+    Call whenever the sales data changes. The CSV's size and mtime are stored
+    too, so readers can tell when the manifest is out of date without hashing.
+
+    Parameters:
+    -----------
+    csv_path : str
+        Path to the sales CSV
+    df : pandas.DataFrame (optional)
+        Already-loaded history for this file (avoids re-reading it)
+    manifest_dir : str (optional)
+        Defaults to DATA_MANIFEST_DIR
+
+    Returns:
+    --------
+    dict : the manifest that was written
+    """
+    stat = os.stat(csv_path)
+    if df is None:
+        df = read_sales_csv(csv_path)
+
+    manifest = {
+        'manifest_version': MANIFEST_VERSION,
+        'csv_path': os.path.abspath(csv_path),
+        'content_hash': compute_file_hash(csv_path),
+        'file_size': stat.st_size,
+        'file_mtime_ns': stat.st_mtime_ns,
+        'first_date': df['sale_date'].min().strftime('%Y-%m-%d') if len(df) else None,
+        'last_date': df['sale_date'].max().strftime('%Y-%m-%d') if len(df) else None,
+        'row_count': int(len(df)),
+        'product_count': int(df['product_name'].nunique()),
+        'category_count': int(df['category'].nunique()),
+        'updated_at': datetime.now().isoformat(timespec='seconds')
+    }
+
+    path = manifest_path(csv_path, manifest_dir)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'w') as f:
+            json.dump(manifest, f, indent=2)
+        os.replace(tmp_path, path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+    return manifest
+
+
+# ============================================
+# READ
+# ============================================
+
+# manifest path -> (manifest mtime_ns, parsed manifest)
+_PARSED = {}
+_PARSED_LOCK = threading.Lock()
+
+
+def read_data_manifest(csv_path, manifest_dir=None):
+    """
+    Read the manifest of a sales CSV without touching the CSV contents
+
+    Costs two stat() calls; the JSON is parsed again only when the manifest
+    file changes.
+
+    Returns:
+    --------
+    dict (manifest plus 'stale': True when the CSV changed after it was
+    written) or None when there is no manifest
+    """
+    path = manifest_path(csv_path, manifest_dir)
+    try:
+        manifest_mtime = os.stat(path).st_mtime_ns
+    except FileNotFoundError:
+        return None
+
+    with _PARSED_LOCK:
+        cached = _PARSED.get(path)
+    if cached is None or cached[0] != manifest_mtime:
+        try:
+            with open(path) as f:
+                manifest = json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"[WARNING] Could not read data manifest {path}: {e}")
+            return None
+        cached = (manifest_mtime, manifest)
+        with _PARSED_LOCK:
+            _PARSED[path] = cached
+
+    manifest = dict(cached[1])
+    try:
+        stat = os.stat(csv_path)
+        manifest['stale'] = (
+            manifest.get('manifest_version') != MANIFEST_VERSION
+            or stat.st_size != manifest.get('file_size')
+            or stat.st_mtime_ns != manifest.get('file_mtime_ns')
+        )
+    except FileNotFoundError:
+        manifest['stale'] = True
+    return manifest
+
+
+# ============================================
+# BACKGROUND REFRESH
+# ============================================
+
+_REFRESHING = set()
+_REFRESH_LOCK = threading.Lock()
+
+
+def refresh_data_manifest_async(csv_path, manifest_dir=None):
+    """
+    Rebuild a missing or stale manifest in a background thread
+
+    At most one refresh runs per CSV; returns False if one is already running.
+    """
+    key = manifest_path(csv_path, manifest_dir)
+    with _REFRESH_LOCK:
+        if key in _REFRESHING:
+            return False
+        _REFRESHING.add(key)
+
+    def _run():
+        try:
+            write_data_manifest(csv_path, manifest_dir=manifest_dir)
+            print(f"[OK] Refreshed data manifest for {csv_path}")
+        except Exception as e:
+            print(f"[WARNING] Could not refresh data manifest: {e}")
+        finally:
+            with _REFRESH_LOCK:
+                _REFRESHING.discard(key)
+
+    threading.Thread(target=_run, name='data-manifest-refresh', daemon=True).start()
+    return True
+
+
+# ============================================
+# MAIN: update after writing new sales data
+# ============================================
+
+if __name__ == "__main__":
+    # Usage (from backend/): python -m ml_models.data_manifest <sales_csv>
+    manifest = write_data_manifest(sys.argv[1])
+    print(f"[OK] Data manifest: {manifest['row_count']:,} rows, "
+          f"{manifest['product_count']} products, last date {manifest['last_date']}")
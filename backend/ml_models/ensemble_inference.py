@@ -0,0 +1,142 @@
+"""
+Ensemble Inference Module for Sales Forecasting
+Runs the LightGBM, XGBoost and CatBoost base models concurrently and combines them
+"""
+
+import numpy as np
+import os
+import threading
+import time
+import xgboost as xgb
+from catboost import Pool
+from concurrent.futures import ThreadPoolExecutor
+
+
+# ============================================
+# CONFIGURATION
+# ============================================
+
+# Base models in ensemble weight order
+BASE_MODELS = ['lgb', 'xgb', 'catboost']
+
+# Shared pool for base model predictions (each predict releases the GIL)
+INFERENCE_WORKERS = int(os.getenv('INFERENCE_WORKERS', len(BASE_MODELS)))
+
+_EXECUTOR = None
+_EXECUTOR_LOCK = threading.Lock()
+
+
+def get_inference_executor():
+    """Process-wide thread pool used for base model predictions"""
+    global _EXECUTOR
+    with _EXECUTOR_LOCK:
+        if _EXECUTOR is None:
+            _EXECUTOR = ThreadPoolExecutor(max_workers=INFERENCE_WORKERS, thread_name_prefix='ensemble')
+        return _EXECUTOR
+
+
+# ============================================
+# BASE MODEL PREDICTIONS
+# ============================================
+
+def _predict_lgb(model, X):
+    return model.predict(X, num_iteration=model.best_iteration)
+
+
+# Errors xgboost raises when in-place prediction can't handle a booster or input
+_INPLACE_ERRORS = (xgb.core.XGBoostError, TypeError, ValueError)
+_inplace_fallback_logged = False
+
+
+def _predict_xgb(model, X):
+    # In-place prediction skips building a DMatrix; older boosters fall back to one
+    global _inplace_fallback_logged
+    if hasattr(model, 'inplace_predict'):
+        try:
+            return model.inplace_predict(X)
+        except _INPLACE_ERRORS as e:
+            if not _inplace_fallback_logged:
+                _inplace_fallback_logged = True
+                print(f"[WARNING] XGBoost in-place prediction failed, using DMatrix: {e}")
+    return model.predict(xgb.DMatrix(X))
+
+
+def _predict_catboost(model, X):
+    return model.predict(Pool(X))
+
+
+PREDICTORS = {
+    'lgb': ('lgb_model', _predict_lgb),
+    'xgb': ('xgb_model', _predict_xgb),
+    'catboost': ('catboost_model', _predict_catboost),
+}
+
+
+def _timed_predict(name, model, X):
+    start = time.perf_counter()
+    _, predict = PREDICTORS[name]
+    prediction = np.maximum(np.asarray(predict(model, X), dtype=float), 0)
+    return prediction, time.perf_counter() - start
+
+
+# ============================================
+# ENSEMBLE
+# ============================================
+
+def predict_ensemble(models, X, parallel=True):
+    """
+    Ensemble prediction with the base models run concurrently
+
+    For weighted ensembles, base models with zero weight are not evaluated
+    (their contribution is exactly zero). Stacking always runs all three.
+
+    Parameters:
+    -----------
+    models : dict
+        Output of load_models()
+    X : pandas.DataFrame
+        Feature matrix in training column order
+    parallel : bool
+        Run the base models on the shared inference pool; False runs them one
+        after another on the calling thread (background work that must not
+        queue ahead of live requests on the pool)
+
+    Returns:
+    --------
+    tuple (predictions, latencies)
+        predictions : numpy.ndarray of non-negative ensemble predictions
+        latencies : dict of model name -> seconds, plus 'ensemble' (wall time)
+    """
+    start = time.perf_counter()
+    stacking = models['ensemble_type'] == 'Stacking' and models['meta_model'] is not None
+    weights = np.asarray(models['ensemble_weights'], dtype=float)
+
+    active = [
+        name for i, name in enumerate(BASE_MODELS)
+        if stacking or weights[i] != 0
+    ]
+
+    base_predictions, latencies = {}, {}
+    if parallel:
+        executor = get_inference_executor()
+        futures = {
+            name: executor.submit(_timed_predict, name, models[PREDICTORS[name][0]], X)
+            for name in active
+        }
+        for name, future in futures.items():
+            base_predictions[name], latencies[name] = future.result()
+    else:
+        for name in active:
+            base_predictions[name], latencies[name] = _timed_predict(name, models[PREDICTORS[name][0]], X)
+
+    if stacking:
+        meta_features = np.column_stack([base_predictions[name] for name in BASE_MODELS])
+        pred_ensemble = models['meta_model'].predict(meta_features)
+    else:
+        pred_ensemble = np.zeros(len(X))
+        for i, name in enumerate(BASE_MODELS):
+            if name in base_predictions:
+                pred_ensemble = pred_ensemble + weights[i] * base_predictions[name]
+
+    latencies['ensemble'] = time.perf_counter() - start
+    return np.maximum(pred_ensemble, 0), latencies
@@ -5,75 +5,17 @@ Extracted from kirana_sales_forecasting_pipeline.ipynb
 
 import pandas as pd
 import numpy as np
-from datetime import timedelta
-
-# ============================================
-# FESTIVAL CONFIGURATION
-# ============================================
-
-# Festival Impact Configuration (same as data generation)
-FESTIVAL_IMPACTS = {
-    "Makar Sankranti": {"prep_days": 1, "duration_days": 1, "impact": {"Staples": 2.0, "Snacks": 1.8, "Dairy": 1.5}},
-    "Republic Day": {"prep_days": 0, "duration_days": 1, "impact": {"Beverages": 1.5, "Snacks": 1.5}},
-    "Valentine's Day": {"prep_days": 1, "duration_days": 1, "impact": {"Snacks": 2.0}},
-    "Maha Shivratri": {"prep_days": 1, "duration_days": 1, "impact": {"Dairy": 2.0, "Staples": 2.5}},
-    "Holi": {"prep_days": 2, "duration_days": 1, "impact": {"Beverages": 3.0, "Personal Care": 2.5, "Snacks": 2.0, "Dairy": 1.8}},
-    "Eid ul-Fitr": {"prep_days": 3, "duration_days": 1, "impact": {"Dairy": 3.0, "Staples": 2.5, "Snacks": 3.0, "Beverages": 2.0}},
-    "Ram Navami": {"prep_days": 1, "duration_days": 1, "impact": {"Dairy": 2.0, "Snacks": 2.5}},
-    "Eid ul-Adha": {"prep_days": 2, "duration_days": 1, "impact": {"Staples": 2.5, "Dairy": 2.5, "Snacks": 2.0}},
-    "Independence Day": {"prep_days": 0, "duration_days": 1, "impact": {"Beverages": 1.5, "Snacks": 1.5}},
-    "Raksha Bandhan": {"prep_days": 1, "duration_days": 1, "impact": {"Snacks": 3.0, "Dairy": 1.5}},
-    "Janmashtami": {"prep_days": 1, "duration_days": 1, "impact": {"Dairy": 2.5, "Snacks": 2.0}},
-    "Navratri": {"prep_days": 1, "duration_days": 9, "impact": {"Staples": 4.0, "Dairy": 2.0, "Beverages": 2.0}},
-    "Dussehra": {"prep_days": 1, "duration_days": 1, "impact": {"Snacks": 2.5, "Dairy": 1.8, "Beverages": 1.8}},
-    "Diwali": {"prep_days": 4, "duration_days": 3, "impact": {"Snacks": 4.0, "Dairy": 3.0, "Staples": 2.5, "Beverages": 2.5, "Personal Care": 1.8}},
-    "Bhai Dooj": {"prep_days": 1, "duration_days": 1, "impact": {"Snacks": 2.0}},
-    "Christmas": {"prep_days": 3, "duration_days": 1, "impact": {"Beverages": 2.5, "Dairy": 3.0, "Snacks": 2.5}},
-    "New Year Eve": {"prep_days": 2, "duration_days": 1, "impact": {"Beverages": 3.0, "Snacks": 2.5}}
-}
-
-# Festival Dates for 2025 (for future predictions)
-FESTIVAL_DATES_2025 = {
-    "Makar Sankranti": "2025-01-14",
-    "Republic Day": "2025-01-26",
-    "Valentine's Day": "2025-02-14",
-    "Maha Shivratri": "2025-02-26",
-    "Holi": "2025-03-14",
-    "Eid ul-Fitr": "2025-03-31",
-    "Ram Navami": "2025-04-06",
-    "Eid ul-Adha": "2025-06-07",
-    "Independence Day": "2025-08-15",
-    "Raksha Bandhan": "2025-08-09",
-    "Janmashtami": "2025-08-16",
-    "Navratri": "2025-09-22",
-    "Dussehra": "2025-10-02",
-    "Diwali": "2025-10-20",
-    "Bhai Dooj": "2025-10-23",
-    "Christmas": "2025-12-25",
-    "New Year Eve": "2025-12-31"
-}
-
-# Festival Dates for 2026 (for future predictions beyond 2025)
-FESTIVAL_DATES_2026 = {
-    "Makar Sankranti": "2026-01-14",
-    "Republic Day": "2026-01-26",
-    "Valentine's Day": "2026-02-14",
-    "Maha Shivratri": "2026-02-17",
-    "Holi": "2026-03-03",
-    "Eid ul-Fitr": "2026-03-20",
-    "Ram Navami": "2026-03-27",
-    "Eid ul-Adha": "2026-05-27",
-    "Independence Day": "2026-08-15",
-    "Raksha Bandhan": "2026-07-29",
-    "Janmashtami": "2026-08-06",
-    "Navratri": "2026-09-11",
-    "Dussehra": "2026-09-21",
-    "Diwali": "2026-10-09",
-    "Bhai Dooj": "2026-10-12",
-    "Christmas": "2026-12-25",
-    "New Year Eve": "2026-12-31"
-}
+from .rolling_stats import rolling_window_stats, ROLLING_STATS
+from .sales_panel import SalesPanel
+from .festival_calendar import (
+    FESTIVAL_IMPACTS, FESTIVAL_DATES, FESTIVAL_DATES_2023, FESTIVAL_DATES_2024,
+    FESTIVAL_DATES_2025, FESTIVAL_DATES_2026, lookup_festivals
+)
+from .pricing_engine import compute_discounts
 
+# Version of the feature code. Bump whenever create_features() output changes
+# so that persisted feature snapshots (see feature_store.py) are rebuilt.
+FEATURE_VERSION = 2
 
 # ============================================
 # HELPER FUNCTIONS
@@ -83,88 +25,22 @@ def detect_festival_for_date(date, category):
     """
     Detect if a given date falls in festival period for specific category
     Returns: (is_festival, festival_name, days_to_festival)
+
+    Scalar wrapper around festival_calendar.lookup_festivals(); use that
+    directly for many dates at once.
     """
-    date = pd.to_datetime(date).date()
-    year = date.year
-    
-    # Get festival calendar for year
-    if year == 2025:
-        festival_calendar = FESTIVAL_DATES_2025
-    elif year == 2026:
-        festival_calendar = FESTIVAL_DATES_2026
-    else:
-        festival_calendar = {}
-    
-    is_festival = 0
-    festival_name = ""
-    days_to_festival = 999
-    
-    for fest_name, fest_date_str in festival_calendar.items():
-        fest_date = pd.to_datetime(fest_date_str).date()
-        fest_info = FESTIVAL_IMPACTS.get(fest_name, {})
-        
-        prep_days = fest_info.get('prep_days', 0)
-        duration_days = fest_info.get('duration_days', 1)
-        
-        prep_start = fest_date - timedelta(days=prep_days)
-        fest_end = fest_date + timedelta(days=duration_days - 1)
-        
-        # Check if date falls in prep or festival period
-        if prep_start <= date <= fest_end:
-            # Check if category is impacted
-            if category in fest_info.get('impact', {}):
-                is_festival = 1
-                festival_name = fest_name
-                days_to_festival = (fest_date - date).days
-                break
-    
-    return is_festival, festival_name, days_to_festival
+    is_festival, festival_name, days_to_festival = lookup_festivals([date], [category])
+    return int(is_festival[0]), str(festival_name[0]), int(days_to_festival[0])
 
 
 def calculate_discount_for_date(date, category):
     """
     Calculate discount percent for a given date and category
     Uses the same logic as data generation
+
+    Scalar wrapper around pricing_engine.compute_discounts().
     """
-    date = pd.to_datetime(date)
-    day = date.date()
-    discount = 0.0
-    
-    # 1. Daily rotating discount (2-3.5%)
-    day_of_week = date.weekday()
-    daily_category_map = {
-        0: "Dairy", 1: "Beverages", 2: "Snacks", 3: "Personal Care",
-        4: "Staples", 5: "Snacks", 6: "Beverages"
-    }
-    if category == daily_category_map.get(day_of_week):
-        discount = max(discount, np.random.choice([2.0, 2.25, 2.5, 2.75, 3.0, 3.25, 3.5]))
-    
-    # 2. Flash sales (Every 3rd Wednesday - 12%)
-    if day.weekday() == 2:
-        week_of_month = (day.day - 1) // 7 + 1
-        if week_of_month == 3:
-            month_category_map = {
-                1: "Beverages", 2: "Snacks", 3: "Personal Care", 4: "Dairy",
-                5: "Beverages", 6: "Snacks", 7: "Personal Care", 8: "Dairy",
-                9: "Beverages", 10: "Snacks", 11: "Personal Care", 12: "Dairy"
-            }
-            if category == month_category_map.get(day.month):
-                discount = max(discount, 12.0)
-    
-    # 3. Festival prep discounts (10-15%)
-    festival_calendar = FESTIVAL_DATES_2025 if day.year == 2025 else FESTIVAL_DATES_2026 if day.year == 2026 else {}
-    for fest_name, fest_date_str in festival_calendar.items():
-        if fest_name not in {"Diwali", "Christmas", "Navratri"}:
-            continue
-        fest_date = pd.to_datetime(fest_date_str).date()
-        days_before = (fest_date - day).days
-        if 1 <= days_before <= 2:
-            if category in ["Snacks", "Beverages"]:
-                discount = max(discount, 15.0)
-            else:
-                discount = max(discount, 10.0)
-    
-    return round(discount, 2)
+    return round(float(compute_discounts(date, [category])[0]), 2)
 
 
 # ============================================
@@ -177,16 +53,19 @@ def create_features(df):
     
     Parameters:
     -----------
-    df : pandas.DataFrame
+    df : pandas.DataFrame or SalesPanel
         Input dataframe with columns: sale_date, product_name, category, quantity_sold, 
         price, cost_price, season_affinity, discount_percent, is_festival, etc.
+        A SalesPanel is expanded to its calendar-complete frame, so lags and
+        rolling windows count calendar days; only observed rows are returned.
     
     Returns:
     --------
     pandas.DataFrame
         DataFrame with 100+ engineered features
     """
-    df = df.copy()
+    from_panel = isinstance(df, SalesPanel)
+    df = df.to_frame(include_missing=True) if from_panel else df.copy()
     
     # ============================================
     # 1. TIME-BASED FEATURES (Enhanced)
@@ -238,10 +117,9 @@ def create_features(df):
     
     # Product-Category interaction
     prod_cat_means = df.groupby(['product_name', 'category'])['quantity_sold'].mean()
-    df['product_category_encoded'] = df.apply(
-        lambda x: prod_cat_means.get((x['product_name'], x['category']), x['product_encoded']), 
-        axis=1
-    )
+    prod_cat_keys = pd.MultiIndex.from_arrays([df['product_name'], df['category']])
+    df['product_category_encoded'] = prod_cat_means.reindex(prod_cat_keys).to_numpy()
+    df['product_category_encoded'] = df['product_category_encoded'].fillna(df['product_encoded'])
     
     # ============================================
     # 3. ENHANCED LAG FEATURES (1, 3, 7, 14, 21, 30 days)
@@ -261,34 +139,12 @@ def create_features(df):
     # ============================================
     # 4. ENHANCED ROLLING STATISTICS (3, 7, 14, 30-day windows)
     # ============================================
+    # All 28 window/statistic columns from one pass over per-product arrays
+    product_codes, _ = pd.factorize(df['product_name'])
+    rolling = rolling_window_stats(df['quantity_sold'].to_numpy(dtype=float), product_codes, windows=[3, 7, 14, 30])
     for window in [3, 7, 14, 30]:
-        # Rolling mean
-        df[f'rolling_mean_{window}'] = df.groupby('product_name')['quantity_sold'].transform(
-            lambda x: x.rolling(window, min_periods=1).mean()
-        )
-        # Rolling std
-        df[f'rolling_std_{window}'] = df.groupby('product_name')['quantity_sold'].transform(
-            lambda x: x.rolling(window, min_periods=1).std()
-        )
-        # Rolling min
-        df[f'rolling_min_{window}'] = df.groupby('product_name')['quantity_sold'].transform(
-            lambda x: x.rolling(window, min_periods=1).min()
-        )
-        # Rolling max
-        df[f'rolling_max_{window}'] = df.groupby('product_name')['quantity_sold'].transform(
-            lambda x: x.rolling(window, min_periods=1).max()
-        )
-        # NEW: Rolling median
-        df[f'rolling_median_{window}'] = df.groupby('product_name')['quantity_sold'].transform(
-            lambda x: x.rolling(window, min_periods=1).median()
-        )
-        # NEW: Rolling quantiles
-        df[f'rolling_q25_{window}'] = df.groupby('product_name')['quantity_sold'].transform(
-            lambda x: x.rolling(window, min_periods=1).quantile(0.25)
-        )
-        df[f'rolling_q75_{window}'] = df.groupby('product_name')['quantity_sold'].transform(
-            lambda x: x.rolling(window, min_periods=1).quantile(0.75)
-        )
+        for stat in ROLLING_STATS:
+            df[f'rolling_{stat}_{window}'] = rolling[f'rolling_{stat}_{window}']
     
     # NEW: Coefficient of variation (volatility measure)
     df['cv_7'] = df['rolling_std_7'] / (df['rolling_mean_7'] + 1)
@@ -380,9 +236,282 @@ def create_features(df):
     # Fill NaN for new feature
     df['same_dow_mean_4w'] = df['same_dow_mean_4w'].fillna(df['rolling_mean_7'])
     
+    if from_panel:
+        df = df[df['quantity_sold'].notna()].reset_index(drop=True)
+    
     return df
 
 
+# ============================================
+# INCREMENTAL FEATURE COMPUTATION
+# ============================================
+
+# Rows kept per product: enough for the longest lag / rolling window
+STATE_TAIL_ROWS = 30
+# Same-day-of-week rows kept per (product, day_of_week)
+STATE_DOW_ROWS = 4
+EWM_SPANS = [3, 7, 14, 30]
+EWM_STD_SPANS = [7, 30]
+
+def _empty_feature_state(columns):
+    """State for an empty history with the given raw columns"""
+    ewm_columns = [f'mean_{span}' for span in EWM_SPANS]
+    for span in EWM_STD_SPANS:
+        ewm_columns += [f'cov_{span}', f'sum_wt_{span}', f'sum_wt2_{span}']
+    
+    return {
+        'columns': list(columns),
+        'tail': pd.DataFrame(columns=list(columns)),
+        'dow_tail': pd.DataFrame(columns=['product_name', 'day_of_week', 'quantity_sold']),
+        'product_stats': pd.DataFrame(columns=['count', 'sum', 'sumsq', 'max'], dtype=float),
+        'product_value_counts': pd.Series(dtype=float),
+        'category_stats': pd.DataFrame(columns=['count', 'sum', 'sumsq'], dtype=float),
+        'product_category_stats': pd.DataFrame(columns=['count', 'sum'], dtype=float),
+        'ewm': pd.DataFrame(columns=ewm_columns, dtype=float),
+        'last_date': None
+    }
+
+
+def _merge_stats(previous, update):
+    """Add aggregate rows (count/sum/...) from `update` into `previous`"""
+    if len(previous) == 0:
+        return update.astype(float)
+    merged = previous.add(update.drop(columns='max', errors='ignore'), fill_value=0)
+    if 'max' in previous.columns:
+        merged['max'] = pd.concat([previous['max'], update['max']], axis=1).max(axis=1)
+    return merged
+
+
+def _median_from_value_counts(value_counts):
+    """Per-product median from a (product_name, value) -> count Series"""
+    frame = value_counts.rename('count').reset_index()
+    frame.columns = ['product_name', 'value', 'count']
+    frame = frame.sort_values(['product_name', 'value'])
+    frame['cum'] = frame.groupby('product_name')['count'].cumsum()
+    total = frame.groupby('product_name')['count'].transform('sum')
+    
+    # Value at rank r is the first value whose cumulative count exceeds r
+    lower = frame[frame['cum'] > (total - 1) // 2].groupby('product_name')['value'].first()
+    upper = frame[frame['cum'] > total // 2].groupby('product_name')['value'].first()
+    return (lower + upper) / 2
+
+
+def _ewm_sequence(ewm, new_df):
+    """
+    Advance EWM state over new rows and return the EWM features of each row
+    
+    Reproduces pandas ewm(span, adjust=False).mean()/.std() recursions, one
+    step per row position within each product, vectorized across products.
+    """
+    ewm = ewm.reindex(ewm.index.union(new_df['product_name'].unique()))
+    arrays = {col: ewm[col].to_numpy(dtype=float, copy=True) for col in ewm.columns}
+    
+    product_pos = ewm.index.get_indexer(new_df['product_name'])
+    step = new_df.groupby('product_name', sort=False).cumcount().to_numpy()
+    quantities = new_df['quantity_sold'].to_numpy(dtype=float)
+    
+    outputs = {f'ewm_{span}': np.full(len(new_df), np.nan) for span in EWM_SPANS}
+    outputs.update({f'ewm_std_{span}': np.full(len(new_df), np.nan) for span in EWM_STD_SPANS})
+    
+    for k in range(step.max() + 1 if len(step) else 0):
+        rows = np.flatnonzero(step == k)
+        pos = product_pos[rows]
+        cur = quantities[rows]
+        
+        for span in EWM_SPANS:
+            alpha = 1. / (1. + (span - 1) / 2.)
+            old_wt = 1. - alpha
+            mean = arrays[f'mean_{span}'][pos]
+            first = np.isnan(mean)
+            
+            updated = np.where(mean != cur, (old_wt * mean + alpha * cur) / (old_wt + alpha), mean)
+            updated = np.where(first, cur, updated)
+            
+            if span in EWM_STD_SPANS:
+                cov = arrays[f'cov_{span}'][pos]
+                sum_wt = arrays[f'sum_wt_{span}'][pos] * old_wt + alpha
+                sum_wt2 = arrays[f'sum_wt2_{span}'][pos] * old_wt * old_wt + alpha * alpha
+                cov = (old_wt * (cov + (mean - updated) ** 2) + alpha * (cur - updated) ** 2) / (old_wt + alpha)
+                total_wt = old_wt + alpha
+                sum_wt = sum_wt / total_wt
+                sum_wt2 = sum_wt2 / (total_wt * total_wt)
+                
+                cov = np.where(first, 0., cov)
+                sum_wt = np.where(first, 1., sum_wt)
+                sum_wt2 = np.where(first, 1., sum_wt2)
+                
+                numerator = sum_wt * sum_wt
+                denominator = numerator - sum_wt2
+                with np.errstate(divide='ignore', invalid='ignore'):
+                    variance = np.where(denominator > 0, numerator / denominator * cov, np.nan)
+                outputs[f'ewm_std_{span}'][rows] = np.sqrt(np.maximum(variance, 0))
+                
+                arrays[f'cov_{span}'][pos] = cov
+                arrays[f'sum_wt_{span}'][pos] = sum_wt
+                arrays[f'sum_wt2_{span}'][pos] = sum_wt2
+            
+            arrays[f'mean_{span}'][pos] = updated
+            outputs[f'ewm_{span}'][rows] = updated
+    
+    new_ewm = pd.DataFrame(arrays, index=ewm.index)
+    return new_ewm, pd.DataFrame(outputs, index=new_df.index)
+
+
+def _advance_feature_state(state, new_df):
+    """
+    Fold new rows into the feature state
+    
+    Returns:
+    --------
+    (new_state, sequence_features) where sequence_features holds the EWM and
+    same-day-of-week features of the new rows (indexed like new_df)
+    """
+    new_state = dict(state)
+    qty = new_df['quantity_sold'].astype(float)
+    
+    # Last rows per product (lags / rolling windows)
+    tail = pd.concat([state['tail'], new_df[state['columns']]], ignore_index=True)
+    new_state['tail'] = tail.groupby('product_name', sort=False).tail(STATE_TAIL_ROWS).reset_index(drop=True)
+    
+    # Same-day-of-week mean of the previous 4 matching rows
+    day_of_week = new_df['sale_date'].dt.dayofweek
+    dow_rows = pd.DataFrame({
+        'product_name': new_df['product_name'].to_numpy(),
+        'day_of_week': day_of_week.to_numpy(),
+        'quantity_sold': qty.to_numpy()
+    })
+    dow_all = pd.concat([state['dow_tail'], dow_rows], ignore_index=True)
+    dow_all['quantity_sold'] = dow_all['quantity_sold'].astype(float)
+    dow_keys = [dow_all['product_name'], dow_all['day_of_week']]
+    cumulative = dow_all.groupby(dow_keys)['quantity_sold'].cumsum()
+    position = dow_all.groupby(dow_keys).cumcount()
+    window_start = cumulative.groupby(dow_keys).shift(STATE_DOW_ROWS + 1).fillna(0)
+    window_sum = cumulative - dow_all['quantity_sold'] - window_start
+    same_dow = (window_sum / position.clip(upper=STATE_DOW_ROWS)).where(position > 0)
+    new_state['dow_tail'] = dow_all.groupby(['product_name', 'day_of_week'], sort=False).tail(STATE_DOW_ROWS).reset_index(drop=True)
+    
+    # Running aggregates for target encodings
+    grouped = qty.groupby(new_df['product_name'])
+    product_update = pd.DataFrame({
+        'count': grouped.count(), 'sum': grouped.sum(),
+        'sumsq': (qty ** 2).groupby(new_df['product_name']).sum(), 'max': grouped.max()
+    })
+    new_state['product_stats'] = _merge_stats(state['product_stats'], product_update)
+    
+    value_counts = qty.groupby([new_df['product_name'], qty]).size().astype(float)
+    value_counts.index.names = ['product_name', 'value']
+    previous_counts = state['product_value_counts']
+    new_state['product_value_counts'] = (
+        value_counts if len(previous_counts) == 0 else previous_counts.add(value_counts, fill_value=0)
+    )
+    
+    grouped = qty.groupby(new_df['category'])
+    category_update = pd.DataFrame({
+        'count': grouped.count(), 'sum': grouped.sum(),
+        'sumsq': (qty ** 2).groupby(new_df['category']).sum()
+    })
+    new_state['category_stats'] = _merge_stats(state['category_stats'], category_update)
+    
+    grouped = qty.groupby([new_df['product_name'], new_df['category']])
+    pc_update = pd.DataFrame({'count': grouped.count(), 'sum': grouped.sum()})
+    new_state['product_category_stats'] = _merge_stats(state['product_category_stats'], pc_update)
+    
+    # Exponentially weighted state
+    new_state['ewm'], sequence_features = _ewm_sequence(state['ewm'], new_df)
+    sequence_features['same_dow_mean_4w'] = same_dow.iloc[len(state['dow_tail']):].to_numpy()
+    
+    new_state['last_date'] = new_df['sale_date'].max() if state['last_date'] is None else max(state['last_date'], new_df['sale_date'].max())
+    return new_state, sequence_features
+
+
+def build_feature_state(df):
+    """
+    Build the state needed to compute features for appended sales days
+    
+    Parameters:
+    -----------
+    df : pandas.DataFrame
+        Raw sales history (same columns as create_features input), sorted by sale_date
+    
+    Returns:
+    --------
+    dict with the last STATE_TAIL_ROWS rows per product plus running aggregates
+    (counts, sums, value counts and EWM recursions) for target encodings and EWM features
+    """
+    state, _ = _advance_feature_state(_empty_feature_state(df.columns), df)
+    return state
+
+
+def create_features_incremental(new_df, state):
+    """
+    Create features only for newly appended sales rows
+    
+    Lag, rolling and trend features are computed on the stored tail plus the new
+    rows; encodings and EWM features come from the running aggregates. Cost depends
+    on the number of new rows (plus STATE_TAIL_ROWS per product), not on history length.
+    
+    Note: target encodings use the history including the new rows, matching what
+    create_features would produce for them; rows already featurized keep their values.
+    
+    Parameters:
+    -----------
+    new_df : pandas.DataFrame
+        New raw sales rows (same columns as the history), later than state['last_date']
+    state : dict
+        State from build_feature_state() or a previous create_features_incremental() call
+    
+    Returns:
+    --------
+    (pandas.DataFrame with features for new_df rows, updated state)
+    """
+    if state['last_date'] is not None and (new_df['sale_date'] <= state['last_date']).any():
+        raise ValueError("new_df must only contain rows after state['last_date']")
+    
+    new_df = new_df.sort_values('sale_date', kind='stable')
+    
+    # Sequence features over stored tail + new rows
+    tail = state['tail']
+    combined = pd.concat([tail, new_df[state['columns']]], ignore_index=True)
+    for col in new_df.columns:
+        if pd.api.types.is_numeric_dtype(new_df[col]):
+            combined[col] = pd.to_numeric(combined[col])
+    combined['sale_date'] = pd.to_datetime(combined['sale_date'])
+    features = create_features(combined).iloc[len(tail):]
+    features.index = new_df.index
+    
+    new_state, sequence_features = _advance_feature_state(state, new_df)
+    
+    # Target encodings from running aggregates (history + new rows)
+    product_stats = new_state['product_stats']
+    product_mean = product_stats['sum'] / product_stats['count']
+    product_var = (product_stats['sumsq'] - product_stats['sum'] ** 2 / product_stats['count']) / (product_stats['count'] - 1)
+    product_median = _median_from_value_counts(new_state['product_value_counts'])
+    
+    category_stats = new_state['category_stats']
+    category_mean = category_stats['sum'] / category_stats['count']
+    category_var = (category_stats['sumsq'] - category_stats['sum'] ** 2 / category_stats['count']) / (category_stats['count'] - 1)
+    
+    pc_stats = new_state['product_category_stats']
+    prod_cat_means = pc_stats['sum'] / pc_stats['count']
+    
+    features['product_encoded'] = features['product_name'].map(product_mean)
+    features['product_std'] = features['product_name'].map(np.sqrt(product_var.clip(lower=0))).fillna(0)
+    features['product_median'] = features['product_name'].map(product_median)
+    features['product_max'] = features['product_name'].map(product_stats['max'])
+    features['category_encoded'] = features['category'].map(category_mean)
+    features['category_std'] = features['category'].map(np.sqrt(category_var.clip(lower=0)))
+    prod_cat_keys = pd.MultiIndex.from_arrays([features['product_name'], features['category']])
+    features['product_category_encoded'] = prod_cat_means.reindex(prod_cat_keys).to_numpy()
+    features['product_category_encoded'] = features['product_category_encoded'].fillna(features['product_encoded'])
+    
+    # EWM and same-day-of-week features from the running state
+    for col in sequence_features.columns:
+        features[col] = sequence_features[col]
+    features['same_dow_mean_4w'] = features['same_dow_mean_4w'].fillna(features['rolling_mean_7'])
+    
+    return features, new_state
+
+
 # ============================================
 # UTILITY FUNCTIONS
 # ============================================
@@ -0,0 +1,159 @@
+"""
+Feature Store Module for Sales Forecasting
+Persists create_features() output on disk so repeated forecasts skip feature engineering
+"""
+
+import contextlib
+import os
+import tempfile
+from . import data_loader, data_manifest
+from .feature_engineering import create_features, FEATURE_VERSION
+from .data_loader import compute_file_hash, read_sales_csv, to_plain_frame
+from .data_manifest import write_data_manifest
+from .forecast_metrics import FORECAST_METRICS
+
+
+# ============================================
+# CONFIGURATION
+# ============================================
+
+FEATURE_STORE_DIR = os.getenv(
+    'FEATURE_STORE_DIR',
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), 'feature_store')
+)
+
+# Number of feature snapshots kept on disk (older ones are pruned)
+MAX_STORED_SNAPSHOTS = 3
+
+
+# ============================================
+# KEYING
+# ============================================
+
+def get_feature_key(csv_path):
+    """
+    Key identifying a feature snapshot: source data hash + feature code version
+    """
+    return f"{compute_file_hash(csv_path)[:16]}-v{FEATURE_VERSION}"
+
+
+def _snapshot_path(key):
+    return os.path.join(FEATURE_STORE_DIR, f"features_{key}.feather")
+
+
+@contextlib.contextmanager
+def isolated_caches(work_dir):
+    """Point the sales cache, feature store and data manifest at work_dir (tests, benchmarks)"""
+    global FEATURE_STORE_DIR
+    saved = (data_loader.SALES_CACHE_DIR, FEATURE_STORE_DIR, data_manifest.DATA_MANIFEST_DIR)
+    data_loader.SALES_CACHE_DIR = os.path.join(work_dir, 'data_cache')
+    FEATURE_STORE_DIR = os.path.join(work_dir, 'feature_store')
+    data_manifest.DATA_MANIFEST_DIR = os.path.join(work_dir, 'data_cache')
+    try:
+        yield
+    finally:
+        data_loader.SALES_CACHE_DIR, FEATURE_STORE_DIR, data_manifest.DATA_MANIFEST_DIR = saved
+
+
+# ============================================
+# LOAD / STORE
+# ============================================
+
+def _write_snapshot(df_features, key):
+    """Atomically write a feature snapshot as uncompressed Feather"""
+    os.makedirs(FEATURE_STORE_DIR, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=FEATURE_STORE_DIR, suffix='.tmp')
+    os.close(fd)
+    try:
+        # Uncompressed so the file can be memory-mapped on read
+        df_features.reset_index(drop=True).to_feather(tmp_path, compression='uncompressed')
+        os.replace(tmp_path, _snapshot_path(key))
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+    _prune_snapshots()
+
+
+def _prune_snapshots():
+    """Keep only the most recent MAX_STORED_SNAPSHOTS snapshots"""
+    snapshots = [
+        os.path.join(FEATURE_STORE_DIR, name)
+        for name in os.listdir(FEATURE_STORE_DIR)
+        if name.startswith('features_') and name.endswith('.feather')
+    ]
+    snapshots.sort(key=os.path.getmtime, reverse=True)
+    for path in snapshots[MAX_STORED_SNAPSHOTS:]:
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+
+def load_features(csv_path):
+    """
+    Get create_features() output for a sales CSV, using the on-disk store
+
+    Parameters:
+    -----------
+    csv_path : str
+        Path to CSV file with historical sales data
+
+    Returns:
+    --------
+    pandas.DataFrame with all engineered features (sorted by sale_date)
+    """
+    timer = FORECAST_METRICS.timer('load_features')
+    key = get_feature_key(csv_path)
+    snapshot_path = _snapshot_path(key)
+    timer.lap('hash_csv')
+
+    if os.path.exists(snapshot_path):
+        try:
+            from pyarrow import feather
+            df_features = feather.read_table(snapshot_path, memory_map=True).to_pandas()
+            timer.lap('read_snapshot')
+            print(f"[OK] Loaded cached features {key} ({len(df_features):,} rows)")
+            return df_features
+        except Exception as e:
+            print(f"[WARNING] Could not read feature snapshot {snapshot_path}: {e}")
+
+    print(f"Loading historical data from {csv_path}...")
+    df = read_sales_csv(csv_path)
+    timer.lap('read_csv')
+
+    # New data: refresh the manifest read by the status endpoint
+    try:
+        write_data_manifest(csv_path, df)
+    except Exception as e:
+        print(f"[WARNING] Could not write data manifest: {e}")
+    timer.lap('write_manifest')
+
+    # Feature engineering maps and does arithmetic on the text columns
+    print("Creating features for historical data...")
+    df_features = create_features(to_plain_frame(df))
+    timer.lap('create_features')
+
+    try:
+        _write_snapshot(df_features, key)
+        timer.lap('write_snapshot')
+        print(f"[OK] Stored feature snapshot {key}")
+    except Exception as e:
+        # The store is an optimization only; forecasting continues without it
+        print(f"[WARNING] Could not store feature snapshot: {e}")
+
+    return df_features
+
+
+def store_features(csv_path, df_features):
+    """
+    Store create_features() output computed elsewhere as the snapshot for a CSV
+
+    Later load_features(csv_path) calls read it instead of rebuilding.
+
+    Returns:
+    --------
+    str : snapshot key
+    """
+    key = get_feature_key(csv_path)
+    _write_snapshot(df_features, key)
+    return key
@@ -0,0 +1,301 @@
+"""
+Festival Calendar Module for Sales Forecasting
+Precomputed (date, category) festival index with vectorized lookups
+"""
+
+import pandas as pd
+import numpy as np
+import threading
+
+
+# ============================================
+# FESTIVAL CONFIGURATION
+# ============================================
+
+# Festival Impact Configuration (same as data generation)
+FESTIVAL_IMPACTS = {
+    "Makar Sankranti": {"prep_days": 1, "duration_days": 1, "impact": {"Staples": 2.0, "Snacks": 1.8, "Dairy": 1.5}},
+    "Republic Day": {"prep_days": 0, "duration_days": 1, "impact": {"Beverages": 1.5, "Snacks": 1.5}},
+    "Valentine's Day": {"prep_days": 1, "duration_days": 1, "impact": {"Snacks": 2.0}},
+    "Maha Shivratri": {"prep_days": 1, "duration_days": 1, "impact": {"Dairy": 2.0, "Staples": 2.5}},
+    "Holi": {"prep_days": 2, "duration_days": 1, "impact": {"Beverages": 3.0, "Personal Care": 2.5, "Snacks": 2.0, "Dairy": 1.8}},
+    "Eid ul-Fitr": {"prep_days": 3, "duration_days": 1, "impact": {"Dairy": 3.0, "Staples": 2.5, "Snacks": 3.0, "Beverages": 2.0}},
+    "Ram Navami": {"prep_days": 1, "duration_days": 1, "impact": {"Dairy": 2.0, "Snacks": 2.5}},
+    "Eid ul-Adha": {"prep_days": 2, "duration_days": 1, "impact": {"Staples": 2.5, "Dairy": 2.5, "Snacks": 2.0}},
+    "Independence Day": {"prep_days": 0, "duration_days": 1, "impact": {"Beverages": 1.5, "Snacks": 1.5}},
+    "Raksha Bandhan": {"prep_days": 1, "duration_days": 1, "impact": {"Snacks": 3.0, "Dairy": 1.5}},
+    "Janmashtami": {"prep_days": 1, "duration_days": 1, "impact": {"Dairy": 2.5, "Snacks": 2.0}},
+    "Navratri": {"prep_days": 1, "duration_days": 9, "impact": {"Staples": 4.0, "Dairy": 2.0, "Beverages": 2.0}},
+    "Dussehra": {"prep_days": 1, "duration_days": 1, "impact": {"Snacks": 2.5, "Dairy": 1.8, "Beverages": 1.8}},
+    "Diwali": {"prep_days": 4, "duration_days": 3, "impact": {"Snacks": 4.0, "Dairy": 3.0, "Staples": 2.5, "Beverages": 2.5, "Personal Care": 1.8}},
+    "Bhai Dooj": {"prep_days": 1, "duration_days": 1, "impact": {"Snacks": 2.0}},
+    "Christmas": {"prep_days": 3, "duration_days": 1, "impact": {"Beverages": 2.5, "Dairy": 3.0, "Snacks": 2.5}},
+    "New Year Eve": {"prep_days": 2, "duration_days": 1, "impact": {"Beverages": 3.0, "Snacks": 2.5}}
+}
+
+# Festival Dates for 2023-2024 (historical data period)
+FESTIVAL_DATES_2023 = {
+    "Diwali": "2023-11-12",
+    "Bhai Dooj": "2023-11-15",
+    "Christmas": "2023-12-25",
+    "New Year Eve": "2023-12-31"
+}
+
+FESTIVAL_DATES_2024 = {
+    "Makar Sankranti": "2024-01-14",
+    "Republic Day": "2024-01-26",
+    "Valentine's Day": "2024-02-14",
+    "Maha Shivratri": "2024-03-08",
+    "Holi": "2024-03-25",
+    "Eid ul-Fitr": "2024-04-11",
+    "Ram Navami": "2024-04-17",
+    "Eid ul-Adha": "2024-06-17",
+    "Independence Day": "2024-08-15",
+    "Raksha Bandhan": "2024-08-19",
+    "Janmashtami": "2024-08-26",
+    "Navratri": "2024-10-03",
+    "Dussehra": "2024-10-12",
+    "Diwali": "2024-10-31",
+    "Bhai Dooj": "2024-11-15",
+    "Christmas": "2024-12-25",
+    "New Year Eve": "2024-12-31"
+}
+
+# Festival Dates for 2025 (for future predictions)
+FESTIVAL_DATES_2025 = {
+    "Makar Sankranti": "2025-01-14",
+    "Republic Day": "2025-01-26",
+    "Valentine's Day": "2025-02-14",
+    "Maha Shivratri": "2025-02-26",
+    "Holi": "2025-03-14",
+    "Eid ul-Fitr": "2025-03-31",
+    "Ram Navami": "2025-04-06",
+    "Eid ul-Adha": "2025-06-07",
+    "Independence Day": "2025-08-15",
+    "Raksha Bandhan": "2025-08-09",
+    "Janmashtami": "2025-08-16",
+    "Navratri": "2025-09-22",
+    "Dussehra": "2025-10-02",
+    "Diwali": "2025-10-20",
+    "Bhai Dooj": "2025-10-23",
+    "Christmas": "2025-12-25",
+    "New Year Eve": "2025-12-31"
+}
+
+# Festival Dates for 2026 (for future predictions beyond 2025)
+FESTIVAL_DATES_2026 = {
+    "Makar Sankranti": "2026-01-14",
+    "Republic Day": "2026-01-26",
+    "Valentine's Day": "2026-02-14",
+    "Maha Shivratri": "2026-02-17",
+    "Holi": "2026-03-03",
+    "Eid ul-Fitr": "2026-03-20",
+    "Ram Navami": "2026-03-27",
+    "Eid ul-Adha": "2026-05-27",
+    "Independence Day": "2026-08-15",
+    "Raksha Bandhan": "2026-07-29",
+    "Janmashtami": "2026-08-06",
+    "Navratri": "2026-09-11",
+    "Dussehra": "2026-09-21",
+    "Diwali": "2026-10-09",
+    "Bhai Dooj": "2026-10-12",
+    "Christmas": "2026-12-25",
+    "New Year Eve": "2026-12-31"
+}
+
+# Explicit calendars by year
+FESTIVAL_DATES = {
+    2023: FESTIVAL_DATES_2023,
+    2024: FESTIVAL_DATES_2024,
+    2025: FESTIVAL_DATES_2025,
+    2026: FESTIVAL_DATES_2026
+}
+
+# Festivals on the same Gregorian date every year (used for years without an
+# explicit calendar; lunar festivals need explicit dates)
+FIXED_DATE_FESTIVALS = {
+    "Makar Sankranti": "01-14",
+    "Republic Day": "01-26",
+    "Valentine's Day": "02-14",
+    "Independence Day": "08-15",
+    "Christmas": "12-25",
+    "New Year Eve": "12-31"
+}
+
+# Festivals with a prep discount 1-2 days before the festival day
+PREP_DISCOUNT_FESTIVALS = {"Diwali", "Christmas", "Navratri"}
+PREP_DISCOUNT_DAYS = [1, 2]
+
+# days_to_festival value for dates outside any festival window
+NO_FESTIVAL_DAYS = 999
+
+_WARNED_YEARS = set()
+
+
+def calendar_for_year(year, calendars=FESTIVAL_DATES):
+    """
+    Festival name -> date string for one year
+
+    Years without an explicit calendar get the fixed-date festivals only.
+    """
+    if year in calendars:
+        return calendars[year]
+    if year not in _WARNED_YEARS:
+        _WARNED_YEARS.add(year)
+        print(f"[WARNING] No festival calendar for {year}, using fixed-date festivals only")
+    return {name: f"{year}-{month_day}" for name, month_day in FIXED_DATE_FESTIVALS.items()}
+
+
+# ============================================
+# FESTIVAL INDEX
+# ============================================
+
+class FestivalIndex:
+    """
+    Dense (day, category) festival lookup table for a range of years
+
+    For every day and category it stores the festival in effect (prep days
+    through the last festival day), the days until the festival day, and
+    whether the day gets a festival prep discount. When festival windows
+    overlap, the festival listed first in the year's calendar wins.
+    """
+
+    def __init__(self, start_year, end_year, calendars=FESTIVAL_DATES, impacts=FESTIVAL_IMPACTS):
+        self.start_year = start_year
+        self.end_year = end_year
+        self.start = np.datetime64(f'{start_year}-01-01', 'D')
+        n_days = int((np.datetime64(f'{end_year + 1}-01-01', 'D') - self.start).astype(np.int64))
+
+        self.categories = pd.Index(sorted({cat for info in impacts.values() for cat in info['impact']}))
+        self.festival_names = np.array([''] + list(impacts), dtype=object)  # code 0 = no festival
+        self.name_code = np.zeros((n_days, len(self.categories)), dtype=np.int16)
+        self.days_to_festival = np.full((n_days, len(self.categories)), NO_FESTIVAL_DAYS, dtype=np.int32)
+        self.prep_discount_day = np.zeros(n_days, dtype=bool)
+
+        for year in range(start_year, end_year + 1):
+            for fest_name, fest_date_str in calendar_for_year(year, calendars).items():
+                fest_day = int((np.datetime64(fest_date_str, 'D') - self.start).astype(np.int64))
+
+                if fest_name in PREP_DISCOUNT_FESTIVALS:
+                    for days_before in PREP_DISCOUNT_DAYS:
+                        if 0 <= fest_day - days_before < n_days:
+                            self.prep_discount_day[fest_day - days_before] = True
+
+                fest_info = impacts.get(fest_name)
+                if not fest_info or not fest_info.get('impact'):
+                    continue
+                first_day = max(fest_day - fest_info.get('prep_days', 0), 0)
+                last_day = min(fest_day + fest_info.get('duration_days', 1) - 1, n_days - 1)
+                if first_day > last_day:
+                    continue
+
+                days = np.arange(first_day, last_day + 1)
+                cats = self.categories.get_indexer(list(fest_info['impact']))
+                rows, cols = np.ix_(days, cats)
+                free = self.name_code[rows, cols] == 0
+                code = np.flatnonzero(self.festival_names == fest_name)[0]
+                self.name_code[rows, cols] = np.where(free, code, self.name_code[rows, cols])
+                self.days_to_festival[rows, cols] = np.where(
+                    free, fest_day - days[:, None], self.days_to_festival[rows, cols]
+                )
+
+    def covers(self, years):
+        return self.start_year <= min(years) and max(years) <= self.end_year
+
+    def _day_positions(self, dates):
+        days = as_datetime_index(dates).values.astype('datetime64[D]')
+        positions = (days - self.start).astype(np.int64)
+        in_range = (positions >= 0) & (positions < len(self.prep_discount_day))
+        return positions, in_range
+
+    def lookup(self, dates, categories):
+        """
+        Festival status for arrays of dates and categories
+
+        Returns:
+        --------
+        tuple (is_festival, festival_name, days_to_festival) of numpy arrays
+        """
+        positions, valid = self._day_positions(dates)
+        # Resolve each distinct category once
+        category_codes, unique_categories = pd.factorize(np.asarray(categories, dtype=object))
+        cats = self.categories.get_indexer(unique_categories)[category_codes]
+        cats[category_codes < 0] = -1
+        valid &= cats >= 0
+
+        code = np.zeros(len(positions), dtype=np.int16)
+        days_to = np.full(len(positions), NO_FESTIVAL_DAYS, dtype=np.int64)
+        code[valid] = self.name_code[positions[valid], cats[valid]]
+        days_to[valid] = self.days_to_festival[positions[valid], cats[valid]]
+
+        return (code > 0).astype(np.int64), self.festival_names[code], days_to
+
+    def prep_days(self, dates):
+        """Boolean mask of dates that get a festival prep discount"""
+        positions, valid = self._day_positions(dates)
+        prep_day = np.zeros(len(positions), dtype=bool)
+        prep_day[valid] = self.prep_discount_day[positions[valid]]
+        return prep_day
+
+
+# ============================================
+# SHARED INDEX
+# ============================================
+
+_INDEX = None
+_INDEX_LOCK = threading.Lock()
+
+
+def as_datetime_index(dates):
+    """DatetimeIndex view of dates (no re-parsing when already datetime)"""
+    if isinstance(dates, pd.DatetimeIndex):
+        return dates
+    return pd.DatetimeIndex(pd.to_datetime(dates))
+
+
+def get_festival_index(years=None):
+    """
+    Shared FestivalIndex covering at least the given years
+
+    Built once for the explicit calendar years; rebuilt over a wider range the
+    first time dates outside it are looked up.
+    """
+    global _INDEX
+    years = list(years) if years is not None else list(FESTIVAL_DATES)
+    with _INDEX_LOCK:
+        if _INDEX is None or not _INDEX.covers(years):
+            start_year = min(years + ([_INDEX.start_year] if _INDEX else list(FESTIVAL_DATES)))
+            end_year = max(years + ([_INDEX.end_year] if _INDEX else list(FESTIVAL_DATES)))
+            _INDEX = FestivalIndex(start_year, end_year)
+        return _INDEX
+
+
+def lookup_festivals(dates, categories):
+    """
+    Vectorized festival detection
+
+    Parameters:
+    -----------
+    dates : array-like of dates
+    categories : array-like of category names (same length)
+
+    Returns:
+    --------
+    tuple (is_festival, festival_name, days_to_festival) of numpy arrays
+    """
+    dates = as_datetime_index(dates)
+    if len(dates) == 0:
+        return np.array([], dtype=np.int64), np.array([], dtype=object), np.array([], dtype=np.int64)
+    return get_festival_index(np.unique(dates.year).tolist()).lookup(dates, categories)
+
+
+def festival_prep_days(dates):
+    """Vectorized festival prep discount days (see pricing_engine for the rates)"""
+    dates = as_datetime_index(dates)
+    if len(dates) == 0:
+        return np.array([], dtype=bool)
+    return get_festival_index(np.unique(dates.year).tolist()).prep_days(dates)
+
+
+# Build the index for the explicit calendar years at import
+get_festival_index()
@@ -0,0 +1,111 @@
+"""
+Forecast Cache Module for Sales Forecasting
+Bounded LRU cache of forecast results keyed by data version, model version and horizon
+"""
+
+import os
+import threading
+from collections import OrderedDict
+
+
+# ============================================
+# CONFIGURATION
+# ============================================
+
+# Maximum number of forecasts kept in memory (least recently used are evicted)
+FORECAST_CACHE_SIZE = int(os.getenv('FORECAST_CACHE_SIZE', 16))
+
+
+# ============================================
+# CACHE
+# ============================================
+
+class ForecastCache:
+    """
+    Thread-safe LRU cache of forecast DataFrames
+
+    A forecast is deterministic for a given (data_version, model_version,
+    num_days), so that tuple is the cache key. Concurrent requests for the same
+    missing key wait for the first computation instead of repeating it.
+    """
+
+    def __init__(self, max_entries=FORECAST_CACHE_SIZE):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._in_flight = {}
+        self._lock = threading.Lock()
+        self._generation = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    def get_or_compute(self, key, compute):
+        """
+        Return the cached forecast for `key`, computing and storing it on a miss
+
+        Parameters:
+        -----------
+        key : tuple
+            (data_version, model_version, num_days, ...)
+        compute : callable
+            Zero-argument function producing the forecast DataFrame
+
+        Returns:
+        --------
+        pandas.DataFrame (a copy, so callers may modify it freely)
+        """
+        while True:
+            with self._lock:
+                if key in self._entries:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return self._entries[key].copy()
+
+                waiter = self._in_flight.get(key)
+                if waiter is None:
+                    self.misses += 1
+                    done = threading.Event()
+                    self._in_flight[key] = done
+                    generation = self._generation
+                    break
+
+            # Another request is computing this forecast; wait, then re-check
+            waiter.wait()
+
+        try:
+            result = compute()
+            with self._lock:
+                # Skip storing results computed before an invalidation
+                if generation == self._generation:
+                    self._entries[key] = result
+                    self._entries.move_to_end(key)
+                    while len(self._entries) > self.max_entries:
+                        self._entries.popitem(last=False)
+                        self.evictions += 1
+            return result.copy()
+        finally:
+            with self._lock:
+                self._in_flight.pop(key, None)
+            done.set()
+
+    def invalidate(self):
+        """Drop all cached forecasts (after model reload or data ingestion)"""
+        with self._lock:
+            self._entries.clear()
+            self._generation += 1
+            self.invalidations += 1
+
+    def stats(self):
+        """Hit/miss counters and current size"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'entries': len(self._entries),
+                'max_entries': self.max_entries,
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': round(self.hits / lookups, 4) if lookups else 0.0,
+                'evictions': self.evictions,
+                'invalidations': self.invalidations
+            }
@@ -6,26 +6,69 @@ Handles model loading, prediction generation, and future feature preparation
 import pandas as pd
 import numpy as np
 import joblib
+import hashlib
 import os
 from datetime import datetime, timedelta
-from .feature_engineering import (
-    detect_festival_for_date, calculate_discount_for_date,
-    create_features, get_feature_columns
-)
+from .feature_engineering import get_feature_columns
+from .festival_calendar import lookup_festivals
+from .pricing_engine import compute_discounts
+from .feature_store import load_features
+from .rolling_stats import window_stats, ROLLING_STATS
+from .sales_panel import SalesPanel
+from .ensemble_inference import predict_ensemble
+from .forecast_metrics import FORECAST_METRICS
+from .model_artifacts import has_native_models, load_native_models, ModelArtifactError
+
+# Lookback (in rows) used for lag and rolling features of future rows
+HISTORY_WINDOW = 30
+LAG_PERIODS = [1, 3, 7, 14, 21, 30]
+ROLLING_WINDOWS = [3, 7, 14, 30]
+
+
+class UnknownFilterError(ValueError):
+    """Raised when requested products/categories are not in the sales history"""
+    pass
 
 
 # ============================================
 # MODEL LOADING
 # ============================================
 
-def load_models(model_dir=None):
+def compute_model_version(model_dir):
+    """
+    Short fingerprint of the model files in a directory (name, size, mtime)
+
+    Changes whenever a model is retrained or replaced, so it can key caches of
+    model output.
+    """
+    digest = hashlib.sha256()
+    for name in sorted(os.listdir(model_dir)):
+        path = os.path.join(model_dir, name)
+        if os.path.isfile(path):
+            stat = os.stat(path)
+            digest.update(f"{name}:{stat.st_size}:{stat.st_mtime_ns};".encode())
+    return digest.hexdigest()[:16]
+
+
+def load_models(model_dir=None, prefer_native=True):
     """
     Load trained ML models and ensemble weights
     
+    Uses the native-format artifacts (manifest.json) when the directory has
+    them, otherwise the joblib pickles.
+    
+    Parameters:
+    -----------
+    model_dir : str (optional)
+        Model directory, defaults to ml_models/saved_models
+    prefer_native : bool
+        Load native artifacts when present
+    
     Returns:
     --------
     dict with keys: 'lgb_model', 'xgb_model', 'catboost_model', 
-                     'ensemble_weights', 'ensemble_type', 'meta_model'
+                     'ensemble_weights', 'ensemble_type', 'meta_model',
+                     'feature_cols', 'model_version'
     """
     models = {}
     
@@ -35,6 +78,14 @@ def load_models(model_dir=None):
         current_dir = os.path.dirname(os.path.abspath(__file__))
         model_dir = os.path.join(current_dir, 'saved_models')
     
+    if prefer_native and has_native_models(model_dir):
+        try:
+            models = load_native_models(model_dir)
+            models['model_version'] = compute_model_version(model_dir)
+            return models
+        except ModelArtifactError as e:
+            print(f"[WARNING] Native model artifacts unusable ({e}), loading pickles")
+    
     # Load LightGBM
     lgb_path = os.path.join(model_dir, 'lgb_model.pkl')
     if os.path.exists(lgb_path):
@@ -82,6 +133,8 @@ def load_models(model_dir=None):
         print("[WARNING] Feature columns file not found, will use generated features")
         models['feature_cols'] = None
     
+    models['model_version'] = compute_model_version(model_dir)
+    
     return models
 
 
@@ -118,80 +171,253 @@ def generate_future_dates(last_date, num_days=7, product_info_dict=None):
         freq='D'
     )
     
-    # Create future records for all products
-    future_records = []
+    # Product x date cross join: product attributes repeated per date,
+    # dates tiled per product (rows grouped by product, then date)
+    products = pd.DataFrame.from_dict(
+        product_info_dict, orient='index',
+        columns=['category', 'season_affinity', 'price', 'cost_price']
+    )
+    n_products, n_dates = len(products), len(future_dates)
+    
+    def per_product(values):
+        return np.repeat(np.asarray(values), n_dates)
+    
+    def per_date(values):
+        return np.tile(np.asarray(values), n_products)
+    
+    future_df = pd.DataFrame({
+        'sale_date': per_date(future_dates.values),
+        'product_name': per_product(products.index),
+        'category': per_product(products['category']),
+        'season_affinity': per_product(products['season_affinity']),
+        'price': per_product(products['price']),
+        'cost_price': per_product(products['cost_price']),
+    })
+    
+    if len(future_df) == 0:
+        return future_df
+    
+    # Discounts and festivals depend only on (category, date): compute them on
+    # the small category x date grid, then gather one grid row per product
+    category_codes, categories = pd.factorize(products['category'].to_numpy(dtype=object))
+    grid_dates = pd.DatetimeIndex(np.tile(future_dates.values, len(categories)))
+    grid_categories = np.repeat(np.asarray(categories, dtype=object), n_dates)
+    grid_shape = (len(categories), n_dates)
+    
+    def per_row(grid_values):
+        return grid_values.reshape(grid_shape)[category_codes].ravel()
+    
+    # Discount and final price
+    discount_percent = per_row(compute_discounts(grid_dates, grid_categories).round(2))
+    future_df['discount_percent'] = discount_percent
+    future_df['final_price'] = future_df['price'] * (1 - discount_percent / 100)
+    
+    # Festival status
+    is_festival, festival_name, days_to_fest = lookup_festivals(grid_dates, grid_categories)
+    future_df['is_festival'] = per_row(is_festival)
+    future_df['festival_name'] = per_row(festival_name)
+    future_df['days_to_festival'] = per_row(days_to_fest)
+    
+    # Time features
+    day_of_week = per_date(future_dates.dayofweek.astype(np.int64))
+    future_df['day_of_week'] = day_of_week
+    future_df['month'] = per_date(future_dates.month.astype(np.int64))
+    future_df['year'] = per_date(future_dates.year.astype(np.int64))
+    future_df['is_weekend'] = (day_of_week >= 5).astype(np.int64)
+    future_df['quantity_sold'] = 0  # Placeholder for lag calculations
     
-    for product_name, product_info in product_info_dict.items():
-        category = product_info['category']
-        season_affinity = product_info['season_affinity']
-        price = product_info['price']
-        cost_price = product_info['cost_price']
-        
-        for date in future_dates:
-            # Detect festival
-            is_festival, festival_name, days_to_fest = detect_festival_for_date(date, category)
-            
-            # Calculate discount
-            discount_percent = calculate_discount_for_date(date, category)
-            
-            # Calculate final price
-            final_price = price * (1 - discount_percent / 100)
-            
-            # Time features
-            day_of_week = date.dayofweek
-            month = date.month
-            year = date.year
-            is_weekend = 1 if day_of_week >= 5 else 0
-            
-            record = {
-                'sale_date': date,
-                'product_name': product_name,
-                'category': category,
-                'season_affinity': season_affinity,
-                'price': price,
-                'cost_price': cost_price,
-                'discount_percent': discount_percent,
-                'final_price': final_price,
-                'is_festival': is_festival,
-                'festival_name': festival_name,
-                'days_to_festival': days_to_fest,
-                'day_of_week': day_of_week,
-                'month': month,
-                'year': year,
-                'is_weekend': is_weekend,
-                'quantity_sold': 0  # Placeholder for lag calculations
-            }
-            
-            future_records.append(record)
-    
-    future_df = pd.DataFrame(future_records)
     return future_df
 
 
-def prepare_future_features_with_lags(future_df, historical_df):
+def _history_tail_matrix(historical_df, products):
+    """
+    Build a (n_products, HISTORY_WINDOW) matrix of the last observed quantities
+    
+    Rows follow the order of `products`. Each row is right-aligned so that the
+    last column holds the most recent sale; products with shorter history are
+    left-padded with NaN. For a SalesPanel the columns are the last
+    HISTORY_WINDOW calendar days (days without sales records stay NaN).
+    """
+    matrix = np.full((len(products), HISTORY_WINDOW), np.nan)
+    
+    if isinstance(historical_df, SalesPanel):
+        rows = historical_df.rows(products)
+        known = rows >= 0
+        tail = historical_df.tail(HISTORY_WINDOW)
+        matrix[known, HISTORY_WINDOW - tail.shape[1]:] = tail[rows[known]]
+        return matrix
+    
+    history = historical_df[['product_name', 'sale_date', 'quantity_sold']]
+    history = history.sort_values('sale_date', kind='stable')
+    tail = history.groupby('product_name', sort=False).tail(HISTORY_WINDOW)
+    
+    rows = pd.Index(products).get_indexer(tail['product_name'])
+    cols = HISTORY_WINDOW - 1 - tail.groupby('product_name', sort=False).cumcount(ascending=False).to_numpy()
+    known = rows >= 0
+    matrix[rows[known], cols[known]] = tail['quantity_sold'].to_numpy(dtype=float)[known]
+    return matrix
+
+
+def _history_frame(historical_df):
+    """Long-format (product_name, category, quantity_sold) history for encodings"""
+    if not isinstance(historical_df, SalesPanel):
+        return historical_df
+    
+    rows, cols = np.nonzero(historical_df.observed)
+    return pd.DataFrame({
+        'product_name': historical_df.products[rows],
+        'category': historical_df.product_info['category'].to_numpy()[rows],
+        'quantity_sold': historical_df.quantity[rows, cols].astype(float)
+    })
+
+
+def _lag_rolling_features(last_values):
+    """
+    Lag, rolling, CV, EWM and trend features for every product at once
+    
+    Parameters:
+    -----------
+    last_values : numpy.ndarray
+        (n_products, HISTORY_WINDOW) matrix from _history_tail_matrix()
+    
+    Returns:
+    --------
+    dict mapping feature name -> array with one value per product
+    """
+    features = {}
+    
+    # Lag features (NaN when the product has less history than the lag)
+    for lag in LAG_PERIODS:
+        features[f'lag_{lag}'] = last_values[:, -lag]
+    
+    # Fill missing lags with fallback values
+    lag_1 = np.nan_to_num(features['lag_1'], nan=0.0)
+    lag_7 = np.where(np.isnan(features['lag_7']), lag_1, features['lag_7'])
+    lag_14 = np.where(np.isnan(features['lag_14']), lag_7, features['lag_14'])
+    lag_30 = np.where(np.isnan(features['lag_30']), lag_14, features['lag_30'])
+    
+    # Lag differences
+    features['lag_diff_7_1'] = lag_1 - lag_7
+    features['lag_diff_14_7'] = lag_7 - lag_14
+    features['lag_diff_30_14'] = lag_14 - lag_30
+    
+    # Percentage changes
+    features['lag_pct_change_7'] = (lag_1 - lag_7) / (lag_7 + 1)
+    features['lag_pct_change_30'] = (lag_7 - lag_30) / (lag_30 + 1)
+    
+    # Rolling statistics (use last available values from historical data)
+    # Windows wider than the available history use all values, with q25/q75
+    # falling back to min/max
+    observed = np.sum(~np.isnan(last_values), axis=1)
+    for window in ROLLING_WINDOWS:
+        stats = window_stats(last_values[:, -window:], ddof=0)
+        full_window = observed >= window
+        stats['q25'] = np.where(full_window, stats['q25'], stats['min'])
+        stats['q75'] = np.where(full_window, stats['q75'], stats['max'])
+        for stat in ROLLING_STATS:
+            features[f'rolling_{stat}_{window}'] = stats[stat]
+    
+    # Coefficient of variation
+    features['cv_7'] = features['rolling_std_7'] / (features['rolling_mean_7'] + 1)
+    features['cv_30'] = features['rolling_std_30'] / (features['rolling_mean_30'] + 1)
+    
+    # EWMA features (approximate using last rolling mean)
+    features['ewm_3'] = features['rolling_mean_3']
+    features['ewm_7'] = features['rolling_mean_7']
+    features['ewm_14'] = features['rolling_mean_14']
+    features['ewm_30'] = features['rolling_mean_30']
+    features['ewm_std_7'] = features['rolling_std_7']
+    features['ewm_std_30'] = features['rolling_std_30']
+    
+    # Trend features
+    features['wow_trend'] = lag_7 - lag_14
+    features['wow_trend_pct'] = (lag_7 - lag_14) / (lag_14 + 1)
+    features['mom_trend'] = lag_7 - lag_30
+    features['mom_trend_pct'] = (lag_7 - lag_30) / (lag_30 + 1)
+    features['acceleration'] = (lag_1 - lag_7) - (lag_7 - lag_14)
+    
+    # Same day of week mean (approximation)
+    features['same_dow_mean_4w'] = features['rolling_mean_7']
+    
+    return features
+
+
+def compute_category_stats(historical_df):
+    """Per-category mean and std of quantity_sold (category encodings)"""
+    history = _history_frame(historical_df)
+    return history.groupby('category')['quantity_sold'].agg(['mean', 'std'])
+
+
+def filter_history(df_features, products=None, categories=None):
+    """
+    Rows of the history for the requested products and/or categories
+    
+    Parameters:
+    -----------
+    df_features : pandas.DataFrame
+        Historical data with features
+    products : list of str (optional)
+        Product names to keep
+    categories : list of str (optional)
+        Categories to keep (combined with products as an AND)
+    
+    Returns:
+    --------
+    pandas.DataFrame with the matching rows
+    
+    Raises:
+    -------
+    UnknownFilterError if a requested product or category is not in the
+    history, or nothing matches both filters
+    """
+    mask = np.ones(len(df_features), dtype=bool)
+    for column, values in (('product_name', products), ('category', categories)):
+        if values is None:
+            continue
+        known = df_features[column].unique()
+        unknown = sorted(set(values) - set(known))
+        if unknown:
+            raise UnknownFilterError(f"Unknown {column.replace('_name', '')}(s): {', '.join(map(str, unknown))}")
+        mask &= df_features[column].isin(values).to_numpy()
+    
+    if not mask.any():
+        raise UnknownFilterError("No products match the requested products and categories")
+    return df_features[mask]
+
+
+def prepare_future_features_with_lags(future_df, historical_df, category_stats=None):
     """
     Prepare complete feature set for future dates including lag features
     
+    Lag and rolling features are computed once per product from a single
+    tail pass over the history and broadcast across the forecast horizon.
+    
     Parameters:
     -----------
     future_df : pandas.DataFrame
         Future dates with basic features
-    historical_df : pandas.DataFrame
-        Historical data with all features already computed
+    historical_df : pandas.DataFrame or SalesPanel
+        Historical data with all features already computed, or a SalesPanel
+        (lags and rolling windows then use calendar days)
+    category_stats : pandas.DataFrame (optional)
+        Per-category 'mean' and 'std' of quantity_sold. Pass the statistics
+        of the full history when historical_df only holds a product subset,
+        so category encodings match a full forecast.
     
     Returns:
     --------
     pandas.DataFrame with complete feature set
     """
     future_df = future_df.copy()
+    history = _history_frame(historical_df)
     
     # ============================================
     # PRODUCT ENCODING (from historical data)
     # ============================================
-    product_means = historical_df.groupby('product_name')['quantity_sold'].mean()
-    product_std = historical_df.groupby('product_name')['quantity_sold'].std()
-    product_median = historical_df.groupby('product_name')['quantity_sold'].median()
-    product_max = historical_df.groupby('product_name')['quantity_sold'].max()
+    product_means = history.groupby('product_name')['quantity_sold'].mean()
+    product_std = history.groupby('product_name')['quantity_sold'].std()
+    product_median = history.groupby('product_name')['quantity_sold'].median()
+    product_max = history.groupby('product_name')['quantity_sold'].max()
     
     future_df['product_encoded'] = future_df['product_name'].map(product_means)
     future_df['product_std'] = future_df['product_name'].map(product_std).fillna(0)
@@ -201,117 +427,34 @@ def prepare_future_features_with_lags(future_df, historical_df):
     # ============================================
     # LAG FEATURES AND ROLLING STATS
     # ============================================
-    # Get last 30 days of data per product for lag calculation
-    for product in future_df['product_name'].unique():
-        historical_product = historical_df[historical_df['product_name'] == product].sort_values('sale_date')
-        
-        if len(historical_product) == 0:
-            continue
-        
-        # Get last N values for lags
-        last_values = historical_product['quantity_sold'].tail(30).values
-        
-        # Create mask for this product in future df
-        future_product_mask = future_df['product_name'] == product
-        
-        # Lag features (use last historical values)
-        if len(last_values) >= 1:
-            future_df.loc[future_product_mask, 'lag_1'] = last_values[-1] if len(last_values) >= 1 else 0
-        if len(last_values) >= 3:
-            future_df.loc[future_product_mask, 'lag_3'] = last_values[-3] if len(last_values) >= 3 else last_values[-1]
-        if len(last_values) >= 7:
-            future_df.loc[future_product_mask, 'lag_7'] = last_values[-7] if len(last_values) >= 7 else last_values[-1]
-        if len(last_values) >= 14:
-            future_df.loc[future_product_mask, 'lag_14'] = last_values[-14] if len(last_values) >= 14 else last_values[-1]
-        if len(last_values) >= 21:
-            future_df.loc[future_product_mask, 'lag_21'] = last_values[-21] if len(last_values) >= 21 else last_values[-1]
-        if len(last_values) >= 30:
-            future_df.loc[future_product_mask, 'lag_30'] = last_values[-30] if len(last_values) >= 30 else last_values[-1]
-        
-        # Fill missing lags with fallback values
-        lag_1 = future_df.loc[future_product_mask, 'lag_1'].fillna(0).values[0] if 'lag_1' in future_df.columns else 0
-        lag_7 = future_df.loc[future_product_mask, 'lag_7'].fillna(lag_1).values[0] if 'lag_7' in future_df.columns else lag_1
-        lag_14 = future_df.loc[future_product_mask, 'lag_14'].fillna(lag_7).values[0] if 'lag_14' in future_df.columns else lag_7
-        lag_30 = future_df.loc[future_product_mask, 'lag_30'].fillna(lag_14).values[0] if 'lag_30' in future_df.columns else lag_14
-        
-        # Lag differences
-        future_df.loc[future_product_mask, 'lag_diff_7_1'] = lag_1 - lag_7
-        future_df.loc[future_product_mask, 'lag_diff_14_7'] = lag_7 - lag_14
-        future_df.loc[future_product_mask, 'lag_diff_30_14'] = lag_14 - lag_30
-        
-        # Percentage changes
-        future_df.loc[future_product_mask, 'lag_pct_change_7'] = (lag_1 - lag_7) / (lag_7 + 1)
-        future_df.loc[future_product_mask, 'lag_pct_change_30'] = (lag_7 - lag_30) / (lag_30 + 1)
-        
-        # Rolling statistics (use last available values from historical data)
-        for window in [3, 7, 14, 30]:
-            if len(last_values) >= window:
-                rolling_data = last_values[-window:]
-                rolling_mean = np.mean(rolling_data)
-                rolling_std = np.std(rolling_data)
-                rolling_min = np.min(rolling_data)
-                rolling_max = np.max(rolling_data)
-                rolling_median = np.median(rolling_data)
-                rolling_q25 = np.percentile(rolling_data, 25)
-                rolling_q75 = np.percentile(rolling_data, 75)
-            else:
-                rolling_mean = np.mean(last_values) if len(last_values) > 0 else 0
-                rolling_std = np.std(last_values) if len(last_values) > 0 else 0
-                rolling_min = np.min(last_values) if len(last_values) > 0 else 0
-                rolling_max = np.max(last_values) if len(last_values) > 0 else 0
-                rolling_median = np.median(last_values) if len(last_values) > 0 else 0
-                rolling_q25 = rolling_min
-                rolling_q75 = rolling_max
-            
-            future_df.loc[future_product_mask, f'rolling_mean_{window}'] = rolling_mean
-            future_df.loc[future_product_mask, f'rolling_std_{window}'] = rolling_std
-            future_df.loc[future_product_mask, f'rolling_min_{window}'] = rolling_min
-            future_df.loc[future_product_mask, f'rolling_max_{window}'] = rolling_max
-            future_df.loc[future_product_mask, f'rolling_median_{window}'] = rolling_median
-            future_df.loc[future_product_mask, f'rolling_q25_{window}'] = rolling_q25
-            future_df.loc[future_product_mask, f'rolling_q75_{window}'] = rolling_q75
-        
-        # Coefficient of variation
-        rolling_mean_7 = future_df.loc[future_product_mask, 'rolling_mean_7'].values[0] if 'rolling_mean_7' in future_df.columns else 1
-        rolling_std_7 = future_df.loc[future_product_mask, 'rolling_std_7'].values[0] if 'rolling_std_7' in future_df.columns else 0
-        rolling_mean_30 = future_df.loc[future_product_mask, 'rolling_mean_30'].values[0] if 'rolling_mean_30' in future_df.columns else 1
-        rolling_std_30 = future_df.loc[future_product_mask, 'rolling_std_30'].values[0] if 'rolling_std_30' in future_df.columns else 0
-        
-        future_df.loc[future_product_mask, 'cv_7'] = rolling_std_7 / (rolling_mean_7 + 1)
-        future_df.loc[future_product_mask, 'cv_30'] = rolling_std_30 / (rolling_mean_30 + 1)
-        
-        # EWMA features (approximate using last rolling mean)
-        future_df.loc[future_product_mask, 'ewm_3'] = future_df.loc[future_product_mask, 'rolling_mean_3']
-        future_df.loc[future_product_mask, 'ewm_7'] = future_df.loc[future_product_mask, 'rolling_mean_7']
-        future_df.loc[future_product_mask, 'ewm_14'] = future_df.loc[future_product_mask, 'rolling_mean_14']
-        future_df.loc[future_product_mask, 'ewm_30'] = future_df.loc[future_product_mask, 'rolling_mean_30']
-        future_df.loc[future_product_mask, 'ewm_std_7'] = rolling_std_7
-        future_df.loc[future_product_mask, 'ewm_std_30'] = rolling_std_30
-        
-        # Trend features
-        future_df.loc[future_product_mask, 'wow_trend'] = lag_7 - lag_14
-        future_df.loc[future_product_mask, 'wow_trend_pct'] = (lag_7 - lag_14) / (lag_14 + 1)
-        future_df.loc[future_product_mask, 'mom_trend'] = lag_7 - lag_30
-        future_df.loc[future_product_mask, 'mom_trend_pct'] = (lag_7 - lag_30) / (lag_30 + 1)
-        future_df.loc[future_product_mask, 'acceleration'] = (lag_1 - lag_7) - (lag_7 - lag_14)
-        
-        # Same day of week mean (approximation)
-        future_df.loc[future_product_mask, 'same_dow_mean_4w'] = rolling_mean_7
+    # One (n_products, 30) matrix of recent sales drives every lag/rolling column
+    products = pd.Index(future_df['product_name'].unique())
+    last_values = _history_tail_matrix(historical_df, products)
+    product_features = _lag_rolling_features(last_values)
+    
+    # Broadcast per-product values across the forecast horizon
+    row_product = products.get_indexer(future_df['product_name'])
+    lag_rolling_df = pd.DataFrame(
+        {col: values[row_product] for col, values in product_features.items()},
+        index=future_df.index
+    )
+    future_df = pd.concat([future_df, lag_rolling_df], axis=1)
     
     # ============================================
     # CATEGORY ENCODING
     # ============================================
-    category_means = historical_df.groupby('category')['quantity_sold'].mean()
-    category_std = historical_df.groupby('category')['quantity_sold'].std()
-    future_df['category_encoded'] = future_df['category'].map(category_means)
-    future_df['category_std'] = future_df['category'].map(category_std)
+    if category_stats is None:
+        category_stats = compute_category_stats(history)
+    future_df['category_encoded'] = future_df['category'].map(category_stats['mean'])
+    future_df['category_std'] = future_df['category'].map(category_stats['std'])
     
     # Product-category interaction
-    prod_cat_means = historical_df.groupby(['product_name', 'category'])['quantity_sold'].mean()
-    future_df['product_category_encoded'] = future_df.apply(
-        lambda x: prod_cat_means.get((x['product_name'], x['category']), x['product_encoded']), 
-        axis=1
+    prod_cat_means = history.groupby(['product_name', 'category'])['quantity_sold'].mean()
+    prod_cat_keys = pd.MultiIndex.from_arrays([future_df['product_name'], future_df['category']])
+    future_df['product_category_encoded'] = (
+        prod_cat_means.reindex(prod_cat_keys).to_numpy()
     )
+    future_df['product_category_encoded'] = future_df['product_category_encoded'].fillna(future_df['product_encoded'])
     
     # ============================================
     # TIME-BASED FEATURES
@@ -372,11 +515,76 @@ def prepare_future_features_with_lags(future_df, historical_df):
     return future_df
 
 
+# ============================================
+# RECURSIVE MULTI-STEP PREDICTION
+# ============================================
+
+def predict_recursive(future_df_features, historical_df, models, feature_cols):
+    """
+    Predict the horizon one day at a time, feeding predictions back into the lags
+    
+    Each step rebuilds the lag/rolling features of all products from a
+    (n_products, HISTORY_WINDOW) state matrix, scores every product with a
+    single batched ensemble call, then shifts the state left by one day and
+    appends that day's predictions.
+    
+    Parameters:
+    -----------
+    future_df_features : pandas.DataFrame
+        Output of prepare_future_features_with_lags() (non-lag features are reused)
+    historical_df : pandas.DataFrame or SalesPanel
+        Same history passed to prepare_future_features_with_lags()
+    models : dict
+        Output of load_models()
+    feature_cols : list
+        Feature columns in training order
+    
+    Returns:
+    --------
+    numpy.ndarray of non-negative predictions aligned with future_df_features rows
+    """
+    products = pd.Index(future_df_features['product_name'].unique())
+    state = _history_tail_matrix(historical_df, products)
+    
+    row_product = products.get_indexer(future_df_features['product_name'])
+    dates = pd.to_datetime(future_df_features['sale_date'])
+    step_of_row = (dates - dates.min()).dt.days.to_numpy()
+    
+    X_future = future_df_features[feature_cols].fillna(0)
+    predictions = np.zeros(len(future_df_features))
+    dynamic_cols = None
+    
+    for step in range(step_of_row.max() + 1):
+        rows = np.flatnonzero(step_of_row == step)
+        if len(rows) == 0:
+            continue
+        step_products = row_product[rows]
+        
+        product_features = _lag_rolling_features(state)
+        if dynamic_cols is None:
+            dynamic_cols = [col for col in feature_cols if col in product_features]
+        
+        X_step = X_future.iloc[rows].copy()
+        for col in dynamic_cols:
+            X_step[col] = np.nan_to_num(product_features[col][step_products], nan=0.0)
+        
+        step_predictions, _ = predict_ensemble(models, X_step)
+        predictions[rows] = step_predictions
+        
+        # Advance one day: predictions become the newest observation
+        next_day = np.full(len(products), np.nan)
+        next_day[step_products] = step_predictions
+        state = np.column_stack([state[:, 1:], next_day])
+    
+    return predictions
+
+
 # ============================================
 # PREDICTION GENERATION
 # ============================================
 
-def generate_forecast(csv_path, num_days=7, models=None):
+def generate_forecast(csv_path, num_days=7, models=None, recursive=False, products=None, categories=None,
+                      shadow=None):
     """
     Generate sales forecast for next N days
     
@@ -388,40 +596,62 @@ def generate_forecast(csv_path, num_days=7, models=None):
         Number of days to forecast ahead
     models : dict (optional)
         Pre-loaded models. If None, will load from default directory
+    recursive : bool
+        Predict day by day, feeding each day's predictions into the next
+        day's lag/rolling features (default: every day uses the last
+        observed history)
+    products : list of str (optional)
+        Only forecast these products
+    categories : list of str (optional)
+        Only forecast products in these categories
+    shadow : ShadowScorer (optional)
+        Also score the same features with a candidate model version in the
+        background (direct mode only; the result is not affected)
     
     Returns:
     --------
     pandas.DataFrame with forecast results
+    
+    Stage durations are recorded in FORECAST_METRICS as generate_forecast.*
     """
-    # Load historical data
-    print(f"Loading historical data from {csv_path}...")
-    df = pd.read_csv(csv_path)
-    df['sale_date'] = pd.to_datetime(df['sale_date'])
-    df = df.sort_values('sale_date').reset_index(drop=True)
+    timer = FORECAST_METRICS.timer('generate_forecast')
+    
+    # Load historical features (from the feature store when the data is unchanged)
+    # CRITICAL: Keep FULL df_features (with NaN) for lag/rolling calculations
+    df_features = load_features(csv_path)
+    timer.lap('load_features')
+    
+    # The horizon starts after the last date of the whole dataset, also for
+    # subsets whose products stopped selling earlier
+    last_date = df_features['sale_date'].max()
+    
+    # Restrict to the requested subset before building features and scoring.
+    # Category encodings still use the whole history, so each product's
+    # forecast matches the full forecast.
+    category_stats = None
+    if products is not None or categories is not None:
+        category_stats = compute_category_stats(df_features)
+        df_features = filter_history(df_features, products, categories)
+        timer.lap('filter_history')
     
-    last_date = df['sale_date'].max()
     print(f"   Last date in data: {last_date.date()}")
-    print(f"   Total records: {len(df):,}")
-    print(f"   Products: {df['product_name'].nunique()}")
+    print(f"   Total records with features: {len(df_features):,}")
+    print(f"   Products: {df_features['product_name'].nunique()}")
     
     # Create product info dictionary from data
-    product_info = df.groupby('product_name').agg({
+    product_info = df_features.groupby('product_name').agg({
         'category': 'first',
         'season_affinity': 'first',
         'price': 'first',
         'cost_price': 'first'
     }).to_dict('index')
-    
-    # Create features for historical data
-    # CRITICAL: Keep FULL df_features (with NaN) for lag/rolling calculations
-    print("Creating features for historical data...")
-    df_features = create_features(df)
-    print(f"   Total records with features: {len(df_features):,}")
+    timer.lap('product_info')
     
     # Load models if not provided
     if models is None:
         print("Loading ML models...")
         models = load_models()
+        timer.lap('load_models')
     
     # CRITICAL: Use saved feature columns from training, not newly generated ones
     if models['feature_cols'] is not None:
@@ -436,9 +666,10 @@ def generate_forecast(csv_path, num_days=7, models=None):
     # Generate future dates
     print(f"Generating features for next {num_days} days...")
     future_df = generate_future_dates(last_date, num_days, product_info)
+    timer.lap('future_frame')
     
     # CRITICAL: Pass FULL df_features (not cleaned) for accurate lag/rolling stats
-    future_df_features = prepare_future_features_with_lags(future_df, df_features)
+    future_df_features = prepare_future_features_with_lags(future_df, df_features, category_stats)
     
     # Ensure all required features are present
     missing_cols = set(feature_cols) - set(future_df_features.columns)
@@ -449,34 +680,26 @@ def generate_forecast(csv_path, num_days=7, models=None):
     
     # Prepare feature matrix with EXACT order from training
     X_future = future_df_features[feature_cols].fillna(0)
+    timer.lap('future_features')
     
     # Generate predictions
     print("Generating predictions...")
     
-    # LightGBM
-    pred_lgb = models['lgb_model'].predict(X_future, num_iteration=models['lgb_model'].best_iteration)
-    pred_lgb = np.maximum(pred_lgb, 0)
-    
-    # XGBoost
-    import xgboost as xgb
-    dfuture = xgb.DMatrix(X_future)
-    pred_xgb = models['xgb_model'].predict(dfuture)
-    pred_xgb = np.maximum(pred_xgb, 0)
-    
-    # CatBoost
-    pred_cat = models['catboost_model'].predict(X_future)
-    pred_cat = np.maximum(pred_cat, 0)
-    
-    # Ensemble prediction
-    ensemble_type = models['ensemble_type']
-    if ensemble_type == 'Stacking' and models['meta_model'] is not None:
-        meta_features = np.column_stack([pred_lgb, pred_xgb, pred_cat])
-        pred_ensemble = models['meta_model'].predict(meta_features)
-        pred_ensemble = np.maximum(pred_ensemble, 0)
+    if recursive:
+        # One batched ensemble call per forecast day
+        pred_ensemble = predict_recursive(future_df_features, df_features, models, feature_cols)
     else:
-        weights = models['ensemble_weights']
-        pred_ensemble = weights[0] * pred_lgb + weights[1] * pred_xgb + weights[2] * pred_cat
-        pred_ensemble = np.maximum(pred_ensemble, 0)
+        # Base models run concurrently on the shared inference pool
+        pred_ensemble, latencies = predict_ensemble(models, X_future)
+        print("   Model latency: " + ", ".join(f"{name} {seconds * 1000:.0f}ms" for name, seconds in latencies.items()))
+        for name, seconds in latencies.items():
+            if name != 'ensemble':
+                FORECAST_METRICS.record(f'generate_forecast.predict_{name}', seconds)
+        
+        if shadow is not None:
+            shadow.submit(models, future_df_features, pred_ensemble, latencies['ensemble'])
+    
+    timer.lap('predict')
     
     # Add predictions to dataframe
     future_df_features['predicted_quantity'] = pred_ensemble.round().astype(int)
@@ -489,6 +712,8 @@ def generate_forecast(csv_path, num_days=7, models=None):
         'sale_date', 'product_name', 'category', 'price', 'discount_percent',
         'final_price', 'is_festival', 'festival_name', 'predicted_quantity', 'forecasted_revenue'
     ]].copy()
+    timer.lap('assemble_output')
+    timer.finish()
     
     print("[SUCCESS] Forecast generated successfully!")
     print(f"   Total predictions: {len(output_df):,}")
@@ -0,0 +1,157 @@
+"""
+Forecast Metrics Module for Sales Forecasting
+Per-stage timings of every forecast run, aggregated into rolling percentiles
+"""
+
+import numpy as np
+import os
+import threading
+import time
+import tracemalloc
+from collections import deque
+
+
+# ============================================
+# CONFIGURATION
+# ============================================
+
+# Samples kept per stage for the rolling percentiles
+METRICS_WINDOW = int(os.getenv('FORECAST_METRICS_WINDOW', '500'))
+
+# Record tracemalloc peaks per stage (slows allocation-heavy stages noticeably)
+METRICS_TRACE_MEMORY = os.getenv('FORECAST_METRICS_TRACE_MEMORY', '0') == '1'
+
+PERCENTILES = [50, 90, 95, 99]
+
+
+# ============================================
+# METRICS
+# ============================================
+
+class StageTimer:
+    """
+    Lap timer for one run: each lap() records the time since the previous lap
+
+    Stage names are recorded as "<prefix>.<stage>"; finish() records the
+    whole run as "<prefix>.total".
+    """
+
+    def __init__(self, metrics, prefix):
+        self.metrics = metrics
+        self.prefix = prefix
+        self.start = self._last = time.perf_counter()
+        self.laps = {}
+        self._tracing = metrics.trace_memory and tracemalloc.is_tracing()
+        if self._tracing:
+            tracemalloc.reset_peak()
+
+    def lap(self, stage):
+        """Record the stage that just ended; returns its duration in seconds"""
+        now = time.perf_counter()
+        seconds = now - self._last
+        self._last = now
+
+        peak_mb = None
+        if self._tracing:
+            peak_mb = tracemalloc.get_traced_memory()[1] / 1024 ** 2
+            tracemalloc.reset_peak()
+
+        self.laps[stage] = self.laps.get(stage, 0.0) + seconds
+        self.metrics.record(f"{self.prefix}.{stage}", seconds, peak_mb)
+        return seconds
+
+    def finish(self):
+        """Record the total run time; returns it in seconds"""
+        seconds = time.perf_counter() - self.start
+        self.metrics.record(f"{self.prefix}.total", seconds)
+        return seconds
+
+
+class ForecastMetrics:
+    """
+    Thread-safe rolling window of stage durations (and optional memory peaks)
+
+    With trace_memory, tracemalloc runs for the whole process and each stage
+    records the traced peak since the previous stage. The peak is process
+    wide, so stages of concurrent requests can inflate each other's numbers.
+    """
+
+    def __init__(self, window=METRICS_WINDOW, trace_memory=METRICS_TRACE_MEMORY):
+        self.window = window
+        self._lock = threading.Lock()
+        self._samples = {}  # stage -> deque of (seconds, peak_mb)
+        self._counts = {}
+        self.trace_memory = False
+        self.set_trace_memory(trace_memory)
+
+    def set_trace_memory(self, enabled):
+        """Start or stop per-stage memory peaks"""
+        self.trace_memory = bool(enabled)
+        if self.trace_memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+        elif not self.trace_memory and tracemalloc.is_tracing():
+            tracemalloc.stop()
+
+    def timer(self, prefix):
+        """StageTimer for one run of `prefix` (e.g. 'generate_forecast')"""
+        return StageTimer(self, prefix)
+
+    def record(self, stage, seconds, peak_mb=None):
+        with self._lock:
+            samples = self._samples.get(stage)
+            if samples is None:
+                samples = self._samples[stage] = deque(maxlen=self.window)
+            samples.append((seconds, peak_mb))
+            self._counts[stage] = self._counts.get(stage, 0) + 1
+
+    def reset(self, prefix=''):
+        """Clear the stages starting with prefix (all by default)"""
+        self.summary(prefix, reset=True)
+
+    def summary(self, prefix='', reset=False):
+        """
+        Rolling statistics per stage
+
+        Parameters:
+        -----------
+        prefix : str
+            Only stages starting with this
+        reset : bool
+            Also clear those stages, in the same locked step as reading
+            them (no sample is lost or counted twice)
+
+        Returns:
+        --------
+        dict : stage -> {count (all time), samples (in window), mean_ms,
+        p50_ms, p90_ms, p95_ms, p99_ms, max_ms, and peak_mb_p50 /
+        peak_mb_max when memory was traced}
+        """
+        with self._lock:
+            selected = [stage for stage in self._samples if stage.startswith(prefix)]
+            snapshot = {stage: list(self._samples[stage]) for stage in selected}
+            counts = {stage: self._counts[stage] for stage in selected}
+            if reset:
+                for stage in selected:
+                    del self._samples[stage]
+                    del self._counts[stage]
+
+        stats = {}
+        for stage in sorted(snapshot):
+            seconds = np.array([s for s, _ in snapshot[stage]]) * 1000
+            values = np.percentile(seconds, PERCENTILES)
+            stats[stage] = {
+                'count': counts[stage],
+                'samples': len(seconds),
+                'mean_ms': round(float(seconds.mean()), 2),
+                **{f'p{p}_ms': round(float(v), 2) for p, v in zip(PERCENTILES, values)},
+                'max_ms': round(float(seconds.max()), 2)
+            }
+            peaks = [m for _, m in snapshot[stage] if m is not None]
+            if peaks:
+                stats[stage]['peak_mb_p50'] = round(float(np.median(peaks)), 1)
+                stats[stage]['peak_mb_max'] = round(float(max(peaks)), 1)
+        return stats
+
+
+# Shared by the forecast engine, feature store and API routes
+FORECAST_METRICS = ForecastMetrics()
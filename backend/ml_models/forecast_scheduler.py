@@ -0,0 +1,316 @@
+"""
+Forecast Scheduler Module for Sales Forecasting
+Precomputes the standard forecasts and reorder plans once per day after the data cutoff
+"""
+
+import pandas as pd
+import json
+import os
+import shutil
+import tempfile
+import threading
+from datetime import datetime, timedelta
+from .inventory_reorder import (
+    calculate_reorder_recommendations,
+    DEFAULT_SAFETY_STOCK, DEFAULT_LEAD_TIME_DAYS
+)
+
+
+# ============================================
+# CONFIGURATION
+# ============================================
+
+PRECOMPUTED_DIR = os.getenv(
+    'PRECOMPUTED_FORECAST_DIR',
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), 'precomputed')
+)
+
+# Local time (HH:MM) after which the day's sales data is considered final
+FORECAST_DATA_CUTOFF = os.getenv('FORECAST_DATA_CUTOFF', '22:00')
+
+# Horizons requested by the dashboard
+STANDARD_HORIZONS = [7, 30]
+
+# Number of precomputed runs kept on disk (older ones are pruned)
+MAX_STORED_RUNS = 3
+
+# Lock file in the store: only the process holding it runs the scheduler
+# (e.g. one gunicorn worker; the others serve what it precomputes)
+SCHEDULER_LOCK_NAME = '.scheduler.lock'
+
+try:
+    import fcntl
+except ImportError:  # Windows: no cross-process lock, every process schedules
+    fcntl = None
+
+
+def _parse_cutoff(cutoff):
+    hour, minute = cutoff.split(':')
+    return int(hour), int(minute)
+
+
+def next_run_time(now=None, cutoff=FORECAST_DATA_CUTOFF):
+    """First cutoff time strictly after `now`"""
+    now = now or datetime.now()
+    hour, minute = _parse_cutoff(cutoff)
+    run_at = now.replace(hour=hour, minute=minute, second=0, microsecond=0)
+    if run_at <= now:
+        run_at += timedelta(days=1)
+    return run_at
+
+
+# ============================================
+# PRECOMPUTED ARTIFACTS
+# ============================================
+
+class PrecomputedForecasts:
+    """
+    On-disk store of forecasts and reorder plans for one (data, model) version
+
+    Each run is a directory named after the version; `meta.json` is written
+    last, so a directory without it is an incomplete run and is ignored.
+    """
+
+    def __init__(self, base_dir=PRECOMPUTED_DIR):
+        self.base_dir = base_dir
+
+    def _run_dir(self, version):
+        return os.path.join(self.base_dir, version)
+
+    def _read_meta(self, version):
+        meta_path = os.path.join(self._run_dir(version), 'meta.json')
+        if not os.path.exists(meta_path):
+            return None
+        with open(meta_path) as f:
+            return json.load(f)
+
+    def has_run(self, version):
+        return self._read_meta(version) is not None
+
+    def load_forecast(self, version, num_days):
+        """Precomputed forecast DataFrame, or None if not available"""
+        meta = self._read_meta(version)
+        if meta is None or num_days not in meta['horizons']:
+            return None
+        return pd.read_feather(os.path.join(self._run_dir(version), f'forecast_{num_days}d.feather'))
+
+    def load_reorder(self, version, num_days, current_stock_dict,
+                     safety_stock=DEFAULT_SAFETY_STOCK, lead_time_days=DEFAULT_LEAD_TIME_DAYS):
+        """
+        Precomputed reorder plan, only if it was built from the same inputs
+
+        Returns None when the stock levels or parameters differ from the
+        snapshot used at precompute time.
+        """
+        meta = self._read_meta(version)
+        if meta is None or meta.get('reorder') is None:
+            return None
+        reorder_meta = meta['reorder']
+        if (num_days not in reorder_meta['horizons']
+                or reorder_meta['safety_stock'] != safety_stock
+                or reorder_meta['lead_time_days'] != lead_time_days
+                or reorder_meta['current_stock'] != {str(k): v for k, v in current_stock_dict.items()}):
+            return None
+        return pd.read_feather(os.path.join(self._run_dir(version), f'reorder_{num_days}d.feather'))
+
+    def save_run(self, version, forecasts, reorders=None, current_stock_dict=None):
+        """
+        Persist one run atomically
+
+        Parameters:
+        -----------
+        version : str
+            Data + model version identifier
+        forecasts : dict
+            num_days -> forecast DataFrame
+        reorders : dict (optional)
+            num_days -> reorder DataFrame
+        current_stock_dict : dict (optional)
+            Stock snapshot the reorder plans were computed from
+        """
+        os.makedirs(self.base_dir, exist_ok=True)
+        tmp_dir = tempfile.mkdtemp(dir=self.base_dir, prefix='.tmp-')
+        try:
+            for num_days, forecast_df in forecasts.items():
+                forecast_df.reset_index(drop=True).to_feather(os.path.join(tmp_dir, f'forecast_{num_days}d.feather'))
+            for num_days, reorder_df in (reorders or {}).items():
+                reorder_df.reset_index(drop=True).to_feather(os.path.join(tmp_dir, f'reorder_{num_days}d.feather'))
+
+            meta = {
+                'version': version,
+                'created_at': datetime.now().isoformat(timespec='seconds'),
+                'horizons': sorted(forecasts),
+                'reorder': None
+            }
+            if reorders:
+                meta['reorder'] = {
+                    'horizons': sorted(reorders),
+                    'safety_stock': DEFAULT_SAFETY_STOCK,
+                    'lead_time_days': DEFAULT_LEAD_TIME_DAYS,
+                    'current_stock': {str(k): v for k, v in current_stock_dict.items()}
+                }
+            with open(os.path.join(tmp_dir, 'meta.json'), 'w') as f:
+                json.dump(meta, f, indent=2)
+
+            run_dir = self._run_dir(version)
+            if os.path.exists(run_dir):
+                shutil.rmtree(run_dir)
+            os.replace(tmp_dir, run_dir)
+        finally:
+            if os.path.exists(tmp_dir):
+                shutil.rmtree(tmp_dir, ignore_errors=True)
+        self._prune_runs()
+
+    def _prune_runs(self):
+        """Keep only the most recent MAX_STORED_RUNS runs"""
+        runs = [
+            os.path.join(self.base_dir, name)
+            for name in os.listdir(self.base_dir)
+            if not name.startswith('.') and os.path.isdir(os.path.join(self.base_dir, name))
+        ]
+        runs.sort(key=os.path.getmtime, reverse=True)
+        for path in runs[MAX_STORED_RUNS:]:
+            shutil.rmtree(path, ignore_errors=True)
+
+
+# ============================================
+# SCHEDULER
+# ============================================
+
+class ForecastScheduler:
+    """
+    Background thread that precomputes forecasts once per day after the cutoff
+
+    Parameters:
+    -----------
+    get_version : callable
+        Returns the current (data + model) version string
+    compute_forecast : callable
+        compute_forecast(num_days) -> forecast DataFrame
+    stock_provider : callable (optional)
+        Returns {product_name: current_stock}; reorder plans are skipped when
+        it is missing or fails
+    store : PrecomputedForecasts (optional)
+    horizons : list of int
+    cutoff : str
+        Daily run time as HH:MM (local time)
+    """
+
+    def __init__(self, get_version, compute_forecast, stock_provider=None, store=None,
+                 horizons=None, cutoff=FORECAST_DATA_CUTOFF):
+        self.get_version = get_version
+        self.compute_forecast = compute_forecast
+        self.stock_provider = stock_provider
+        self.store = store or PrecomputedForecasts()
+        self.horizons = horizons or STANDARD_HORIZONS
+        self.cutoff = cutoff
+        self.last_run = None
+        self.last_error = None
+        self._stop = threading.Event()
+        self._thread = None
+        self._run_lock = threading.Lock()
+        self._lock_file = None
+
+    def run_once(self, force=False):
+        """
+        Precompute all horizons for the current version
+
+        Returns:
+        --------
+        bool : True if a run was performed, False if it was already up to date
+        """
+        with self._run_lock:
+            version = self.get_version()
+            if not force and self.store.has_run(version):
+                return False
+
+            print(f"[SCHEDULER] Precomputing forecasts {self.horizons} for {version}...")
+            forecasts = {num_days: self.compute_forecast(num_days) for num_days in self.horizons}
+
+            reorders, current_stock_dict = None, None
+            if self.stock_provider is not None:
+                try:
+                    current_stock_dict = self.stock_provider()
+                    reorders = {
+                        num_days: calculate_reorder_recommendations(forecast_df, current_stock_dict)
+                        for num_days, forecast_df in forecasts.items()
+                    }
+                except Exception as e:
+                    print(f"[WARNING] Skipping precomputed reorder plans: {e}")
+                    reorders = None
+
+            self.store.save_run(version, forecasts, reorders, current_stock_dict)
+            self.last_run = datetime.now()
+            print(f"[OK] Precomputed forecasts stored for {version}")
+            return True
+
+    def _loop(self):
+        # Catch up immediately if today's artifacts are missing (e.g. after a restart)
+        self._safe_run()
+        while not self._stop.is_set():
+            wait_seconds = (next_run_time(cutoff=self.cutoff) - datetime.now()).total_seconds()
+            if self._stop.wait(max(wait_seconds, 0)):
+                break
+            self._safe_run()
+
+    def _safe_run(self):
+        try:
+            self.run_once()
+            self.last_error = None
+        except Exception as e:
+            # The endpoints fall back to live computation; retry at the next cutoff
+            self.last_error = str(e)
+            print(f"[WARNING] Scheduled forecast precompute failed: {e}")
+
+    def _acquire_process_lock(self):
+        """Take the store's scheduler lock; False if another process holds it"""
+        if fcntl is None or self._lock_file is not None:
+            return True
+        os.makedirs(self.store.base_dir, exist_ok=True)
+        lock_file = open(os.path.join(self.store.base_dir, SCHEDULER_LOCK_NAME), 'a')
+        try:
+            fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            lock_file.close()
+            return False
+        self._lock_file = lock_file  # Held (open) for the life of the scheduler
+        return True
+
+    def _release_process_lock(self):
+        if self._lock_file is not None:
+            self._lock_file.close()
+            self._lock_file = None
+
+    def start(self):
+        """
+        Start the background thread (no-op if already running)
+
+        Returns:
+        --------
+        bool : False if another process already schedules for this store
+        """
+        if self._thread is not None and self._thread.is_alive():
+            return True
+        if not self._acquire_process_lock():
+            print(f"[OK] Forecast scheduler runs in another process (lock in {self.store.base_dir})")
+            return False
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._loop, name='forecast-scheduler', daemon=True)
+        self._thread.start()
+        return True
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+        self._release_process_lock()
+
+    def status(self):
+        return {
+            'running': self._thread is not None and self._thread.is_alive(),
+            'cutoff': self.cutoff,
+            'horizons': self.horizons,
+            'next_run': next_run_time(cutoff=self.cutoff).isoformat(timespec='minutes'),
+            'last_run': self.last_run.isoformat(timespec='seconds') if self.last_run else None,
+            'last_error': self.last_error
+        }
@@ -5,6 +5,7 @@ Calculates reorder quantities based on forecast and current stock
 
 import pandas as pd
 import numpy as np
+from .sales_panel import SalesPanel
 
 
 # ============================================
@@ -121,6 +122,27 @@ def get_urgency_status(days_until_stockout):
         return 'green'  # GOOD: 6+ days
 
 
+def _iter_product_forecasts(forecast):
+    """
+    Yield (product_name, category, daily_forecast list) for each product
+    
+    Accepts a long forecast DataFrame or a forecast SalesPanel; panel rows are
+    read directly as contiguous views (days without a forecast are skipped).
+    """
+    if isinstance(forecast, SalesPanel):
+        categories = forecast.product_info['category']
+        for product_name, row in zip(forecast.products, forecast.quantity):
+            daily_forecast = [int(qty) for qty in row[~np.isnan(row)]]
+            if daily_forecast:
+                yield product_name, categories[product_name], daily_forecast
+        return
+    
+    # Group by product
+    for product_name, product_forecast in forecast.groupby('product_name'):
+        product_forecast = product_forecast.sort_values('sale_date').reset_index(drop=True)
+        yield product_name, product_forecast.iloc[0]['category'], product_forecast['predicted_quantity'].tolist()
+
+
 # ============================================
 # MAIN REORDER CALCULATION
 # ============================================
@@ -131,8 +153,9 @@ def calculate_reorder_recommendations(forecast_df, current_stock_dict, safety_st
     
     Parameters:
     -----------
-    forecast_df : pandas.DataFrame
-        Forecast data with columns: date, product_name, category, predicted_quantity
+    forecast_df : pandas.DataFrame or SalesPanel
+        Forecast data with columns: date, product_name, category, predicted_quantity,
+        or a forecast panel (SalesPanel.from_frame(forecast_df, 'predicted_quantity'))
     current_stock_dict : dict
         Dictionary mapping product_name -> current_stock_level
         Example: {'Amul Milk 1L': 50, 'Amul Butter 100g': 30, ...}
@@ -155,20 +178,13 @@ def calculate_reorder_recommendations(forecast_df, current_stock_dict, safety_st
     """
     results = []
     
-    # Group by product
-    for product_name, product_forecast in forecast_df.groupby('product_name'):
-        product_forecast = product_forecast.sort_values('sale_date').reset_index(drop=True)
-        
-        # Get product details
-        category = product_forecast.iloc[0]['category']
+    # Per-product daily forecasts (sorted by date)
+    for product_name, category, daily_forecast in _iter_product_forecasts(forecast_df):
         shelf_life_days = get_shelf_life_days(product_name, category)
         
         # Get current stock (default to 0 if not found)
         current_stock = current_stock_dict.get(product_name, 0)
         
-        # Get daily forecast for next 7 days
-        daily_forecast = product_forecast['predicted_quantity'].tolist()
-        
         # Calculate days until stockout
         days_until_stockout = calculate_days_until_stockout(current_stock, daily_forecast)
         
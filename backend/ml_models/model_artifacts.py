@@ -0,0 +1,251 @@
+"""
+Model Artifacts Module for Sales Forecasting
+Exports/loads the ensemble in each library's native format with a checksummed manifest
+"""
+
+import numpy as np
+import hashlib
+import json
+import mmap
+import os
+import sys
+from datetime import datetime
+
+
+# ============================================
+# CONFIGURATION
+# ============================================
+
+MANIFEST_NAME = 'manifest.json'
+MANIFEST_FORMAT_VERSION = 1
+
+# Native file per base model
+NATIVE_FILES = {
+    'lgb_model': 'lgb_model.txt',
+    'xgb_model': 'xgb_model.ubj',
+    'catboost_model': 'catboost_model.cbm',
+}
+
+
+class ModelArtifactError(Exception):
+    """Raised when a native model directory is incomplete or corrupted"""
+    pass
+
+
+def file_sha256(path):
+    """SHA-256 of a file, read through a memory map (no Python-side copy)"""
+    digest = hashlib.sha256()
+    if os.path.getsize(path) == 0:
+        return digest.hexdigest()
+    with open(path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+        digest.update(mapped)
+    return digest.hexdigest()
+
+
+# ============================================
+# EXPORT
+# ============================================
+
+def export_native_models(models, model_dir):
+    """
+    Write the base models in native formats plus manifest.json
+
+    LightGBM is saved as text (trimmed to the best iteration), XGBoost as
+    UBJSON and CatBoost as .cbm. Ensemble weights and the feature list go in
+    the manifest; a stacking meta-model has no native format and stays in
+    ensemble_config.pkl.
+
+    Parameters:
+    -----------
+    models : dict
+        Output of load_models()
+    model_dir : str
+        Destination directory
+
+    Returns:
+    --------
+    dict : the manifest that was written
+    """
+    import lightgbm as lgb
+    import xgboost as xgb
+    import catboost
+
+    os.makedirs(model_dir, exist_ok=True)
+
+    lgb_model = models['lgb_model']
+    lgb_model.save_model(
+        os.path.join(model_dir, NATIVE_FILES['lgb_model']),
+        num_iteration=lgb_model.best_iteration if lgb_model.best_iteration > 0 else None
+    )
+    models['xgb_model'].save_model(os.path.join(model_dir, NATIVE_FILES['xgb_model']))
+    models['catboost_model'].save_model(os.path.join(model_dir, NATIVE_FILES['catboost_model']), format='cbm')
+
+    if models.get('meta_model') is not None:
+        import joblib
+        joblib.dump({
+            'weights': models['ensemble_weights'],
+            'type': models['ensemble_type'],
+            'meta_model': models['meta_model']
+        }, os.path.join(model_dir, 'ensemble_config.pkl'))
+
+    versions = {
+        'lgb_model': lgb.__version__,
+        'xgb_model': xgb.__version__,
+        'catboost_model': catboost.__version__,
+    }
+    manifest = {
+        'format_version': MANIFEST_FORMAT_VERSION,
+        'created_at': datetime.now().isoformat(timespec='seconds'),
+        'artifacts': {
+            name: {
+                'file': filename,
+                'sha256': file_sha256(os.path.join(model_dir, filename)),
+                'library_version': versions[name]
+            }
+            for name, filename in NATIVE_FILES.items()
+        },
+        'ensemble': {
+            'type': models['ensemble_type'],
+            'weights': [float(w) for w in models['ensemble_weights']],
+            'has_meta_model': models.get('meta_model') is not None
+        },
+        'feature_cols': list(models['feature_cols']) if models.get('feature_cols') is not None else None
+    }
+
+    tmp_path = os.path.join(model_dir, MANIFEST_NAME + '.tmp')
+    with open(tmp_path, 'w') as f:
+        json.dump(manifest, f, indent=2)
+    os.replace(tmp_path, os.path.join(model_dir, MANIFEST_NAME))
+
+    print(f"[OK] Exported native model artifacts to {model_dir}")
+    return manifest
+
+
+# ============================================
+# LOAD
+# ============================================
+
+def has_native_models(model_dir):
+    return os.path.exists(os.path.join(model_dir, MANIFEST_NAME))
+
+
+def _read_manifest(model_dir, verify_checksums=True):
+    """
+    Parse and check manifest.json
+
+    Raises ModelArtifactError for an unreadable or malformed manifest, and
+    for missing or (with verify_checksums) modified artifact files.
+
+    Returns:
+    --------
+    tuple ({model name: artifact path}, ensemble dict, feature_cols)
+    """
+    manifest_path = os.path.join(model_dir, MANIFEST_NAME)
+    try:
+        with open(manifest_path) as f:
+            manifest = json.load(f)
+    except (OSError, ValueError) as e:
+        raise ModelArtifactError(f"Unreadable manifest {manifest_path}: {e}") from e
+
+    if not isinstance(manifest, dict) or manifest.get('format_version') != MANIFEST_FORMAT_VERSION:
+        version = manifest.get('format_version') if isinstance(manifest, dict) else None
+        raise ModelArtifactError(f"Unsupported manifest format: {version}")
+
+    try:
+        artifacts = {name: manifest['artifacts'][name] for name in NATIVE_FILES}
+        paths = {name: os.path.join(model_dir, artifact['file']) for name, artifact in artifacts.items()}
+        checksums = {name: artifact['sha256'] for name, artifact in artifacts.items()}
+        ensemble = {
+            'weights': manifest['ensemble']['weights'],
+            'type': manifest['ensemble']['type'],
+            'has_meta_model': manifest['ensemble'].get('has_meta_model', False)
+        }
+        feature_cols = manifest['feature_cols']
+    except (KeyError, TypeError, AttributeError) as e:
+        raise ModelArtifactError(f"Malformed manifest {manifest_path}: {e!r}") from e
+
+    for name, path in paths.items():
+        if not os.path.exists(path):
+            raise ModelArtifactError(f"Missing model artifact: {path}")
+        if verify_checksums and file_sha256(path) != checksums[name]:
+            raise ModelArtifactError(f"Checksum mismatch for {path}")
+    return paths, ensemble, feature_cols
+
+
+def load_native_models(model_dir, verify_checksums=True):
+    """
+    Load models exported by export_native_models()
+
+    Parameters:
+    -----------
+    model_dir : str
+        Directory containing manifest.json and the native model files
+    verify_checksums : bool
+        Compare each file's SHA-256 with the manifest before loading
+
+    Raises:
+    -------
+    ModelArtifactError if the manifest, an artifact or the stacking
+    meta-model is missing, malformed or modified (load_models() then falls
+    back to the pickles)
+
+    Returns:
+    --------
+    dict with the same keys as load_models()
+    """
+    import lightgbm as lgb
+    import xgboost as xgb
+    from catboost import CatBoostRegressor
+
+    paths, ensemble, feature_cols = _read_manifest(model_dir, verify_checksums)
+    models = {}
+
+    # Each library parses its own file directly (no Python-side copy of the bytes)
+    models['lgb_model'] = lgb.Booster(model_file=paths['lgb_model'])
+    print(f"[OK] Loaded LightGBM model from {paths['lgb_model']}")
+
+    xgb_model = xgb.Booster()
+    xgb_model.load_model(paths['xgb_model'])
+    models['xgb_model'] = xgb_model
+    print(f"[OK] Loaded XGBoost model from {paths['xgb_model']}")
+
+    catboost_model = CatBoostRegressor()
+    catboost_model.load_model(paths['catboost_model'], format='cbm')
+    models['catboost_model'] = catboost_model
+    print(f"[OK] Loaded CatBoost model from {paths['catboost_model']}")
+
+    models['ensemble_weights'] = np.array(ensemble['weights'])
+    models['ensemble_type'] = ensemble['type']
+    models['meta_model'] = None
+    if ensemble['has_meta_model']:
+        import joblib
+        config_path = os.path.join(model_dir, 'ensemble_config.pkl')
+        try:
+            models['meta_model'] = joblib.load(config_path)['meta_model']
+        except (OSError, KeyError, TypeError) as e:
+            raise ModelArtifactError(f"Stacking meta-model unavailable ({config_path}): {e}") from e
+    print(f"[OK] Loaded ensemble config: {models['ensemble_type']}")
+
+    models['feature_cols'] = feature_cols
+    if models['feature_cols'] is not None:
+        print(f"[OK] Loaded {len(models['feature_cols'])} feature columns")
+    else:
+        print("[WARNING] Feature columns not in manifest, will use generated features")
+
+    return models
+
+
+# ============================================
+# MAIN: convert a pickled model directory
+# ============================================
+
+if __name__ == "__main__":
+    # Usage (from backend/): python -m ml_models.model_artifacts [model_dir] [output_dir]
+    from .forecast_engine import load_models
+
+    source_dir = sys.argv[1] if len(sys.argv) > 1 else None
+    pickled = load_models(source_dir, prefer_native=False)
+    output_dir = sys.argv[2] if len(sys.argv) > 2 else (
+        source_dir or os.path.join(os.path.dirname(os.path.abspath(__file__)), 'saved_models')
+    )
+    export_native_models(pickled, output_dir)
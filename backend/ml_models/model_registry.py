@@ -0,0 +1,212 @@
+"""
+Model Registry Module for Sales Forecasting
+Thread-safe set of resident model versions with atomic hot swap and LRU eviction
+"""
+
+import os
+import threading
+from collections import OrderedDict
+from .forecast_engine import load_models
+from .model_artifacts import MANIFEST_NAME
+
+
+# ============================================
+# CONFIGURATION
+# ============================================
+
+# Model versions are the saved_models* directories next to this file
+# (saved_models, saved_models_backup, saved_models_backup2, ...)
+MODEL_BASE_DIR = os.getenv('MODEL_BASE_DIR', os.path.dirname(os.path.abspath(__file__)))
+MODEL_DIR_PREFIX = 'saved_models'
+DEFAULT_MODEL_NAME = os.getenv('MODEL_NAME', 'saved_models')
+
+# Versions kept loaded at once (the active version is never evicted)
+MAX_RESIDENT_MODELS = int(os.getenv('MAX_RESIDENT_MODELS', '2'))
+
+
+class UnknownModelError(Exception):
+    """Raised when a requested model version does not exist"""
+    pass
+
+
+class ModelRegistry:
+    """
+    Loaded model versions, keyed by directory name
+
+    Versions are loaded (and warmed) outside the registry lock, then published
+    with a single assignment, so requests never see a half-loaded or missing
+    model. Concurrent requests for a version that is not resident share one
+    load. Requests keep the models dict they were handed, so evicting or
+    replacing a version does not affect requests already running.
+
+    Parameters:
+    -----------
+    base_dir : str
+        Directory containing the saved_models* version directories
+    active : str
+        Version served when a request does not pin one
+    max_resident : int
+        Number of versions kept in memory (least recently used evicted first)
+    loader : callable
+        model_dir -> models dict (default: forecast_engine.load_models)
+    warm : callable (optional)
+        Called with a freshly loaded models dict before it is published
+    """
+
+    def __init__(self, base_dir=MODEL_BASE_DIR, active=DEFAULT_MODEL_NAME,
+                 max_resident=MAX_RESIDENT_MODELS, loader=load_models, warm=None):
+        self.base_dir = base_dir
+        self.active_name = active
+        self.max_resident = max(1, max_resident)
+        self._loader = loader
+        self._warm = warm
+
+        self._lock = threading.Lock()
+        self._resident = OrderedDict()  # name -> models dict (LRU order)
+        self._loading = {}              # name -> Event while a load is running
+
+        self.loads = 0
+        self.swaps = 0
+        self.evictions = 0
+
+    # ============================================
+    # VERSIONS
+    # ============================================
+
+    def available(self):
+        """Names of the model directories on disk"""
+        if not os.path.isdir(self.base_dir):
+            return []
+        return sorted(
+            name for name in os.listdir(self.base_dir)
+            if name.startswith(MODEL_DIR_PREFIX) and self._has_models(os.path.join(self.base_dir, name))
+        )
+
+    @staticmethod
+    def _has_models(path):
+        return os.path.isdir(path) and (
+            os.path.exists(os.path.join(path, 'lgb_model.pkl'))
+            or os.path.exists(os.path.join(path, MANIFEST_NAME))
+        )
+
+    def model_dir(self, name):
+        """Directory of a model version (UnknownModelError if it does not exist)"""
+        if os.path.basename(name) != name or not name.startswith(MODEL_DIR_PREFIX):
+            raise UnknownModelError(f"Unknown model version: {name}")
+        path = os.path.join(self.base_dir, name)
+        if not self._has_models(path):
+            raise UnknownModelError(f"Unknown model version: {name}")
+        return path
+
+    def is_loaded(self, name=None):
+        return self.peek(name) is not None
+
+    def peek(self, name=None):
+        """Models of a resident version (the active one by default), or None; never loads"""
+        with self._lock:
+            return self._resident.get(name or self.active_name)
+
+    # ============================================
+    # LOADING
+    # ============================================
+
+    def _load(self, name):
+        """Load and warm one version (no lock held)"""
+        models = self._loader(self.model_dir(name))
+        models['model_name'] = name
+        if self._warm is not None:
+            self._warm(models)
+        return models
+
+    def _publish(self, name, models):
+        """Insert a loaded version and evict beyond max_resident (lock held)"""
+        self._resident[name] = models
+        self._resident.move_to_end(name)
+        self.loads += 1
+        for old_name in list(self._resident):
+            if len(self._resident) <= self.max_resident:
+                break
+            if old_name not in (self.active_name, name):
+                del self._resident[old_name]
+                self.evictions += 1
+                print(f"[OK] Evicted model version {old_name}")
+
+    def get(self, name=None):
+        """
+        Models for a version (the active one by default), loading it on first use
+
+        Returns:
+        --------
+        dict : output of load_models() plus 'model_name'
+        """
+        while True:
+            with self._lock:
+                name = name or self.active_name
+                if name in self._resident:
+                    self._resident.move_to_end(name)
+                    return self._resident[name]
+
+                waiter = self._loading.get(name)
+                if waiter is None:
+                    done = threading.Event()
+                    self._loading[name] = done
+                    break
+
+            # Another request is loading this version; wait, then re-check
+            waiter.wait()
+
+        try:
+            print(f"Loading model version {name}...")
+            models = self._load(name)
+            with self._lock:
+                self._publish(name, models)
+            return models
+        finally:
+            with self._lock:
+                self._loading.pop(name, None)
+            done.set()
+
+    def reload(self, name=None):
+        """
+        Reload a version from disk (e.g. after retraining) and swap it in
+
+        The previous copy keeps serving until the new one is loaded and warm;
+        if loading fails, it stays in place and the error is raised.
+        """
+        name = name or self.active_name
+        models = self._load(name)
+        with self._lock:
+            self._publish(name, models)
+            self.swaps += 1
+        print(f"[OK] Reloaded model version {name} ({models.get('model_version')})")
+        return models
+
+    def activate(self, name):
+        """Make another version the default, loading it first if needed"""
+        models = self.get(name)
+        with self._lock:
+            self.active_name = name
+            self.swaps += 1
+        print(f"[OK] Active model version is now {name} ({models.get('model_version')})")
+        return models
+
+    # ============================================
+    # STATUS
+    # ============================================
+
+    def status(self):
+        available = self.available()
+        with self._lock:
+            return {
+                'active': self.active_name,
+                'resident': [
+                    {'name': name, 'model_version': models.get('model_version')}
+                    for name, models in self._resident.items()
+                ],
+                'loading': sorted(self._loading),
+                'max_resident': self.max_resident,
+                'loads': self.loads,
+                'swaps': self.swaps,
+                'evictions': self.evictions,
+                'available': available
+            }
@@ -0,0 +1,186 @@
+"""
+Pricing Engine Module
+Deterministic, vectorized discount rules shared by forecasting and the shop API
+"""
+
+import pandas as pd
+import numpy as np
+import os
+import zlib
+from .festival_calendar import PREP_DISCOUNT_FESTIVALS, PREP_DISCOUNT_DAYS, festival_prep_days
+
+
+# ============================================
+# DISCOUNT RULES (same as data generation)
+# ============================================
+
+# Daily rotating discount: category on sale per weekday (Monday = 0)
+DAILY_CATEGORY_MAP = {
+    0: "Dairy", 1: "Beverages", 2: "Snacks", 3: "Personal Care",
+    4: "Staples", 5: "Snacks", 6: "Beverages"
+}
+DAILY_DISCOUNT_STEPS = [2.0, 2.25, 2.5, 2.75, 3.0, 3.25, 3.5]
+
+# Flash sale every 3rd Wednesday: category on sale per month
+FLASH_SALE_CATEGORY_MAP = {
+    1: "Beverages", 2: "Snacks", 3: "Personal Care", 4: "Dairy",
+    5: "Beverages", 6: "Snacks", 7: "Personal Care", 8: "Dairy",
+    9: "Beverages", 10: "Snacks", 11: "Personal Care", 12: "Dairy"
+}
+FLASH_SALE_DISCOUNT = 12.0
+
+# Festival prep discount (1-2 days before Diwali, Christmas, Navratri)
+PREP_DISCOUNT_HIGH_CATEGORIES = ["Snacks", "Beverages"]
+PREP_DISCOUNT_HIGH = 15.0
+PREP_DISCOUNT_DEFAULT = 10.0
+
+# Seed for the daily rotating discount. The step for a (date, category) pair is
+# a hash of the pair and this seed, so it is the same on every call.
+PRICING_SEED = int(os.getenv('PRICING_SEED', '42'))
+
+
+# ============================================
+# HELPERS
+# ============================================
+
+def _mix64(x):
+    """SplitMix64 finalizer over a uint64 array"""
+    with np.errstate(over='ignore'):
+        x = (x ^ (x >> np.uint64(30))) * np.uint64(0xBF58476D1CE4E5B9)
+        x = (x ^ (x >> np.uint64(27))) * np.uint64(0x94D049BB133111EB)
+        return x ^ (x >> np.uint64(31))
+
+
+def _as_array(values, length, default=0.0):
+    """Broadcast a scalar or None to a float array; pass arrays through (NaN -> default)"""
+    if values is None:
+        return np.full(length, default)
+    values = np.asarray(values, dtype=float)
+    if values.ndim == 0:
+        return np.full(length, float(values))
+    return np.where(np.isnan(values), default, values)
+
+
+def daily_rotation_steps(days, categories, seed=PRICING_SEED):
+    """
+    Reproducible daily rotating discount for (day, category) pairs
+
+    Parameters:
+    -----------
+    days : numpy.ndarray of datetime64[D]
+    categories : numpy.ndarray of category names
+    seed : int
+
+    Returns:
+    --------
+    numpy.ndarray of discount percentages drawn from DAILY_DISCOUNT_STEPS
+    """
+    category_codes, unique_categories = pd.factorize(
+        np.asarray(categories, dtype=object), use_na_sentinel=False
+    )
+    category_hashes = np.array(
+        [zlib.crc32(str(c).encode('utf-8')) for c in unique_categories], dtype=np.uint64
+    )[category_codes]
+
+    with np.errstate(over='ignore'):
+        key = days.astype(np.int64).astype(np.uint64) ^ (category_hashes << np.uint64(32))
+        key = key + np.uint64(seed) * np.uint64(0x9E3779B97F4A7C15)
+    step = _mix64(key) % np.uint64(len(DAILY_DISCOUNT_STEPS))
+    return np.asarray(DAILY_DISCOUNT_STEPS)[step.astype(np.int64)]
+
+
+def _prep_days_from_calendar(dates, calendar_for_year):
+    """Prep discount days for a custom calendar (year -> {festival: 'YYYY-MM-DD'})"""
+    prep_dates = []
+    for year in set(dates.year):
+        for fest_name, fest_date_str in (calendar_for_year(year) or {}).items():
+            if fest_name in PREP_DISCOUNT_FESTIVALS:
+                fest_date = np.datetime64(fest_date_str, 'D')
+                prep_dates.extend(fest_date - np.timedelta64(d, 'D') for d in PREP_DISCOUNT_DAYS)
+    return np.isin(dates.values.astype('datetime64[D]'), np.array(prep_dates, dtype='datetime64[D]'))
+
+
+# ============================================
+# PRICING
+# ============================================
+
+def compute_discounts(dates, categories, festival_discount_percent=None,
+                      flash_sale_discount_percent=None, calendar_for_year=None, seed=PRICING_SEED):
+    """
+    Discount percent for each (date, category) in one vectorized call
+
+    The largest applicable discount wins: festival prep (1-2 days before
+    Diwali, Christmas, Navratri), 3rd-Wednesday flash sale, or the daily
+    rotating category discount. Identical inputs always give identical output.
+
+    Parameters:
+    -----------
+    dates : array-like of dates (or a single date, broadcast to all categories)
+    categories : array-like of category names
+    festival_discount_percent : float or array-like, optional
+        Per-product festival prep discount; 0/None uses the default rate
+    flash_sale_discount_percent : float or array-like, optional
+        Per-product flash sale discount; 0/None uses the default rate
+    calendar_for_year : callable, optional
+        year -> {festival_name: 'YYYY-MM-DD'}. Defaults to the forecasting
+        festival calendar (festival_calendar.py).
+    seed : int
+        Seed for the daily rotation
+
+    Returns:
+    --------
+    numpy.ndarray of discount percentages (float)
+    """
+    categories = np.asarray(categories, dtype=object)
+    n = len(categories)
+    if n == 0:
+        return np.array([], dtype=float)
+
+    if not isinstance(dates, pd.DatetimeIndex):
+        dates = pd.to_datetime(dates)
+        dates = pd.DatetimeIndex([dates] * n if isinstance(dates, pd.Timestamp) else dates)
+    dates = dates.normalize()
+    days = dates.values.astype('datetime64[D]')
+    weekday = dates.dayofweek.values
+    month = dates.month.values
+
+    # Category rules are evaluated on integer codes of the distinct categories
+    category_codes, unique_categories = pd.factorize(categories, use_na_sentinel=False)
+    unique_categories = pd.Index(unique_categories)
+
+    def category_code(names):
+        return unique_categories.get_indexer(names)
+
+    festival_override = _as_array(festival_discount_percent, n)
+    flash_override = _as_array(flash_sale_discount_percent, n)
+
+    discount = np.zeros(n)
+
+    # 1. Festival prep discounts (10-15%)
+    if calendar_for_year is None:
+        prep_day = festival_prep_days(dates)
+    else:
+        prep_day = _prep_days_from_calendar(dates, calendar_for_year)
+    if prep_day.any():
+        default_prep = np.where(
+            unique_categories.isin(PREP_DISCOUNT_HIGH_CATEGORIES), PREP_DISCOUNT_HIGH, PREP_DISCOUNT_DEFAULT
+        )[category_codes]
+        prep_rate = np.where(festival_override > 0, festival_override, default_prep)
+        discount = np.where(prep_day, np.maximum(discount, prep_rate), discount)
+
+    # 2. Flash sales (Every 3rd Wednesday - 12%)
+    third_wednesday = (weekday == 2) & ((dates.day.values - 1) // 7 + 1 == 3)
+    if third_wednesday.any():
+        flash_code = category_code([FLASH_SALE_CATEGORY_MAP[m] for m in range(1, 13)])[month - 1]
+        flash_rate = np.where(flash_override > 0, flash_override, FLASH_SALE_DISCOUNT)
+        on_flash_sale = third_wednesday & (category_codes == flash_code)
+        discount = np.where(on_flash_sale, np.maximum(discount, flash_rate), discount)
+
+    # 3. Daily rotating discount (2-3.5%)
+    daily_code = category_code([DAILY_CATEGORY_MAP[d] for d in range(7)])[weekday]
+    on_daily_sale = category_codes == daily_code
+    if on_daily_sale.any():
+        steps = daily_rotation_steps(days[on_daily_sale], categories[on_daily_sale], seed)
+        discount[on_daily_sale] = np.maximum(discount[on_daily_sale], steps)
+
+    return discount
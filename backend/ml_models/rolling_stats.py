@@ -0,0 +1,204 @@
+"""
+Rolling Statistics Module for Sales Forecasting
+Computes all rolling window / statistic combinations in one pass per product
+"""
+
+import numpy as np
+
+
+# Statistics produced for every window (in feature column order)
+ROLLING_STATS = ['mean', 'std', 'min', 'max', 'median', 'q25', 'q75']
+
+# Rows processed per block (bounds the (rows x window) working matrix)
+CHUNK_ROWS = 65536
+
+
+# ============================================
+# WINDOW KERNEL
+# ============================================
+
+QUANTILES = {'min': 0.0, 'max': 1.0, 'median': 0.5, 'q25': 0.25, 'q75': 0.75}
+
+
+def _complete_window_stats(window_values, ddof):
+    """Fast path for windows without missing values (constant ranks)"""
+    n_rows, width = window_values.shape
+    ordered = np.sort(window_values, axis=1)
+
+    mean = ordered.sum(axis=1) / width
+    if width - ddof > 0:
+        deviation = ordered - mean[:, None]
+        std = np.sqrt(np.einsum('ij,ij->i', deviation, deviation) / (width - ddof))
+    else:
+        std = np.full(n_rows, np.nan)
+
+    stats = {'mean': mean, 'std': std}
+    for name, q in QUANTILES.items():
+        pos = q * (width - 1)
+        lo, hi = int(np.floor(pos)), int(np.ceil(pos))
+        if lo == hi:
+            stats[name] = ordered[:, lo].copy()
+        else:
+            stats[name] = ordered[:, lo] + (ordered[:, hi] - ordered[:, lo]) * (pos - lo)
+    return stats
+
+
+def _partial_window_stats(window_values, ddof):
+    """General path: per-row observation counts, NaN marks missing values"""
+    counts = np.sum(~np.isnan(window_values), axis=1)
+    safe_counts = np.maximum(counts, 1)
+    ordered = np.sort(window_values, axis=1)
+
+    with np.errstate(invalid='ignore', divide='ignore'):
+        mean = np.nansum(window_values, axis=1) / safe_counts
+        squared_dev = np.nansum((window_values - mean[:, None]) ** 2, axis=1)
+        std = np.sqrt(squared_dev / (counts - ddof))
+    std[counts - ddof <= 0] = np.nan
+
+    stats = {'mean': mean, 'std': std}
+    for name, q in QUANTILES.items():
+        pos = q * (safe_counts - 1)
+        lo = np.floor(pos).astype(np.intp)
+        hi = np.ceil(pos).astype(np.intp)
+        lo_val = np.take_along_axis(ordered, lo[:, None], axis=1)[:, 0]
+        hi_val = np.take_along_axis(ordered, hi[:, None], axis=1)[:, 0]
+        stats[name] = lo_val + (hi_val - lo_val) * (pos - lo)
+
+    empty = counts == 0
+    if empty.any():
+        for name in stats:
+            stats[name][empty] = np.nan
+    return stats
+
+
+def window_stats(window_values, ddof=1):
+    """
+    Mean, std, min, max, median, q25 and q75 for each row of a window matrix
+
+    Every order statistic is read from a single sort of each window (NaN sorts
+    last, so missing values are ignored) with the same linear interpolation as
+    pandas rolling quantiles and np.percentile.
+
+    Parameters:
+    -----------
+    window_values : numpy.ndarray
+        (n_rows, window) matrix, NaN marks missing observations
+    ddof : int
+        Delta degrees of freedom for std (1 = pandas rolling, 0 = np.std)
+
+    Returns:
+    --------
+    dict mapping statistic name -> array of length n_rows
+    (NaN where a row has no observations, or too few for std)
+    """
+    window_values = np.asarray(window_values, dtype=float)
+    incomplete = np.isnan(window_values).any(axis=1)
+    if not incomplete.any():
+        return _complete_window_stats(window_values, ddof)
+
+    stats = _partial_window_stats(window_values[incomplete], ddof)
+    if incomplete.all():
+        return stats
+
+    complete_stats = _complete_window_stats(window_values[~incomplete], ddof)
+    merged = {}
+    for name in ROLLING_STATS:
+        merged[name] = np.empty(len(window_values))
+        merged[name][incomplete] = stats[name]
+        merged[name][~incomplete] = complete_stats[name]
+    return merged
+
+
+# ============================================
+# GROUPED ROLLING FEATURES
+# ============================================
+
+def rolling_window_stats(values, group_codes, windows=(3, 7, 14, 30), ddof=1):
+    """
+    Trailing rolling statistics per group for several windows at once
+
+    Equivalent to groupby(group).transform(lambda x: x.rolling(w, min_periods=1).<stat>())
+    for every window/statistic pair, but rows are reordered once into contiguous
+    per-group blocks and every window is cut from one shared lag matrix.
+
+    Parameters:
+    -----------
+    values : array-like
+        Values in row order (e.g. quantity_sold)
+    group_codes : array-like of int
+        Group id per row (e.g. from pd.factorize(product_name)); rows keep their
+        relative order within a group
+    windows : sequence of int
+        Window lengths
+    ddof : int
+        Delta degrees of freedom for std
+
+    Returns:
+    --------
+    dict mapping 'rolling_{stat}_{window}' -> array aligned with `values`
+    """
+    values = np.asarray(values, dtype=float)
+    group_codes = np.asarray(group_codes)
+    n_rows = len(values)
+    max_window = max(windows)
+
+    # Contiguous per-group layout
+    order = np.argsort(group_codes, kind='stable')
+    sorted_values = values[order]
+    sorted_codes = group_codes[order]
+
+    # Position of each row within its group
+    starts = np.r_[0, np.flatnonzero(sorted_codes[1:] != sorted_codes[:-1]) + 1] if n_rows else np.array([], dtype=np.intp)
+    group_start = np.repeat(starts, np.diff(np.r_[starts, n_rows]))
+    position = np.arange(n_rows) - group_start
+
+    # Outputs are filled in the contiguous (grouped) order and unsorted once
+    grouped_outputs = {
+        f'rolling_{stat}_{window}': np.empty(n_rows)
+        for window in windows for stat in ROLLING_STATS
+    }
+
+    # Rows whose window contains a missing value need the NaN-aware path
+    missing = np.isnan(sorted_values)
+    missing_before = np.r_[0, np.cumsum(missing)] if missing.any() else None
+
+    # windows_view[i] = the max_window values ending at row i (oldest first);
+    # entries before the start of row i's group are masked with NaN
+    padded = np.concatenate([np.full(max_window - 1, np.nan), sorted_values])
+    windows_view = np.lib.stride_tricks.sliding_window_view(padded, max_window)
+    column_offset = np.arange(max_window - 1, -1, -1)
+
+    for chunk_start in range(0, n_rows, CHUNK_ROWS):
+        chunk_end = min(chunk_start + CHUNK_ROWS, n_rows)
+        chunk = windows_view[chunk_start:chunk_end]
+        chunk_position = position[chunk_start:chunk_end]
+
+        for window in windows:
+            window_values = chunk[:, max_window - window:]
+
+            # Every row takes the constant-rank fast path; rows with missing
+            # entries (the first window-1 rows of each group, or NaN values)
+            # are redone on the NaN-aware path
+            stats = _complete_window_stats(window_values, ddof)
+            partial = chunk_position < window - 1
+            if missing_before is not None:
+                row_ids = np.arange(chunk_start, chunk_end)
+                window_start = np.maximum(row_ids - window + 1, row_ids - chunk_position)
+                partial |= (missing_before[row_ids + 1] - missing_before[window_start]) > 0
+            if partial.any():
+                partial_values = np.where(
+                    column_offset[None, max_window - window:] <= chunk_position[partial][:, None],
+                    window_values[partial], np.nan
+                )
+                partial_stats = _partial_window_stats(partial_values, ddof)
+                for stat in ROLLING_STATS:
+                    stats[stat][partial] = partial_stats[stat]
+
+            for stat in ROLLING_STATS:
+                grouped_outputs[f'rolling_{stat}_{window}'][chunk_start:chunk_end] = stats[stat]
+
+    outputs = {}
+    for name, grouped in grouped_outputs.items():
+        outputs[name] = np.empty(n_rows)
+        outputs[name][order] = grouped
+    return outputs
@@ -0,0 +1,158 @@
+"""
+Sales Panel Module for Sales Forecasting
+Dense, calendar-complete product x date matrices of sales history
+"""
+
+import pandas as pd
+import numpy as np
+
+
+# Per-day columns stored as (n_products, n_days) matrices: column -> (attribute, dtype)
+PANEL_MATRICES = {
+    'quantity_sold': ('quantity', np.float32),
+    'price': ('price', np.float64),
+    'discount_percent': ('discount', np.float64),
+    'final_price': ('final_price', np.float64),
+    'is_festival': ('festival', np.float32),
+}
+
+# Per-product attributes (first value seen for each product)
+PRODUCT_ATTRIBUTES = ['product_id', 'category', 'season_affinity', 'cost_price']
+
+
+class SalesPanel:
+    """
+    Calendar-complete (n_products, n_days) view of sales history
+
+    Row i holds product `products[i]` and column j holds date `dates[j]`, so a
+    product's history is an O(1) row view and a k-day lag is a k-column offset.
+    Days without a sales record are NaN in every matrix.
+
+    Attributes:
+    -----------
+    products : pandas.Index
+        Product names (row labels)
+    dates : pandas.DatetimeIndex
+        Daily calendar from the first to the last date (column labels)
+    product_index : dict
+        product_name -> row number
+    quantity : numpy.ndarray (float32)
+        Quantities sold (or predicted quantities for a forecast panel)
+    price, discount, final_price : numpy.ndarray (float64)
+        List price, discount percent and final price per product/day
+    festival : numpy.ndarray (float32)
+        is_festival flag per product/day
+    product_info : pandas.DataFrame
+        Per-product attributes indexed by product_name
+    """
+
+    def __init__(self, products, dates, matrices, product_info):
+        self.products = pd.Index(products, name='product_name')
+        self.dates = pd.DatetimeIndex(dates, name='sale_date')
+        self.product_index = {product: i for i, product in enumerate(self.products)}
+        self.product_info = product_info.reindex(self.products)
+        for column, (attribute, dtype) in PANEL_MATRICES.items():
+            setattr(self, attribute, matrices.get(column, np.full(self.shape, np.nan, dtype=dtype)))
+
+    # ============================================
+    # CONSTRUCTION
+    # ============================================
+
+    @classmethod
+    def from_frame(cls, df, quantity_col='quantity_sold'):
+        """
+        Build a panel from long-format sales (one row per product and date)
+
+        Parameters:
+        -----------
+        df : pandas.DataFrame
+            Must contain sale_date, product_name and `quantity_col`; other
+            PANEL_MATRICES / PRODUCT_ATTRIBUTES columns are used when present
+        quantity_col : str
+            Column stored in the quantity matrix ('predicted_quantity' for forecasts)
+
+        Returns:
+        --------
+        SalesPanel
+        """
+        sale_dates = pd.to_datetime(df['sale_date']).dt.normalize()
+        if pd.MultiIndex.from_arrays([df['product_name'], sale_dates]).has_duplicates:
+            raise ValueError("SalesPanel requires at most one row per product and date")
+
+        products = pd.Index(pd.unique(df['product_name'])).sort_values()
+        dates = pd.date_range(sale_dates.min(), sale_dates.max(), freq='D')
+
+        rows = products.get_indexer(df['product_name'])
+        cols = (sale_dates - dates[0]).dt.days.to_numpy()
+
+        matrices = {}
+        for column, (_, dtype) in PANEL_MATRICES.items():
+            source = quantity_col if column == 'quantity_sold' else column
+            if source not in df.columns:
+                continue
+            matrix = np.full((len(products), len(dates)), np.nan, dtype=dtype)
+            matrix[rows, cols] = df[source].to_numpy(dtype=dtype)
+            matrices[column] = matrix
+
+        attributes = [col for col in PRODUCT_ATTRIBUTES if col in df.columns]
+        product_info = df.groupby('product_name', sort=False)[attributes].first()
+
+        return cls(products, dates, matrices, product_info)
+
+    # ============================================
+    # ACCESS
+    # ============================================
+
+    @property
+    def shape(self):
+        return (len(self.products), len(self.dates))
+
+    @property
+    def observed(self):
+        """Boolean matrix of product/days that have a sales record"""
+        return ~np.isnan(self.quantity)
+
+    def row(self, product_name):
+        """Quantity history of one product (a view, no copy)"""
+        return self.quantity[self.product_index[product_name]]
+
+    def rows(self, product_names):
+        """Row numbers for a sequence of product names (-1 when unknown)"""
+        return self.products.get_indexer(product_names)
+
+    def lag(self, days, matrix=None):
+        """Matrix shifted `days` calendar days into the past (NaN-padded)"""
+        matrix = self.quantity if matrix is None else matrix
+        lagged = np.full(matrix.shape, np.nan, dtype=matrix.dtype)
+        if days < matrix.shape[1]:
+            lagged[:, days:] = matrix[:, :matrix.shape[1] - days]
+        return lagged
+
+    def tail(self, num_days):
+        """Last `num_days` calendar days of quantities (view)"""
+        return self.quantity[:, -num_days:]
+
+    def to_frame(self, include_missing=False):
+        """
+        Long-format frame sorted by sale_date (same layout as the sales CSV)
+
+        Parameters:
+        -----------
+        include_missing : bool
+            Also emit product/days without a sales record (quantities NaN),
+            making the frame calendar-complete
+        """
+        n_products, n_days = self.shape
+        columns = {
+            'sale_date': np.repeat(self.dates.to_numpy(), n_products),
+            'product_name': np.tile(self.products.to_numpy(), n_days),
+        }
+        for column in self.product_info.columns:
+            columns[column] = np.tile(self.product_info[column].to_numpy(), n_days)
+        for column, (attribute, _) in PANEL_MATRICES.items():
+            columns[column] = getattr(self, attribute).T.reshape(-1).astype(np.float64)
+        frame = pd.DataFrame(columns)
+
+        if not include_missing:
+            frame = frame[self.observed.T.reshape(-1)].reset_index(drop=True)
+        return frame
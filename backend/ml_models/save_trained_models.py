@@ -0,0 +1,754 @@
+"""
+Model Training Module for Sales Forecasting
+Builds features once, trains LightGBM, XGBoost and CatBoost in parallel
+processes, fits the ensemble and writes the layout load_models() expects
+
+Usage (from backend/):
+    python -m ml_models.save_trained_models             # -> ml_models/saved_models_train_<timestamp>
+    python -m ml_models.save_trained_models --output ml_models/saved_models_new --native
+    python -m ml_models.save_trained_models --incremental --time-budget 120
+                                          # saved_models -> ml_models/saved_models_incr_<timestamp>
+"""
+
+import pandas as pd
+import numpy as np
+import argparse
+import json
+import multiprocessing
+import os
+import shutil
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+import joblib
+from .data_loader import compute_file_hash
+from .ensemble_inference import predict_ensemble
+from .feature_engineering import get_feature_columns
+from .feature_store import load_features
+from .forecast_engine import load_models
+from .model_artifacts import export_native_models
+
+
+# ============================================
+# CONFIGURATION (same as the training notebook)
+# ============================================
+
+RANDOM_SEED = 42
+
+# The last VALIDATION_DAYS days are held out for early stopping and ensemble fitting
+VALIDATION_DAYS = 30
+NUM_BOOST_ROUND = 2000
+EARLY_STOPPING_ROUNDS = 100
+
+LGB_PARAMS = {
+    'objective': 'regression',
+    'metric': 'rmse',
+    'boosting_type': 'gbdt',
+    'num_leaves': 64,
+    'learning_rate': 0.03,
+    'feature_fraction': 0.85,
+    'bagging_fraction': 0.85,
+    'bagging_freq': 5,
+    'max_depth': 8,
+    'min_child_samples': 10,
+    'min_child_weight': 0.001,
+    'lambda_l1': 0.5,
+    'lambda_l2': 0.5,
+    'max_bin': 255,
+    'min_data_in_bin': 3,
+    'verbosity': -1,
+    'seed': RANDOM_SEED,
+    # Same model for any thread count
+    'deterministic': True,
+    'force_row_wise': True
+}
+
+XGB_PARAMS = {
+    'objective': 'reg:squarederror',
+    'eval_metric': 'rmse',
+    'booster': 'gbtree',
+    'max_depth': 8,
+    'learning_rate': 0.03,
+    'subsample': 0.85,
+    'colsample_bytree': 0.85,
+    'colsample_bylevel': 0.85,
+    'min_child_weight': 1,
+    'gamma': 0.05,
+    'lambda': 2,
+    'alpha': 0.5,
+    'max_delta_step': 1,
+    'seed': RANDOM_SEED,
+    'verbosity': 0,
+    'tree_method': 'hist'
+}
+
+CATBOOST_PARAMS = {
+    'learning_rate': 0.03,
+    'depth': 8,
+    'l2_leaf_reg': 3,
+    'min_data_in_leaf': 10,
+    'random_strength': 0.5,
+    'bagging_temperature': 0.2,
+    'od_type': 'Iter',
+    'random_seed': RANDOM_SEED,
+    'loss_function': 'RMSE',
+    'eval_metric': 'RMSE',
+    'allow_writing_files': False
+}
+
+# Incremental retraining: continue boosting the current models on the most
+# recent RETRAIN_WINDOW_DAYS days (the last RETRAIN_VALIDATION_DAYS held out)
+RETRAIN_WINDOW_DAYS = 120
+RETRAIN_VALIDATION_DAYS = 7
+RETRAIN_ROUNDS = 300
+RETRAIN_VERSION_PREFIX = 'saved_models_incr_'
+
+# The CLI writes full training runs to a new version (never over the live one)
+TRAIN_VERSION_PREFIX = 'saved_models_train_'
+
+# Base model order used by ensemble weights and the stacking meta-model
+BASE_MODELS = ['lgb', 'xgb', 'catboost']
+
+TRAINING_REPORT_NAME = 'training_report.json'
+
+DEFAULT_CSV_PATH = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))),
+    'kirana_sales_data_v2.3_production_discount.csv'
+)
+DEFAULT_MODEL_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'saved_models')
+
+
+def available_cores():
+    """CPUs this process may run on"""
+    if hasattr(os, 'sched_getaffinity'):
+        return len(os.sched_getaffinity(0))
+    return os.cpu_count() or 1
+
+
+def thread_budget(cores, n_models=len(BASE_MODELS)):
+    """Split a core budget over concurrently trained models (at least 1 each)"""
+    base, extra = divmod(max(cores, 1), n_models)
+    return [max(base + (1 if i < extra else 0), 1) for i in range(n_models)]
+
+
+# ============================================
+# DATA
+# ============================================
+
+def prepare_training_data(csv_path, validation_days=VALIDATION_DAYS, window_days=None, feature_cols=None):
+    """
+    Features (built once, via the feature store) split by time into train/validation
+
+    Parameters:
+    -----------
+    csv_path : str
+        Sales history CSV
+    validation_days : int
+        Most recent days held out for validation
+    window_days : int (optional)
+        Only use the most recent window_days days (train + validation)
+    feature_cols : list (optional)
+        Columns of existing models to continue training (default: all features)
+
+    Returns:
+    --------
+    dict with X_train, y_train, X_val, y_val, feature_cols and the split dates
+    """
+    df_features = load_features(csv_path)
+    if feature_cols is None:
+        feature_cols = get_feature_columns(df_features)
+    missing = set(feature_cols) - set(df_features.columns)
+    if missing:
+        raise ValueError(f"Features of the base models are not produced any more: {sorted(missing)}")
+
+    # Drop rows without full lag history. Only model inputs count: festival_name
+    # is empty on ordinary days, and a plain dropna() would keep festival days only.
+    df_clean = df_features.dropna(subset=list(feature_cols) + ['quantity_sold']).reset_index(drop=True)
+    if window_days is not None:
+        window_start = df_clean['sale_date'].max() - pd.Timedelta(days=window_days)
+        df_clean = df_clean[df_clean['sale_date'] > window_start].reset_index(drop=True)
+
+    validation_date = df_clean['sale_date'].max() - pd.Timedelta(days=validation_days)
+    train_mask = (df_clean['sale_date'] < validation_date).to_numpy()
+
+    print(f"   Training rows: {train_mask.sum():,}, validation rows: {(~train_mask).sum():,} "
+          f"(from {validation_date.date()})")
+
+    return {
+        'X_train': df_clean.loc[train_mask, feature_cols].reset_index(drop=True),
+        'y_train': df_clean.loc[train_mask, 'quantity_sold'].to_numpy(dtype=float),
+        'X_val': df_clean.loc[~train_mask, feature_cols].reset_index(drop=True),
+        'y_val': df_clean.loc[~train_mask, 'quantity_sold'].to_numpy(dtype=float),
+        'feature_cols': list(feature_cols),
+        'first_date': df_clean['sale_date'].min().strftime('%Y-%m-%d'),
+        'validation_start': validation_date.strftime('%Y-%m-%d'),
+        'last_date': df_clean['sale_date'].max().strftime('%Y-%m-%d')
+    }
+
+
+def evaluate_predictions(y_true, y_pred):
+    """MAE, RMSE, MAPE and R2 as reported by the training notebook"""
+    from sklearn.metrics import mean_absolute_error, mean_squared_error, r2_score
+
+    return {
+        'MAE': float(mean_absolute_error(y_true, y_pred)),
+        'RMSE': float(np.sqrt(mean_squared_error(y_true, y_pred))),
+        'MAPE': float(np.mean(np.abs((y_true - y_pred) / (y_true + 1e-8))) * 100),
+        'R2': float(r2_score(y_true, y_pred))
+    }
+
+
+# ============================================
+# BASE MODELS (run in worker processes)
+# ============================================
+# Each trainer continues boosting from init_model when given one, and stops
+# adding trees once time.time() passes deadline (if set).
+
+def _train_lgb(X_train, y_train, X_val, y_val, threads, num_boost_round, init_model=None, deadline=None):
+    import lightgbm as lgb
+
+    best_round = {'iteration': None, 'score': None, 'results': None}
+
+    def time_limit(env):
+        # Stop at the best validation round so far, as early stopping would
+        _, _, score, higher_better = env.evaluation_result_list[0][:4]
+        previous = best_round['score']
+        if previous is None or (score > previous if higher_better else score < previous):
+            best_round.update(iteration=env.iteration, score=score, results=env.evaluation_result_list)
+        if time.time() > deadline:
+            raise lgb.callback.EarlyStopException(best_round['iteration'], best_round['results'])
+    time_limit.order = 40  # After the early stopping callback
+
+    if init_model is not None:
+        # Continue from the trees that were in use, not the early-stopping tail
+        best = init_model.best_iteration
+        init_model = lgb.Booster(model_str=init_model.model_to_string(num_iteration=best if best > 0 else None))
+
+    train_set = lgb.Dataset(X_train, y_train)
+    val_set = lgb.Dataset(X_val, y_val, reference=train_set)
+    callbacks = [lgb.early_stopping(stopping_rounds=EARLY_STOPPING_ROUNDS, verbose=False)]
+    if deadline is not None:
+        callbacks.append(time_limit)
+    model = lgb.train(
+        {**LGB_PARAMS, 'num_threads': threads},
+        train_set,
+        num_boost_round=num_boost_round,
+        valid_sets=[val_set],
+        init_model=init_model,
+        callbacks=callbacks
+    )
+    predict = lambda X: model.predict(X, num_iteration=model.best_iteration)
+    return model, predict(X_train), predict(X_val), model.best_iteration
+
+
+def _train_xgb(X_train, y_train, X_val, y_val, threads, num_boost_round, init_model=None, deadline=None):
+    import xgboost as xgb
+
+    class TimeLimit(xgb.callback.TrainingCallback):
+        def after_iteration(self, model, epoch, evals_log):
+            return time.time() > deadline
+
+    if init_model is not None:
+        try:
+            init_model = init_model[:init_model.best_iteration + 1]
+        except AttributeError:
+            pass  # No early-stopping record: continue from every tree
+
+    dtrain = xgb.DMatrix(X_train, label=y_train, nthread=threads)
+    dval = xgb.DMatrix(X_val, label=y_val, nthread=threads)
+    model = xgb.train(
+        {**XGB_PARAMS, 'nthread': threads},
+        dtrain,
+        num_boost_round=num_boost_round,
+        evals=[(dval, 'eval')],
+        xgb_model=init_model,
+        # Early stopping first: callbacks after the first one that stops are skipped
+        callbacks=[xgb.callback.EarlyStopping(rounds=EARLY_STOPPING_ROUNDS)]
+                  + ([TimeLimit()] if deadline is not None else []),
+        verbose_eval=False
+    )
+
+    # predict() uses every tree: drop the rounds after the best one (kept by
+    # early stopping's patience or a time-limited stop), as LightGBM does
+    best_iteration = model.best_iteration
+    if best_iteration + 1 < model.num_boosted_rounds():
+        best_score = model.best_score
+        model = model[:best_iteration + 1]
+        model.set_attr(best_iteration=str(best_iteration), best_score=str(best_score))
+    return model, model.predict(dtrain), model.predict(dval), best_iteration
+
+
+class _CatBoostTimeLimit:
+    """CatBoost fit() callback: stop adding trees after the deadline"""
+
+    def __init__(self, deadline):
+        self.deadline = deadline
+
+    def after_iteration(self, info):
+        return time.time() <= self.deadline
+
+
+def _train_catboost(X_train, y_train, X_val, y_val, threads, num_boost_round, init_model=None, deadline=None):
+    from catboost import CatBoostRegressor
+
+    model = CatBoostRegressor(
+        **CATBOOST_PARAMS, iterations=num_boost_round, thread_count=threads, verbose=False
+    )
+    model.fit(
+        X_train, y_train, eval_set=(X_val, y_val), early_stopping_rounds=EARLY_STOPPING_ROUNDS,
+        init_model=init_model,
+        callbacks=[_CatBoostTimeLimit(deadline)] if deadline is not None else None
+    )
+    return model, model.predict(X_train), model.predict(X_val), model.get_best_iteration()
+
+
+TRAINERS = {
+    'lgb': _train_lgb,
+    'xgb': _train_xgb,
+    'catboost': _train_catboost,
+}
+
+
+def _train_one(name, data, threads, num_boost_round, init_model=None, deadline=None):
+    """Train one base model; returns (name, result dict) for the parent process"""
+    start = time.perf_counter()
+    model, train_pred, val_pred, best_iteration = TRAINERS[name](
+        data['X_train'], data['y_train'], data['X_val'], data['y_val'], threads, num_boost_round,
+        init_model=init_model, deadline=deadline
+    )
+    return name, {
+        'model': model,
+        'train_pred': np.asarray(train_pred, dtype=float),
+        'val_pred': np.asarray(val_pred, dtype=float),
+        'best_iteration': int(best_iteration) if best_iteration is not None else None,
+        'threads': threads,
+        'seconds': round(time.perf_counter() - start, 2)
+    }
+
+
+def train_base_models(data, cores=None, parallel=True, num_boost_round=NUM_BOOST_ROUND,
+                      init_models=None, time_budget=None):
+    """
+    Train LightGBM, XGBoost and CatBoost
+
+    With parallel=True (and more than one core) each model trains in its own
+    process, with the core budget split between them; otherwise they train
+    one after another, each using every core.
+
+    Parameters:
+    -----------
+    data : dict
+        prepare_training_data() output
+    cores : int (optional)
+        Core budget (default: all available)
+    parallel : bool
+        Train in worker processes
+    num_boost_round : int
+        Maximum trees added per model
+    init_models : dict (optional)
+        Model name -> fitted model to continue boosting from (warm start)
+    time_budget : float (optional)
+        Seconds of training allowed; models stop adding trees when it runs
+        out (in sequential mode each model gets an equal share of what is left)
+
+    Returns:
+    --------
+    dict : model name -> {model, train_pred, val_pred, best_iteration, threads, seconds}
+    """
+    cores = cores or available_cores()
+    init_models = init_models or {}
+    subset = {key: data[key] for key in ('X_train', 'y_train', 'X_val', 'y_val')}
+    end = time.time() + time_budget if time_budget is not None else None
+
+    if parallel and cores > 1:
+        threads = thread_budget(cores)
+        print(f"Training {len(BASE_MODELS)} models in parallel processes (threads {threads})...")
+        # spawn: forking after OpenMP has started in the parent can deadlock
+        context = multiprocessing.get_context('spawn')
+        with ProcessPoolExecutor(max_workers=len(BASE_MODELS), mp_context=context) as executor:
+            futures = [
+                executor.submit(_train_one, name, subset, n_threads, num_boost_round, init_models.get(name), end)
+                for name, n_threads in zip(BASE_MODELS, threads)
+            ]
+            results = dict(future.result() for future in futures)
+    else:
+        print(f"Training {len(BASE_MODELS)} models sequentially ({cores} threads each)...")
+        results = {}
+        for i, name in enumerate(BASE_MODELS):
+            deadline = None
+            if end is not None:
+                deadline = time.time() + max(end - time.time(), 0) / (len(BASE_MODELS) - i)
+            results[name] = _train_one(name, subset, cores, num_boost_round, init_models.get(name), deadline)[1]
+
+    for name in BASE_MODELS:
+        result = results[name]
+        print(f"[OK] Trained {name}: best iteration {result['best_iteration']}, "
+              f"{result['seconds']}s on {result['threads']} threads")
+    return results
+
+
+# ============================================
+# ENSEMBLE
+# ============================================
+
+def fit_ensemble(results, y_train, y_val):
+    """
+    Fit the four ensemble methods of the training notebook and keep the best
+
+    Simple average, R2-weighted, SLSQP-optimized weights (validation RMSE)
+    and a Ridge stacking meta-model; the method with the highest validation
+    R2 wins.
+
+    Returns:
+    --------
+    dict with ensemble_type, ensemble_weights, meta_model and per-method metrics
+    """
+    from scipy.optimize import minimize
+    from sklearn.linear_model import Ridge
+
+    val_preds = np.column_stack([results[name]['val_pred'] for name in BASE_MODELS])
+    train_preds = np.column_stack([results[name]['train_pred'] for name in BASE_MODELS])
+    base_metrics = {name: evaluate_predictions(y_val, results[name]['val_pred']) for name in BASE_MODELS}
+
+    candidates = {}
+
+    simple = np.full(len(BASE_MODELS), 1 / len(BASE_MODELS))
+    candidates['Simple Average'] = (simple, None, val_preds @ simple)
+
+    r2 = np.array([base_metrics[name]['R2'] for name in BASE_MODELS])
+    if r2.sum() > 0:
+        r2_weights = r2 / r2.sum()
+        candidates['R²-Weighted'] = (r2_weights, None, val_preds @ r2_weights)
+
+    def ensemble_loss(weights):
+        weights = np.abs(weights) / np.sum(np.abs(weights))
+        return np.sqrt(np.mean((val_preds @ weights - y_val) ** 2))
+
+    result = minimize(
+        ensemble_loss, np.array([0.33, 0.33, 0.34]), method='SLSQP',
+        bounds=[(0, 1)] * len(BASE_MODELS),
+        constraints={'type': 'eq', 'fun': lambda w: np.sum(np.abs(w)) - 1}
+    )
+    opt_weights = np.abs(result.x) / np.sum(np.abs(result.x))
+    candidates['Optimized Weights'] = (opt_weights, None, val_preds @ opt_weights)
+
+    meta_model = Ridge(alpha=1.0, random_state=RANDOM_SEED)
+    meta_model.fit(train_preds, y_train)
+    candidates['Stacking'] = (simple, meta_model, meta_model.predict(val_preds))
+
+    method_metrics = {method: evaluate_predictions(y_val, pred) for method, (_, _, pred) in candidates.items()}
+    best = max(method_metrics, key=lambda method: method_metrics[method]['R2'])
+    weights, meta, _ = candidates[best]
+
+    print(f"[OK] Best ensemble method: {best} (R² {method_metrics[best]['R2']:.4f}, "
+          f"RMSE {method_metrics[best]['RMSE']:.4f})")
+    return {
+        'ensemble_type': best,
+        'ensemble_weights': weights,
+        'meta_model': meta,
+        'base_metrics': base_metrics,
+        'ensemble_metrics': method_metrics
+    }
+
+
+# ============================================
+# SAVE
+# ============================================
+
+def save_models(models, model_dir, native=False, report=None):
+    """
+    Write models in the load_models() layout
+
+    Files are written to a staging directory next to model_dir and renamed
+    into place, so a load never sees a half-written version. Replacing an
+    existing model_dir takes two renames (old copy aside, new copy in):
+    between them model_dir does not exist, and the old copy is deleted
+    afterwards. Write a new version directory and activate it instead of
+    overwriting the one being served.
+
+    Parameters:
+    -----------
+    models : dict
+        lgb_model, xgb_model, catboost_model, ensemble_weights,
+        ensemble_type, meta_model, feature_cols
+    model_dir : str
+        Destination version directory (e.g. ml_models/saved_models)
+    native : bool
+        Also export native-format artifacts and manifest.json
+    report : dict (optional)
+        Written as training_report.json
+    """
+    model_dir = os.path.abspath(model_dir)
+    parent = os.path.dirname(model_dir)
+    os.makedirs(parent, exist_ok=True)
+    staging = tempfile.mkdtemp(dir=parent, prefix=f'.{os.path.basename(model_dir)}.staging-')
+
+    try:
+        joblib.dump(models['lgb_model'], os.path.join(staging, 'lgb_model.pkl'))
+        joblib.dump(models['xgb_model'], os.path.join(staging, 'xgb_model.pkl'))
+        joblib.dump(models['catboost_model'], os.path.join(staging, 'catboost_model.pkl'))
+        joblib.dump({
+            'type': models['ensemble_type'],
+            'weights': models['ensemble_weights'],
+            'meta_model': models['meta_model']
+        }, os.path.join(staging, 'ensemble_config.pkl'))
+        joblib.dump(list(models['feature_cols']), os.path.join(staging, 'feature_cols.pkl'))
+
+        if native:
+            export_native_models(models, staging)
+        if report is not None:
+            with open(os.path.join(staging, TRAINING_REPORT_NAME), 'w') as f:
+                json.dump(report, f, indent=2)
+
+        previous = None
+        if os.path.exists(model_dir):
+            previous = tempfile.mkdtemp(dir=parent, prefix=f'.{os.path.basename(model_dir)}.previous-')
+            os.rmdir(previous)
+            os.replace(model_dir, previous)
+        os.replace(staging, model_dir)
+        if previous is not None:
+            shutil.rmtree(previous, ignore_errors=True)
+    finally:
+        if os.path.exists(staging):
+            shutil.rmtree(staging, ignore_errors=True)
+
+    print(f"[OK] Saved models to {model_dir}")
+    return model_dir
+
+
+# ============================================
+# PIPELINE
+# ============================================
+
+def new_version_dir(base_dir, prefix):
+    """<base_dir>/<prefix><timestamp>: a model version directory that does not exist yet"""
+    return os.path.join(os.path.abspath(base_dir), prefix + datetime.now().strftime('%Y%m%d_%H%M%S'))
+
+
+def train_models(csv_path=DEFAULT_CSV_PATH, model_dir=None, cores=None, parallel=True,
+                 native=False, validation_days=VALIDATION_DAYS, num_boost_round=NUM_BOOST_ROUND,
+                 time_budget=None):
+    """
+    Full training run: features -> base models -> ensemble -> saved version
+
+    Parameters:
+    -----------
+    model_dir : str (optional)
+        Destination (default: a new saved_models_train_<timestamp> version
+        next to saved_models, so the live models are never replaced)
+
+    Returns:
+    --------
+    dict : training report (also saved as training_report.json), with the
+    model_dir it was written to
+    """
+    start = time.perf_counter()
+    cores = cores or available_cores()
+    if model_dir is None:
+        model_dir = new_version_dir(os.path.dirname(DEFAULT_MODEL_DIR), TRAIN_VERSION_PREFIX)
+
+    print("Preparing training data...")
+    data = prepare_training_data(csv_path, validation_days)
+    features_seconds = time.perf_counter() - start
+
+    results = train_base_models(
+        data, cores=cores, parallel=parallel, num_boost_round=num_boost_round, time_budget=time_budget
+    )
+    ensemble = fit_ensemble(results, data['y_train'], data['y_val'])
+
+    models = {
+        'lgb_model': results['lgb']['model'],
+        'xgb_model': results['xgb']['model'],
+        'catboost_model': results['catboost']['model'],
+        'ensemble_weights': ensemble['ensemble_weights'],
+        'ensemble_type': ensemble['ensemble_type'],
+        'meta_model': ensemble['meta_model'],
+        'feature_cols': data['feature_cols']
+    }
+
+    report = {
+        'mode': 'full',
+        'trained_at': datetime.now().isoformat(timespec='seconds'),
+        'data': {
+            'csv_path': os.path.abspath(csv_path),
+            'content_hash': compute_file_hash(csv_path),
+            'last_date': data['last_date'],
+            'validation_start': data['validation_start'],
+            'train_rows': int(len(data['y_train'])),
+            'validation_rows': int(len(data['y_val'])),
+            'feature_count': len(data['feature_cols'])
+        },
+        'ensemble_type': ensemble['ensemble_type'],
+        'ensemble_weights': [float(w) for w in ensemble['ensemble_weights']],
+        'validation_metrics': {**ensemble['base_metrics'], 'ensemble': ensemble['ensemble_metrics']},
+        'base_models': {
+            name: {key: results[name][key] for key in ('best_iteration', 'threads', 'seconds')}
+            for name in BASE_MODELS
+        },
+        'cores': cores,
+        'parallel': bool(parallel and cores > 1),
+        'seconds': {
+            'features': round(features_seconds, 2),
+            'total': round(time.perf_counter() - start, 2)
+        }
+    }
+
+    save_models(models, model_dir, native=native, report=report)
+    report['model_dir'] = model_dir
+    print(f"[SUCCESS] Training finished in {report['seconds']['total']}s")
+    return report
+
+
+def retrain_incremental(csv_path=DEFAULT_CSV_PATH, base_model_dir=DEFAULT_MODEL_DIR, model_dir=None,
+                        window_days=RETRAIN_WINDOW_DAYS, validation_days=RETRAIN_VALIDATION_DAYS,
+                        num_boost_round=RETRAIN_ROUNDS, time_budget=None, cores=None, parallel=True,
+                        native=False):
+    """
+    Warm-start retraining: continue boosting the current models on recent data
+
+    LightGBM and XGBoost add trees on top of the existing boosters (trimmed to
+    their best iteration) and CatBoost continues from its model via
+    init_model, all on the last window_days days with early stopping on the
+    last validation_days. The ensemble layer is refit on the window (a
+    stacking meta-model tuned to the old trees does not fit the new ones).
+    The result is written as a new version next to the base version, so it
+    can be compared (/shadow) and activated (/reload-models) without
+    touching the live models.
+
+    Parameters:
+    -----------
+    base_model_dir : str
+        Version to continue from
+    model_dir : str (optional)
+        Destination (default: <base parent>/saved_models_incr_<timestamp>)
+    window_days, validation_days : int
+        Recent data used, and the part of it held out
+    num_boost_round : int
+        Maximum trees added per model
+    time_budget : float (optional)
+        Seconds of training allowed across the base models
+
+    Returns:
+    --------
+    dict : training report (also saved as training_report.json), with
+    validation metrics of the base and the updated ensemble
+    """
+    start = time.perf_counter()
+    cores = cores or available_cores()
+    if model_dir is None:
+        model_dir = new_version_dir(os.path.dirname(os.path.abspath(base_model_dir)), RETRAIN_VERSION_PREFIX)
+
+    print(f"Loading base models from {base_model_dir}...")
+    base = load_models(base_model_dir)
+    if base['feature_cols'] is None:
+        raise ValueError("Base models have no feature_cols.pkl; retrain from scratch instead")
+
+    print(f"Preparing the last {window_days} days of training data...")
+    data = prepare_training_data(csv_path, validation_days, window_days=window_days, feature_cols=base['feature_cols'])
+    features_seconds = time.perf_counter() - start
+
+    results = train_base_models(
+        data, cores=cores, parallel=parallel, num_boost_round=num_boost_round, time_budget=time_budget,
+        init_models={name: base[f'{name}_model'] for name in BASE_MODELS}
+    )
+    ensemble = fit_ensemble(results, data['y_train'], data['y_val'])
+
+    models = {
+        'lgb_model': results['lgb']['model'],
+        'xgb_model': results['xgb']['model'],
+        'catboost_model': results['catboost']['model'],
+        'ensemble_weights': ensemble['ensemble_weights'],
+        'ensemble_type': ensemble['ensemble_type'],
+        'meta_model': ensemble['meta_model'],
+        'feature_cols': data['feature_cols']
+    }
+
+    before = evaluate_predictions(data['y_val'], predict_ensemble(base, data['X_val'])[0])
+    after = evaluate_predictions(data['y_val'], predict_ensemble(models, data['X_val'])[0])
+    print(f"[OK] Validation RMSE {before['RMSE']:.4f} -> {after['RMSE']:.4f}")
+
+    report = {
+        'mode': 'incremental',
+        'trained_at': datetime.now().isoformat(timespec='seconds'),
+        'base_model': {
+            'model_dir': os.path.abspath(base_model_dir),
+            'model_version': base.get('model_version')
+        },
+        'data': {
+            'csv_path': os.path.abspath(csv_path),
+            'content_hash': compute_file_hash(csv_path),
+            'first_date': data['first_date'],
+            'last_date': data['last_date'],
+            'validation_start': data['validation_start'],
+            'train_rows': int(len(data['y_train'])),
+            'validation_rows': int(len(data['y_val'])),
+            'feature_count': len(data['feature_cols'])
+        },
+        'ensemble_type': models['ensemble_type'],
+        'ensemble_weights': [float(w) for w in models['ensemble_weights']],
+        'validation_metrics': {
+            **ensemble['base_metrics'],
+            'ensemble': {**ensemble['ensemble_metrics'], 'base_version': before, 'updated': after}
+        },
+        'base_models': {
+            name: {key: results[name][key] for key in ('best_iteration', 'threads', 'seconds')}
+            for name in BASE_MODELS
+        },
+        'time_budget': time_budget,
+        'cores': cores,
+        'parallel': bool(parallel and cores > 1),
+        'seconds': {
+            'features': round(features_seconds, 2),
+            'total': round(time.perf_counter() - start, 2)
+        }
+    }
+
+    save_models(models, model_dir, native=native, report=report)
+    report['model_dir'] = model_dir
+    print(f"[SUCCESS] Incremental retrain finished in {report['seconds']['total']}s")
+    return report
+
+
+# ============================================
+# MAIN
+# ============================================
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Train the forecasting ensemble')
+    parser.add_argument('--csv', default=DEFAULT_CSV_PATH, help='Sales history CSV')
+    parser.add_argument('--output', default=None,
+                        help='Model version directory to write (default: a new saved_models_train_<timestamp> '
+                             'version, or saved_models_incr_<timestamp> with --incremental)')
+    parser.add_argument('--cores', type=int, default=None, help='Core budget (default: all available)')
+    parser.add_argument('--sequential', action='store_true', help='Train the models one after another')
+    parser.add_argument('--native', action='store_true', help='Also export native-format artifacts')
+    parser.add_argument('--validation-days', type=int, default=None)
+    parser.add_argument('--rounds', type=int, default=None, help='Maximum boosting rounds (added trees)')
+    parser.add_argument('--time-budget', type=float, default=None, help='Training time cap in seconds')
+    parser.add_argument('--incremental', action='store_true',
+                        help='Continue boosting the --base models on recent data')
+    parser.add_argument('--base', default=DEFAULT_MODEL_DIR, help='Version to continue from (--incremental)')
+    parser.add_argument('--window-days', type=int, default=RETRAIN_WINDOW_DAYS,
+                        help='Recent days used by --incremental')
+    args = parser.parse_args(argv)
+
+    if args.incremental:
+        retrain_incremental(
+            args.csv, args.base, args.output, window_days=args.window_days,
+            validation_days=args.validation_days or RETRAIN_VALIDATION_DAYS,
+            num_boost_round=args.rounds or RETRAIN_ROUNDS, time_budget=args.time_budget,
+            cores=args.cores, parallel=not args.sequential, native=args.native
+        )
+    else:
+        train_models(
+            args.csv, args.output, cores=args.cores, parallel=not args.sequential,
+            native=args.native, validation_days=args.validation_days or VALIDATION_DAYS,
+            num_boost_round=args.rounds or NUM_BOOST_ROUND, time_budget=args.time_budget
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,255 @@
+"""
+Shadow Scoring Module for Sales Forecasting
+Scores a candidate model version next to the live one, off the request path
+"""
+
+import pandas as pd
+import numpy as np
+import json
+import os
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from .ensemble_inference import predict_ensemble
+
+
+# ============================================
+# CONFIGURATION
+# ============================================
+
+SHADOW_RESULTS_DIR = os.getenv(
+    'SHADOW_RESULTS_DIR',
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), 'shadow_results')
+)
+
+# Shadow runs queued at once; further forecasts are not shadowed (never block)
+SHADOW_MAX_PENDING = int(os.getenv('SHADOW_MAX_PENDING', '2'))
+
+# Recent comparison records kept in memory for the summary
+SHADOW_MAX_RECORDS = 100
+
+
+def _model_id(models):
+    return {'name': models.get('model_name'), 'version': models.get('model_version')}
+
+
+# ============================================
+# COMPARISON
+# ============================================
+
+def compare_predictions(features, live_predictions, candidate_predictions):
+    """
+    Per-product comparison of live and candidate predictions
+
+    Parameters:
+    -----------
+    features : pandas.DataFrame
+        Forecast rows (needs product_name)
+    live_predictions, candidate_predictions : numpy.ndarray
+        One prediction per row
+
+    Returns:
+    --------
+    pandas.DataFrame with live_total, candidate_total, delta, delta_pct and
+    mean_abs_delta per product (largest absolute delta first)
+    """
+    frame = pd.DataFrame({
+        'product_name': features['product_name'].to_numpy(),
+        'live': live_predictions,
+        'candidate': candidate_predictions,
+        'abs_delta': np.abs(candidate_predictions - live_predictions)
+    })
+    per_product = frame.groupby('product_name', sort=False).agg(
+        live_total=('live', 'sum'),
+        candidate_total=('candidate', 'sum'),
+        mean_abs_delta=('abs_delta', 'mean')
+    )
+    per_product['delta'] = per_product['candidate_total'] - per_product['live_total']
+    per_product['delta_pct'] = per_product['delta'] / per_product['live_total'].where(per_product['live_total'] != 0) * 100
+    per_product = per_product.reset_index()
+    return per_product.reindex(
+        per_product['delta'].abs().sort_values(ascending=False).index
+    ).reset_index(drop=True)
+
+
+# ============================================
+# SHADOW SCORER
+# ============================================
+
+class ShadowScorer:
+    """
+    Asynchronously re-scores live forecasts with a candidate model version
+
+    submit() only hands the already-built feature frame to a single
+    background worker, so the live response is never delayed. Each run
+    records per-product prediction deltas and the latency of both models, in
+    memory (summary()) and as JSON lines under results_dir.
+
+    Parameters:
+    -----------
+    get_candidate : callable
+        Zero-argument function returning the candidate models dict, or None
+        when shadow scoring is off. Called on the worker thread, so loading a
+        candidate never blocks a request.
+    results_dir : str
+        Directory for shadow_<candidate version>.jsonl files (None: memory only)
+    max_pending : int
+        Runs allowed in the queue; forecasts beyond that are skipped
+    """
+
+    def __init__(self, get_candidate, results_dir=SHADOW_RESULTS_DIR, max_pending=SHADOW_MAX_PENDING):
+        self._get_candidate = get_candidate
+        self.results_dir = results_dir
+        self.max_pending = max_pending
+
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='shadow-scoring')
+        self._lock = threading.Lock()
+        self._records = deque(maxlen=SHADOW_MAX_RECORDS)
+        self._pending = 0
+
+        self.submitted = 0
+        self.completed = 0
+        self.skipped = 0
+        self.dropped = 0
+        self.errors = 0
+
+    def submit(self, live_models, future_df_features, live_predictions, live_seconds):
+        """
+        Queue a shadow run for a forecast that was just computed
+
+        Parameters:
+        -----------
+        live_models : dict
+            Models that produced live_predictions
+        future_df_features : pandas.DataFrame
+            Feature frame the live models scored (all feature columns)
+        live_predictions : numpy.ndarray
+            Live ensemble output (unrounded)
+        live_seconds : float
+            Wall time of the live ensemble call (latencies['ensemble'])
+
+        Returns:
+        --------
+        concurrent.futures.Future, or None when the queue is full
+        """
+        with self._lock:
+            if self._pending >= self.max_pending:
+                self.dropped += 1
+                return None
+            self._pending += 1
+            self.submitted += 1
+
+        # Shallow copy: the caller may add columns to its frame afterwards
+        features = future_df_features.copy(deep=False)
+        live_predictions = np.array(live_predictions, dtype=float)
+        return self._executor.submit(self._run, live_models, features, live_predictions, live_seconds)
+
+    def _run(self, live_models, features, live_predictions, live_seconds):
+        try:
+            candidate = self._get_candidate()
+            if candidate is None or candidate.get('model_version') == live_models.get('model_version'):
+                with self._lock:
+                    self.skipped += 1
+                return None
+
+            record = self.score(live_models, candidate, features, live_predictions, live_seconds)
+            self._store(record)
+            return record
+        except Exception as e:
+            with self._lock:
+                self.errors += 1
+            print(f"[WARNING] Shadow scoring failed: {e}")
+            return None
+        finally:
+            with self._lock:
+                self._pending -= 1
+
+    def score(self, live_models, candidate, features, live_predictions, live_seconds):
+        """Score the candidate on the same features and build the comparison record"""
+        feature_cols = candidate['feature_cols'] or live_models['feature_cols']
+        X = features.reindex(columns=feature_cols, fill_value=0).fillna(0)
+
+        # Serially on this thread: the shared inference pool is for live requests
+        candidate_predictions, candidate_latencies = predict_ensemble(candidate, X, parallel=False)
+
+        per_product = compare_predictions(features, live_predictions, candidate_predictions)
+        live_total = float(live_predictions.sum())
+        candidate_total = float(candidate_predictions.sum())
+
+        return {
+            'timestamp': datetime.now().isoformat(timespec='seconds'),
+            'live_model': _model_id(live_models),
+            'candidate_model': _model_id(candidate),
+            'rows': int(len(features)),
+            'horizon': {
+                'start': features['sale_date'].min().strftime('%Y-%m-%d'),
+                'end': features['sale_date'].max().strftime('%Y-%m-%d')
+            },
+            'latency_ms': {
+                'live': round(live_seconds * 1000, 2),
+                'candidate': round(candidate_latencies['ensemble'] * 1000, 2),
+                'candidate_by_model': {
+                    name: round(seconds * 1000, 2)
+                    for name, seconds in candidate_latencies.items() if name != 'ensemble'
+                }
+            },
+            'totals': {
+                'live': live_total,
+                'candidate': candidate_total,
+                'delta_pct': (candidate_total - live_total) / live_total * 100 if live_total else None
+            },
+            'mean_abs_delta': float(np.mean(np.abs(candidate_predictions - live_predictions))),
+            'products': json.loads(per_product.to_json(orient='records'))
+        }
+
+    def _store(self, record):
+        with self._lock:
+            self._records.append(record)
+            self.completed += 1
+
+        if self.results_dir:
+            os.makedirs(self.results_dir, exist_ok=True)
+            path = os.path.join(self.results_dir, f"shadow_{record['candidate_model']['version']}.jsonl")
+            with open(path, 'a') as f:
+                f.write(json.dumps(record) + '\n')
+
+    def records(self, limit=None):
+        """Most recent comparison records (newest last)"""
+        with self._lock:
+            records = list(self._records)
+        return records[-limit:] if limit else records
+
+    def summary(self):
+        """Counters plus per-candidate averages over the recent records"""
+        records = self.records()
+        by_candidate = {}
+        for record in records:
+            by_candidate.setdefault(record['candidate_model']['version'], []).append(record)
+
+        candidates = []
+        for version, runs in by_candidate.items():
+            delta_pcts = [r['totals']['delta_pct'] for r in runs if r['totals']['delta_pct'] is not None]
+            candidates.append({
+                'candidate_model': runs[-1]['candidate_model'],
+                'live_model': runs[-1]['live_model'],
+                'runs': len(runs),
+                'mean_abs_delta': float(np.mean([r['mean_abs_delta'] for r in runs])),
+                'mean_total_delta_pct': float(np.mean(delta_pcts)) if delta_pcts else None,
+                'median_latency_ms': {
+                    'live': float(np.median([r['latency_ms']['live'] for r in runs])),
+                    'candidate': float(np.median([r['latency_ms']['candidate'] for r in runs]))
+                },
+                'last_run': runs[-1]['timestamp']
+            })
+
+        with self._lock:
+            return {
+                'pending': self._pending,
+                'submitted': self.submitted,
+                'completed': self.completed,
+                'skipped': self.skipped,
+                'dropped': self.dropped,
+                'errors': self.errors,
+                'candidates': candidates
+            }
@@ -0,0 +1,173 @@
+"""
+Synthetic Sales Data Module for Sales Forecasting
+Kirana-style daily sales history in the production CSV schema, at any scale
+"""
+
+import pandas as pd
+import numpy as np
+from .festival_calendar import FestivalIndex, FESTIVAL_IMPACTS
+from .pricing_engine import compute_discounts
+
+
+# ============================================
+# CONFIGURATION
+# ============================================
+
+# Column order of kirana_sales_data_v2.3_production_discount.csv
+SALES_COLUMNS = [
+    'sale_date', 'product_id', 'product_name', 'category', 'season_affinity',
+    'price', 'cost_price', 'quantity_sold', 'discount_percent', 'final_price',
+    'revenue', 'profit', 'day_of_week', 'is_weekend', 'month', 'year',
+    'is_festival', 'festival_name'
+]
+
+# Per category: (min price, max price, mean daily units) as in the production data
+CATEGORY_PROFILES = {
+    "Dairy": (25, 150, 34.0),
+    "Beverages": (20, 200, 29.0),
+    "Snacks": (10, 100, 36.0),
+    "Staples": (40, 450, 16.0),
+    "Personal Care": (40, 300, 11.5),
+}
+
+# Months in which each season affinity sells more
+SEASON_MONTHS = {
+    'winter': [11, 12, 1, 2],
+    'summer': [3, 4, 5, 6],
+    'monsoon': [7, 8, 9],
+}
+SEASON_AFFINITIES = ['all', 'winter', 'summer', 'monsoon']
+SEASON_AFFINITY_SHARES = [0.56, 0.22, 0.20, 0.02]
+SEASON_UPLIFT = 1.3
+WEEKEND_UPLIFT = 1.15
+
+# Extra demand per discount percentage point
+DISCOUNT_ELASTICITY = 0.03
+
+
+# ============================================
+# GENERATOR
+# ============================================
+
+def generate_sales_data(num_skus=50, years=2.0, end_date='2025-11-14', categories=None,
+                        festival_impacts=None, seed=0):
+    """
+    Daily sales for every SKU, matching the production CSV schema
+
+    Demand per SKU is a base rate scaled by season affinity, weekends,
+    festival impact and discount, with Poisson noise. Discounts come from
+    the pricing engine and festivals from the festival calendar, so the
+    data exercises the same code paths as the real history.
+
+    Parameters:
+    -----------
+    num_skus : int
+        Number of products (spread round-robin over the categories)
+    years : float
+        Length of the history (days = years * 365)
+    end_date : str
+        Last sale date
+    categories : dict (optional)
+        {category: (min price, max price, mean daily units)}; default
+        CATEGORY_PROFILES
+    festival_impacts : dict (optional)
+        Festival impact table as in festival_calendar.FESTIVAL_IMPACTS
+        (default); {} generates no festivals
+    seed : int
+        Random seed; the same arguments always give the same data
+
+    Returns:
+    --------
+    pandas.DataFrame with SALES_COLUMNS (sorted by sale_date, product_id)
+    """
+    rng = np.random.default_rng(seed)
+    categories = categories or CATEGORY_PROFILES
+    festival_impacts = FESTIVAL_IMPACTS if festival_impacts is None else festival_impacts
+
+    num_days = max(int(round(years * 365)), 1)
+    dates = pd.date_range(end=pd.Timestamp(end_date), periods=num_days, freq='D')
+
+    # Products
+    category_names = np.array(list(categories), dtype=object)
+    product_category = category_names[np.arange(num_skus) % len(category_names)]
+    profiles = np.array([categories[c] for c in product_category], dtype=float).reshape(num_skus, 3)
+    price = np.round(rng.uniform(profiles[:, 0], profiles[:, 1]) / 5).astype(np.int64) * 5
+    price = np.maximum(price, 5)
+    cost_price = np.round(price * rng.uniform(0.6, 0.733, num_skus)).astype(np.int64)
+    base_units = profiles[:, 2] * rng.lognormal(0.0, 0.4, num_skus)
+    affinity = rng.choice(SEASON_AFFINITIES, size=num_skus, p=SEASON_AFFINITY_SHARES)
+    product_name = np.array(
+        [f"{cat} Item {i + 1:05d}" for i, cat in enumerate(product_category)], dtype=object
+    )
+
+    # Rows: every product on every day
+    day_idx = np.repeat(np.arange(num_days), num_skus)
+    prod_idx = np.tile(np.arange(num_skus), num_days)
+    row_dates = dates[day_idx]
+    row_category = product_category[prod_idx]
+    month = row_dates.month.values
+    weekday = row_dates.dayofweek.values
+
+    # Festivals and discounts
+    festival_index = FestivalIndex(dates[0].year, dates[-1].year, impacts=festival_impacts)
+    is_festival, festival_name, _ = festival_index.lookup(row_dates, row_category)
+    discount = compute_discounts(row_dates, row_category)
+
+    impact_lookup = {
+        (fest_name, cat): factor
+        for fest_name, info in festival_impacts.items()
+        for cat, factor in info['impact'].items()
+    }
+    pair_codes, pairs = pd.factorize(pd.MultiIndex.from_arrays([festival_name, row_category]))
+    festival_factor = np.array([impact_lookup.get(pair, 1.0) for pair in pairs])[pair_codes]
+
+    # Demand
+    in_season = np.zeros(len(day_idx), dtype=bool)
+    for season, months in SEASON_MONTHS.items():
+        in_season |= (affinity[prod_idx] == season) & np.isin(month, months)
+
+    expected = (
+        base_units[prod_idx]
+        * np.where(in_season, SEASON_UPLIFT, 1.0)
+        * np.where(weekday >= 5, WEEKEND_UPLIFT, 1.0)
+        * festival_factor
+        * (1 + DISCOUNT_ELASTICITY * discount)
+    )
+    quantity = rng.poisson(expected)
+
+    final_price = price[prod_idx] * (1 - discount / 100)
+    revenue = final_price * quantity
+
+    return pd.DataFrame({
+        'sale_date': row_dates.strftime('%Y-%m-%d'),
+        'product_id': prod_idx + 1,
+        'product_name': product_name[prod_idx],
+        'category': row_category,
+        'season_affinity': affinity[prod_idx],
+        'price': price[prod_idx],
+        'cost_price': cost_price[prod_idx],
+        'quantity_sold': quantity,
+        'discount_percent': discount,
+        'final_price': np.round(final_price, 2),
+        'revenue': np.round(revenue, 2),
+        'profit': np.round(revenue - cost_price[prod_idx] * quantity, 2),
+        'day_of_week': weekday,
+        'is_weekend': (weekday >= 5).astype(np.int64),
+        'month': month,
+        'year': row_dates.year.values,
+        'is_festival': is_festival,
+        'festival_name': festival_name
+    }, columns=SALES_COLUMNS)
+
+
+def write_sales_csv(path, **kwargs):
+    """
+    Generate synthetic sales (generate_sales_data arguments) and save them as CSV
+
+    Returns:
+    --------
+    pandas.DataFrame that was written
+    """
+    df = generate_sales_data(**kwargs)
+    df.to_csv(path, index=False)
+    return df
@@ -3,29 +3,431 @@ Forecast API Routes
 Handles sales forecasting endpoints
 """
 
-from flask import Blueprint, jsonify, request
+from flask import Blueprint, jsonify, request, Response, stream_with_context
+import json
 import os
+import threading
+import time
 import traceback
+import numpy as np
+import pandas as pd
 from datetime import datetime
 
 # Import forecast engine
-from ml_models.forecast_engine import generate_forecast, load_models
+from ml_models.forecast_engine import generate_forecast, UnknownFilterError
 # Import inventory reorder logic
 from ml_models.inventory_reorder import calculate_reorder_recommendations, generate_reorder_summary
+# Forecast result cache (keyed by data version, model version and horizon)
+from ml_models.forecast_cache import ForecastCache
+from ml_models.feature_store import get_feature_key
+# Sales data manifest (read by /status instead of the CSV)
+from ml_models.data_manifest import read_data_manifest, refresh_data_manifest_async
+# Daily precomputed forecasts / reorder plans
+from ml_models.forecast_scheduler import ForecastScheduler, PrecomputedForecasts
+from ml_models.ensemble_inference import predict_ensemble
+# Resident model versions with atomic hot swap
+from ml_models.model_registry import ModelRegistry, UnknownModelError
+# Background scoring of a candidate model version next to the live one
+from ml_models.shadow_scoring import ShadowScorer
+# Per-stage timings (rolling percentiles, served by /metrics)
+from ml_models.forecast_metrics import FORECAST_METRICS
 
 forecast_bp = Blueprint('forecast', __name__, url_prefix='/api/forecast')
 
-# Global variable to store loaded models (load once for performance)
-MODELS_CACHE = None
+# Model warm-up state (reported by /health/ready). Readiness itself comes from
+# the model registry: models loaded by a request or an activation count too.
+MODEL_WARMUP = {
+    'enabled': False,
+    'state': 'cold',  # cold -> loading -> ready | failed
+    'load_seconds': None,
+    'warmup_seconds': None,
+    'model_version': None,
+    'model_name': None,
+    'error': None,
+    'failed_at': None
+}
+_WARMUP_LOCK = threading.Lock()
 
+# Seconds before /health/ready retries a failed warm-up in the background
+MODEL_WARMUP_RETRY_SECONDS = float(os.getenv('MODEL_WARMUP_RETRY_SECONDS', '30'))
 
-def get_models():
-    """Get or load ML models (cached for performance)"""
-    global MODELS_CACHE
-    if MODELS_CACHE is None:
-        print("Loading ML models for the first time...")
-        MODELS_CACHE = load_models()
-    return MODELS_CACHE
+# Computed forecasts, shared by all requests
+FORECAST_CACHE = ForecastCache()
+
+# direct: every day uses the last observed history; recursive: day-by-day predictions feed the lags
+FORECAST_MODES = ['direct', 'recursive']
+
+# Response body formats (?format=): json (list of row objects), ndjson (one row
+# per line, streamed), columnar (one array per column)
+RESPONSE_FORMATS = ['json', 'ndjson', 'columnar']
+
+# Rows per NDJSON chunk written to the stream
+NDJSON_CHUNK_ROWS = 1000
+
+# Forecasts and reorder plans precomputed after the daily data cutoff
+PRECOMPUTED_FORECASTS = PrecomputedForecasts()
+FORECAST_SCHEDULER = None
+
+# Historical sales CSV (in root of project)
+SALES_CSV_PATH = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))),
+    'kirana_sales_data_v2.3_production_discount.csv'
+)
+
+
+def _warm_models(models):
+    """
+    Run one dummy prediction so the first real forecast does not pay for
+    each library's lazy initialization (thread pools, tree layouts)
+    """
+    start = time.perf_counter()
+    feature_cols = models['feature_cols']
+    if feature_cols is not None:
+        X_dummy = pd.DataFrame(np.zeros((1, len(feature_cols))), columns=feature_cols)
+        predict_ensemble(models, X_dummy)
+    models['warmup_seconds'] = round(time.perf_counter() - start, 3)
+
+
+# Loaded model versions (saved_models* directories); new versions are loaded
+# and warmed off the request path, then swapped in atomically
+MODEL_REGISTRY = ModelRegistry(warm=_warm_models)
+
+
+def get_models(model_name=None):
+    """Models for a version (default: the active one), loaded once and shared"""
+    return MODEL_REGISTRY.get(model_name)
+
+
+# Candidate version scored in the shadow of live forecasts (None: off)
+SHADOW_MODEL = {'name': os.getenv('SHADOW_MODEL') or None}
+
+
+def _shadow_candidate():
+    """Candidate models for the shadow worker (loaded on its thread)"""
+    name = SHADOW_MODEL['name']
+    return MODEL_REGISTRY.get(name) if name else None
+
+
+SHADOW_SCORER = ShadowScorer(get_candidate=_shadow_candidate)
+
+
+def warm_up_models(reload=False):
+    """
+    Load and warm the active models, recording timings in MODEL_WARMUP
+    
+    With reload=True the models are re-read from disk; the current ones keep
+    serving until the new ones are loaded and warm.
+    """
+    if not MODEL_REGISTRY.is_loaded():
+        MODEL_WARMUP.update(state='loading', error=None, failed_at=None)
+    try:
+        start = time.perf_counter()
+        models = MODEL_REGISTRY.reload() if reload else get_models()
+        total_seconds = time.perf_counter() - start
+        warmup_seconds = models.get('warmup_seconds') or 0.0
+        
+        MODEL_WARMUP.update(
+            state='ready',
+            load_seconds=round(max(total_seconds - warmup_seconds, 0.0), 3),
+            warmup_seconds=warmup_seconds,
+            model_version=models.get('model_version'),
+            model_name=models.get('model_name')
+        )
+        print(f"[OK] Models warm (load {MODEL_WARMUP['load_seconds']}s, "
+              f"warm-up {MODEL_WARMUP['warmup_seconds']}s)")
+        return models
+    except Exception as e:
+        # A failed reload keeps serving the previously loaded models
+        MODEL_WARMUP.update(
+            state='ready' if MODEL_REGISTRY.is_loaded() else 'failed', error=str(e), failed_at=time.time()
+        )
+        print(f"[WARNING] Model warm-up failed: {e}")
+        raise
+
+
+def start_model_warmup():
+    """Warm the models in a background thread (used by the app factory)"""
+    MODEL_WARMUP.update(enabled=True, state='loading', error=None, failed_at=None)
+
+    def _run():
+        try:
+            warm_up_models()
+        except Exception:
+            pass  # Recorded in MODEL_WARMUP; requests retry via get_models()
+    
+    thread = threading.Thread(target=_run, name='model-warmup', daemon=True)
+    thread.start()
+    return thread
+
+
+def get_model_readiness():
+    """
+    Snapshot of the model warm-up state, with 'ready' for /health/ready
+
+    Ready once the active version is resident in the registry, however it
+    got there (warm-up, a request's get_models(), or activation through
+    POST /reload-models {"model": ...}). Without warm-up
+    (MODEL_WARMUP_ENABLED=false) the process is ready from the start
+    ('lazy': the first request loads the models). A failed warm-up is
+    retried in the background every MODEL_WARMUP_RETRY_SECONDS.
+    """
+    with _WARMUP_LOCK:
+        readiness = dict(MODEL_WARMUP)
+        models = MODEL_REGISTRY.peek()
+        if models is not None:
+            readiness.update(
+                state='ready', model_version=models.get('model_version'), model_name=models.get('model_name')
+            )
+        elif not readiness['enabled']:
+            readiness['state'] = 'lazy'
+        elif readiness['state'] == 'failed' and time.time() - readiness['failed_at'] >= MODEL_WARMUP_RETRY_SECONDS:
+            print("Retrying model warm-up...")
+            start_model_warmup()
+            readiness['state'] = 'loading'
+
+    readiness['ready'] = readiness['state'] in ('ready', 'lazy')
+    return readiness
+
+
+def get_forecast_version(csv_path, models):
+    """Identifier of the (sales data, models) pair a forecast was computed from"""
+    return f"{get_feature_key(csv_path)}-{models.get('model_version', 'unversioned')}"
+
+
+def _select(forecast_df, products=None, categories=None):
+    """Rows of a full forecast for the requested products/categories"""
+    mask = pd.Series(True, index=forecast_df.index)
+    if products is not None:
+        mask &= forecast_df['product_name'].isin(products)
+    if categories is not None:
+        mask &= forecast_df['category'].isin(categories)
+    return forecast_df[mask].reset_index(drop=True)
+
+
+def _load_or_generate_forecast(csv_path, num_days, models, mode='direct', products=None, categories=None):
+    """Precomputed forecast when available, otherwise compute it live"""
+    if mode == 'direct':
+        try:
+            forecast_df = PRECOMPUTED_FORECASTS.load_forecast(get_forecast_version(csv_path, models), num_days)
+            if forecast_df is not None:
+                print(f"[OK] Serving precomputed {num_days}-day forecast")
+                if products is None and categories is None:
+                    return forecast_df
+                # Each product's forecast is independent of the others, so a
+                # subset is a slice of the full run (unknown names still raise)
+                subset = _select(forecast_df, products, categories)
+                if len(subset) > 0 and (products is None or set(products) <= set(subset['product_name'])):
+                    return subset
+        except Exception as e:
+            print(f"[WARNING] Could not read precomputed forecast: {e}")
+    return generate_forecast(
+        csv_path, num_days=num_days, models=models, recursive=(mode == 'recursive'),
+        products=products, categories=categories,
+        shadow=SHADOW_SCORER if SHADOW_MODEL['name'] else None
+    )
+
+
+def get_cached_forecast(csv_path, num_days, models, mode='direct', products=None, categories=None):
+    """Forecast for the current data and models, computed once per version and subset"""
+    products = sorted(set(products)) if products is not None else None
+    categories = sorted(set(categories)) if categories is not None else None
+    key = (
+        get_feature_key(csv_path), models.get('model_version', 'unversioned'), num_days, mode,
+        tuple(products) if products is not None else None,
+        tuple(categories) if categories is not None else None
+    )
+    return FORECAST_CACHE.get_or_compute(
+        key, lambda: _load_or_generate_forecast(csv_path, num_days, models, mode, products, categories)
+    )
+
+
+def parse_forecast_filters(data):
+    """
+    Read the optional 'products' and 'categories' filters from a request body
+    
+    Returns:
+    --------
+    tuple (products, categories, error) - error is a message or None
+    """
+    filters = []
+    for field in ('products', 'categories'):
+        values = data.get(field)
+        if values is not None and (
+            not isinstance(values, list) or not values or not all(isinstance(v, str) for v in values)
+        ):
+            return None, None, f'{field} must be a non-empty list of names'
+        filters.append(values)
+    return filters[0], filters[1], None
+
+
+def _current_stock_from_db():
+    """Current stock levels {product_name: current_stock} from the products table"""
+    from config.supabase_config import get_supabase_client
+    response = get_supabase_client().table('products').select('product_name, current_stock').execute()
+    return {p['product_name']: int(p['current_stock'] or 0) for p in (response.data or [])}
+
+
+def start_forecast_scheduler():
+    """
+    Start the daily forecast precompute thread
+
+    Only one process per precomputed store runs it (file lock); in other
+    workers this is a no-op and they serve the stored forecasts.
+    """
+    global FORECAST_SCHEDULER
+    if FORECAST_SCHEDULER is None:
+        FORECAST_SCHEDULER = ForecastScheduler(
+            get_version=lambda: get_forecast_version(SALES_CSV_PATH, get_models()),
+            compute_forecast=lambda num_days: get_cached_forecast(SALES_CSV_PATH, num_days, get_models()),
+            stock_provider=_current_stock_from_db,
+            store=PRECOMPUTED_FORECASTS
+        )
+    FORECAST_SCHEDULER.start()
+    return FORECAST_SCHEDULER
+
+
+# ============================================
+# RESPONSE SERIALIZATION
+# ============================================
+
+def forecast_columns(forecast_df):
+    """Forecast as {field: list}, converted column-wise from NumPy"""
+    return {
+        'date': forecast_df['sale_date'].dt.strftime('%Y-%m-%d').tolist(),
+        'product_name': forecast_df['product_name'].tolist(),
+        'category': forecast_df['category'].tolist(),
+        'price': forecast_df['price'].to_numpy(dtype=float).tolist(),
+        'discount_percent': forecast_df['discount_percent'].to_numpy(dtype=float).tolist(),
+        'final_price': forecast_df['final_price'].to_numpy(dtype=float).tolist(),
+        'is_festival': forecast_df['is_festival'].to_numpy(dtype=np.int64).tolist(),
+        'festival_name': forecast_df['festival_name'].tolist(),
+        'predicted_quantity': forecast_df['predicted_quantity'].to_numpy(dtype=np.int64).tolist(),
+        'forecasted_revenue': forecast_df['forecasted_revenue'].to_numpy(dtype=float).tolist()
+    }
+
+
+def reorder_columns(reorder_df):
+    """Reorder plan as {field: list}, converted column-wise from NumPy"""
+    int_fields = [
+        'current_stock', 'shelf_life_days', 'target_stock', 'recommended_order_qty',
+        'forecast_7day_total', 'forecast_day1', 'forecast_day2', 'forecast_day3'
+    ]
+    columns = {
+        'product_name': reorder_df['product_name'].tolist(),
+        'category': reorder_df['category'].tolist(),
+        'days_until_stockout': reorder_df['days_until_stockout'].to_numpy(dtype=float).tolist(),
+        'urgency_status': reorder_df['urgency_status'].tolist(),
+        'reorder_reason': reorder_df['reorder_reason'].tolist()
+    }
+    for field in int_fields:
+        columns[field] = reorder_df[field].to_numpy(dtype=np.int64).tolist()
+    return columns
+
+
+def column_rows(columns):
+    """Row dicts from a {field: list} mapping"""
+    fields = list(columns)
+    return [dict(zip(fields, values)) for values in zip(*columns.values())]
+
+
+def forecast_summary(forecast_df):
+    """Totals, date range and per-category totals of a forecast"""
+    category_summary = forecast_df.groupby('category').agg({
+        'predicted_quantity': 'sum',
+        'forecasted_revenue': 'sum'
+    })
+    return {
+        'total_products': int(forecast_df['product_name'].nunique()),
+        'total_quantity': int(forecast_df['predicted_quantity'].sum()),
+        'total_revenue': float(forecast_df['forecasted_revenue'].sum()),
+        'date_range': {
+            'start': forecast_df['sale_date'].min().strftime('%Y-%m-%d'),
+            'end': forecast_df['sale_date'].max().strftime('%Y-%m-%d')
+        },
+        'by_category': [
+            {
+                'category': category,
+                'total_quantity': int(values['predicted_quantity']),
+                'total_revenue': float(values['forecasted_revenue'])
+            }
+            for category, values in category_summary.iterrows()
+        ]
+    }
+
+
+def _ndjson_lines(record_type, df, to_columns):
+    """
+    NDJSON lines for one table, NDJSON_CHUNK_ROWS rows per yielded chunk
+    
+    Rows are converted one chunk at a time, so only a chunk's worth of
+    Python objects exists at once.
+    """
+    for start in range(0, len(df), NDJSON_CHUNK_ROWS):
+        columns = to_columns(df.iloc[start:start + NDJSON_CHUNK_ROWS])
+        yield ''.join(
+            json.dumps({'type': record_type, **row}) + '\n'
+            for row in column_rows(columns)
+        )
+
+
+def forecast_response(response_format, tables, metadata, timer=None):
+    """
+    Build the endpoint response in the requested format
+    
+    Parameters:
+    -----------
+    response_format : str
+        One of RESPONSE_FORMATS
+    tables : dict
+        {response key: (DataFrame, converter)} e.g.
+        {'forecast': (forecast_df, forecast_columns)}
+    metadata : dict
+        Summary fields returned next to the tables
+    timer : StageTimer (optional)
+        Records the 'serialize' stage and finishes the run; for ndjson when
+        the stream has been written
+    
+    Returns:
+    --------
+    (flask.Response, status) tuple
+    
+    json returns {key: [row objects]} as before; columnar returns
+    {key: {'columns': [...], 'data': {field: [...]}}}; ndjson streams one
+    {"type": key, ...} line per row followed by a {"type": "summary"} line.
+    """
+    def finish():
+        if timer is not None:
+            timer.lap('serialize')
+            timer.finish()
+    
+    if response_format == 'ndjson':
+        def generate():
+            for key, (df, to_columns) in tables.items():
+                yield from _ndjson_lines(key, df, to_columns)
+            yield json.dumps({'type': 'summary', 'success': True, **metadata}) + '\n'
+            finish()
+        return Response(stream_with_context(generate()), mimetype='application/x-ndjson'), 200
+    
+    columns = {key: to_columns(df) for key, (df, to_columns) in tables.items()}
+    if response_format == 'columnar':
+        body = {
+            key: {'columns': list(table), 'data': table}
+            for key, table in columns.items()
+        }
+        body['format'] = 'columnar'
+    else:
+        body = {key: column_rows(table) for key, table in columns.items()}
+    response = jsonify({'success': True, **body, **metadata}), 200
+    finish()
+    return response
+
+
+def _parse_response_format():
+    """(format, error) from the ?format= query parameter"""
+    response_format = request.args.get('format', 'json')
+    if response_format not in RESPONSE_FORMATS:
+        return None, f"format must be one of: {', '.join(RESPONSE_FORMATS)}"
+    return response_format, None
 
 
 @forecast_bp.route('/generate', methods=['POST'])
@@ -33,9 +435,17 @@ def generate_forecast_api():
     """
     Generate sales forecast for next N days
     
+    Query Parameters:
+        format: "json" (default), "ndjson" (streamed, one row per line) or
+                "columnar" (one array per field)
+    
     Request Body:
     {
-        "num_days": 7  // Optional, defaults to 7
+        "num_days": 7,  // Optional, defaults to 7
+        "mode": "direct",  // Optional: "direct" (default) or "recursive"
+        "products": ["Amul Milk 1L"],  // Optional: only these products
+        "categories": ["Dairy"],  // Optional: only these categories
+        "model": "saved_models_backup"  // Optional: pin a model version (see /models)
     }
     
     Response:
@@ -68,9 +478,12 @@ def generate_forecast_api():
     }
     """
     try:
+        timer = FORECAST_METRICS.timer('api.generate')
+        
         # Get request parameters
         data = request.get_json() or {}
         num_days = data.get('num_days', 7)
+        mode = data.get('mode', 'direct')
         
         # Validate num_days
         if not isinstance(num_days, int) or num_days < 1 or num_days > 30:
@@ -79,6 +492,37 @@ def generate_forecast_api():
                 'error': 'num_days must be an integer between 1 and 30'
             }), 400
         
+        # Validate mode
+        if mode not in FORECAST_MODES:
+            return jsonify({
+                'success': False,
+                'error': f"mode must be one of: {', '.join(FORECAST_MODES)}"
+            }), 400
+        
+        # Validate product/category filters
+        products, categories, filter_error = parse_forecast_filters(data)
+        if filter_error:
+            return jsonify({
+                'success': False,
+                'error': filter_error
+            }), 400
+        
+        # Validate response format
+        response_format, format_error = _parse_response_format()
+        if format_error:
+            return jsonify({
+                'success': False,
+                'error': format_error
+            }), 400
+        
+        # Validate pinned model version
+        model_name = data.get('model')
+        if model_name is not None and not isinstance(model_name, str):
+            return jsonify({
+                'success': False,
+                'error': 'model must be a model version name'
+            }), 400
+        
         # Path to CSV file (in root of project)
         # Go up from backend/routes/ -> backend/ -> project_root/
         project_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -90,63 +534,28 @@ def generate_forecast_api():
                 'error': f'Sales data file not found: {csv_path}'
             }), 404
         
-        # Load models (cached)
-        models = get_models()
+        # Load models (cached; the active version unless one is pinned)
+        models = get_models(model_name)
+        timer.lap('models')
         
         # Generate forecast
         print(f"Generating {num_days}-day forecast...")
-        forecast_df = generate_forecast(csv_path, num_days=num_days, models=models)
-        
-        # Convert to JSON format
-        forecast_list = []
-        for _, row in forecast_df.iterrows():
-            forecast_list.append({
-                'date': row['sale_date'].strftime('%Y-%m-%d'),
-                'product_name': row['product_name'],
-                'category': row['category'],
-                'price': float(row['price']),
-                'discount_percent': float(row['discount_percent']),
-                'final_price': float(row['final_price']),
-                'is_festival': int(row['is_festival']),
-                'festival_name': row['festival_name'],
-                'predicted_quantity': int(row['predicted_quantity']),
-                'forecasted_revenue': float(row['forecasted_revenue'])
-            })
-        
-        # Generate summary statistics
-        total_quantity = forecast_df['predicted_quantity'].sum()
-        total_revenue = forecast_df['forecasted_revenue'].sum()
-        unique_products = forecast_df['product_name'].nunique()
-        date_range = {
-            'start': forecast_df['sale_date'].min().strftime('%Y-%m-%d'),
-            'end': forecast_df['sale_date'].max().strftime('%Y-%m-%d')
-        }
-        
-        # Category-wise summary
-        category_summary = forecast_df.groupby('category').agg({
-            'predicted_quantity': 'sum',
-            'forecasted_revenue': 'sum'
-        }).to_dict('index')
+        forecast_df = get_cached_forecast(csv_path, num_days, models, mode, products, categories)
+        timer.lap('forecast')
         
-        category_summary_list = []
-        for category, values in category_summary.items():
-            category_summary_list.append({
-                'category': category,
-                'total_quantity': int(values['predicted_quantity']),
-                'total_revenue': float(values['forecasted_revenue'])
-            })
+        return forecast_response(
+            response_format,
+            {'forecast': (forecast_df, forecast_columns)},
+            {'summary': forecast_summary(forecast_df)},
+            timer
+        )
         
+    except (UnknownFilterError, UnknownModelError) as e:
+        # Unknown product/category in the filters, or unknown model version
         return jsonify({
-            'success': True,
-            'forecast': forecast_list,
-            'summary': {
-                'total_products': int(unique_products),
-                'total_quantity': int(total_quantity),
-                'total_revenue': float(total_revenue),
-                'date_range': date_range,
-                'by_category': category_summary_list
-            }
-        }), 200
+            'success': False,
+            'error': str(e)
+        }), 400
         
     except FileNotFoundError as e:
         print(f"ERROR: File not found: {e}")
@@ -169,9 +578,17 @@ def generate_forecast_with_reorder():
     """
     Generate sales forecast AND reorder recommendations
     
+    Query Parameters:
+        format: "json" (default), "ndjson" (streamed, one row per line) or
+                "columnar" (one array per field)
+    
     Request Body:
     {
         "num_days": 7,  // Optional, defaults to 7
+        "mode": "direct",  // Optional: "direct" (default) or "recursive"
+        "products": ["Amul Milk 1L"],  // Optional: only these products
+        "categories": ["Dairy"],  // Optional: only these categories
+        "model": "saved_models_backup",  // Optional: pin a model version (see /models)
         "current_stock": {  // Required: Current stock levels
             "Amul Milk 1L": 50,
             "Amul Butter 100g": 30,
@@ -210,9 +627,12 @@ def generate_forecast_with_reorder():
     }
     """
     try:
+        timer = FORECAST_METRICS.timer('api.generate_with_reorder')
+        
         # Get request parameters
         data = request.get_json() or {}
         num_days = data.get('num_days', 7)
+        mode = data.get('mode', 'direct')
         current_stock_dict = data.get('current_stock', {})
         safety_stock = data.get('safety_stock', 5)
         lead_time_days = data.get('lead_time_days', 1)
@@ -224,6 +644,37 @@ def generate_forecast_with_reorder():
                 'error': 'num_days must be an integer between 1 and 30'
             }), 400
         
+        # Validate mode
+        if mode not in FORECAST_MODES:
+            return jsonify({
+                'success': False,
+                'error': f"mode must be one of: {', '.join(FORECAST_MODES)}"
+            }), 400
+        
+        # Validate product/category filters
+        products, categories, filter_error = parse_forecast_filters(data)
+        if filter_error:
+            return jsonify({
+                'success': False,
+                'error': filter_error
+            }), 400
+        
+        # Validate response format
+        response_format, format_error = _parse_response_format()
+        if format_error:
+            return jsonify({
+                'success': False,
+                'error': format_error
+            }), 400
+        
+        # Validate pinned model version
+        model_name = data.get('model')
+        if model_name is not None and not isinstance(model_name, str):
+            return jsonify({
+                'success': False,
+                'error': 'model must be a model version name'
+            }), 400
+        
         # Validate current_stock
         if not isinstance(current_stock_dict, dict):
             return jsonify({
@@ -241,96 +692,53 @@ def generate_forecast_with_reorder():
                 'error': f'Sales data file not found: {csv_path}'
             }), 404
         
-        # Load models (cached)
-        models = get_models()
+        # Load models (cached; the active version unless one is pinned)
+        models = get_models(model_name)
+        timer.lap('models')
         
         # Generate forecast
         print(f"Generating {num_days}-day forecast with reorder recommendations...")
-        forecast_df = generate_forecast(csv_path, num_days=num_days, models=models)
-        
-        # Calculate reorder recommendations
-        print("Calculating reorder recommendations...")
-        reorder_df = calculate_reorder_recommendations(
-            forecast_df, 
-            current_stock_dict, 
-            safety_stock=safety_stock,
-            lead_time_days=lead_time_days
-        )
+        forecast_df = get_cached_forecast(csv_path, num_days, models, mode, products, categories)
+        timer.lap('forecast')
         
-        # Generate reorder summary
-        reorder_summary = generate_reorder_summary(reorder_df)
-        
-        # Convert forecast to JSON format
-        forecast_list = []
-        for _, row in forecast_df.iterrows():
-            forecast_list.append({
-                'date': row['sale_date'].strftime('%Y-%m-%d'),
-                'product_name': row['product_name'],
-                'category': row['category'],
-                'price': float(row['price']),
-                'discount_percent': float(row['discount_percent']),
-                'final_price': float(row['final_price']),
-                'is_festival': int(row['is_festival']),
-                'festival_name': row['festival_name'],
-                'predicted_quantity': int(row['predicted_quantity']),
-                'forecasted_revenue': float(row['forecasted_revenue'])
-            })
-        
-        # Convert reorder to JSON format
-        reorder_list = []
-        for _, row in reorder_df.iterrows():
-            reorder_list.append({
-                'product_name': row['product_name'],
-                'category': row['category'],
-                'current_stock': int(row['current_stock']),
-                'shelf_life_days': int(row['shelf_life_days']),
-                'days_until_stockout': float(row['days_until_stockout']),
-                'urgency_status': row['urgency_status'],
-                'target_stock': int(row['target_stock']),
-                'recommended_order_qty': int(row['recommended_order_qty']),
-                'reorder_reason': row['reorder_reason'],
-                'forecast_7day_total': int(row['forecast_7day_total']),
-                'forecast_day1': int(row['forecast_day1']),
-                'forecast_day2': int(row['forecast_day2']),
-                'forecast_day3': int(row['forecast_day3'])
-            })
-        
-        # Generate forecast summary statistics
-        total_quantity = forecast_df['predicted_quantity'].sum()
-        total_revenue = forecast_df['forecasted_revenue'].sum()
-        unique_products = forecast_df['product_name'].nunique()
-        date_range = {
-            'start': forecast_df['sale_date'].min().strftime('%Y-%m-%d'),
-            'end': forecast_df['sale_date'].max().strftime('%Y-%m-%d')
-        }
+        # Reuse the precomputed plan when it was built from the same stock levels
+        reorder_df = None
+        try:
+            if mode == 'direct' and products is None and categories is None:
+                reorder_df = PRECOMPUTED_FORECASTS.load_reorder(
+                    get_forecast_version(csv_path, models), num_days,
+                    current_stock_dict, safety_stock=safety_stock, lead_time_days=lead_time_days
+                )
+        except Exception as e:
+            print(f"[WARNING] Could not read precomputed reorder plan: {e}")
         
-        # Category-wise summary
-        category_summary = forecast_df.groupby('category').agg({
-            'predicted_quantity': 'sum',
-            'forecasted_revenue': 'sum'
-        }).to_dict('index')
+        if reorder_df is None:
+            # Calculate reorder recommendations
+            print("Calculating reorder recommendations...")
+            reorder_df = calculate_reorder_recommendations(
+                forecast_df, 
+                current_stock_dict, 
+                safety_stock=safety_stock,
+                lead_time_days=lead_time_days
+            )
+        timer.lap('reorder')
         
-        category_summary_list = []
-        for category, values in category_summary.items():
-            category_summary_list.append({
-                'category': category,
-                'total_quantity': int(values['predicted_quantity']),
-                'total_revenue': float(values['forecasted_revenue'])
-            })
+        return forecast_response(
+            response_format,
+            {'forecast': (forecast_df, forecast_columns), 'reorder': (reorder_df, reorder_columns)},
+            {
+                'forecast_summary': forecast_summary(forecast_df),
+                'reorder_summary': generate_reorder_summary(reorder_df)
+            },
+            timer
+        )
         
+    except (UnknownFilterError, UnknownModelError) as e:
+        # Unknown product/category in the filters, or unknown model version
         return jsonify({
-            'success': True,
-            'forecast': forecast_list,
-            'forecast_summary': {
-                'total_products': int(unique_products),
-                'total_quantity': int(total_quantity),
-                'total_revenue': float(total_revenue),
-                'date_range': date_range,
-                'by_category': category_summary_list
-            },
-            'reorder': reorder_list,
-            'reorder_summary': reorder_summary
-        }), 200
+            'success': False,
+            'error': str(e)
+        }), 400
         
     except FileNotFoundError as e:
         print(f"ERROR: File not found: {e}")
@@ -353,44 +761,33 @@ def forecast_status():
     """
     Check if forecast system is ready (models loaded, data available)
     
+    Reads only the data manifest and in-memory state, so it is cheap enough
+    to poll. It never loads models or parses the sales CSV; a missing or
+    stale manifest is rebuilt in the background.
+    
     Response:
     {
         "success": true,
         "status": "ready",
         "models_loaded": true,
+        "model_warmup": "ready",
+        "models": {"active": "saved_models", "resident": [...], "available": [...], ...},
         "data_file_exists": true,
-        "last_data_date": "2025-11-10"
+        "last_data_date": "2025-11-10",
+        "data": {"row_count": 37350, "product_count": 50, "content_hash": "...", "stale": false, ...},
+        "forecast_cache": {"entries": 2, "hits": 14, "misses": 2, ...},
+        "scheduler": {"running": true, "next_run": "2025-11-11T22:00", ...}
     }
     """
     try:
-        import pandas as pd
+        data_file_exists = os.path.exists(SALES_CSV_PATH)
         
-        # Check if CSV file exists (in root of project)
-        # Go up from backend/routes/ -> backend/ -> project_root/
-        project_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-        csv_path = os.path.join(project_root, 'kirana_sales_data_v2.3_production_discount.csv')
-        data_file_exists = os.path.exists(csv_path)
-        
-        # Get last date in data
-        last_data_date = None
-        if data_file_exists:
-            try:
-                df = pd.read_csv(csv_path)
-                df['sale_date'] = pd.to_datetime(df['sale_date'])
-                last_data_date = df['sale_date'].max().strftime('%Y-%m-%d')
-            except:
-                pass
-        
-        # Check if models are loaded
-        models_loaded = MODELS_CACHE is not None
-        
-        # Try to load models if not already loaded
-        if not models_loaded:
-            try:
-                get_models()
-                models_loaded = True
-            except:
-                models_loaded = False
+        # Data version from the manifest (refreshed in the background when missing/stale)
+        manifest = read_data_manifest(SALES_CSV_PATH) if data_file_exists else None
+        if data_file_exists and (manifest is None or manifest['stale']):
+            refresh_data_manifest_async(SALES_CSV_PATH)
+        
+        models_loaded = MODEL_REGISTRY.is_loaded()
         
         # Determine overall status
         if models_loaded and data_file_exists:
@@ -406,8 +803,18 @@ def forecast_status():
             'success': True,
             'status': status,
             'models_loaded': models_loaded,
+            'model_warmup': get_model_readiness()['state'],
+            'models': MODEL_REGISTRY.status(),
             'data_file_exists': data_file_exists,
-            'last_data_date': last_data_date
+            'last_data_date': manifest['last_date'] if manifest else None,
+            'data': {
+                key: manifest.get(key)
+                for key in ('first_date', 'last_date', 'row_count', 'product_count',
+                            'content_hash', 'updated_at', 'stale')
+            } if manifest else None,
+            'forecast_cache': FORECAST_CACHE.stats(),
+            'shadow': {'candidate': SHADOW_MODEL['name'], **SHADOW_SCORER.summary()},
+            'scheduler': FORECAST_SCHEDULER.status() if FORECAST_SCHEDULER else None
         }), 200
         
     except Exception as e:
@@ -422,27 +829,241 @@ def forecast_status():
 @forecast_bp.route('/reload-models', methods=['POST'])
 def reload_models():
     """
-    Reload ML models from disk (use after retraining)
+    Reload ML models from disk (use after retraining), or switch the active version
+    
+    The new models are loaded and warmed while the current ones keep serving,
+    then swapped in atomically. Forecasts are cached per model version, so
+    no cache flush is needed.
+    
+    Request Body (optional):
+    {
+        "model": "saved_models_backup"  // Make this version the active one
+    }
     
     Response:
     {
         "success": true,
-        "message": "Models reloaded successfully"
+        "message": "Models reloaded successfully",
+        "models": {"active": "saved_models", "resident": [...], ...}
     }
     """
     try:
-        global MODELS_CACHE
-        MODELS_CACHE = None  # Clear cache
-        MODELS_CACHE = load_models()  # Reload
+        data = request.get_json(silent=True) or {}
+        model_name = data.get('model')
+        
+        if model_name is not None and model_name != MODEL_REGISTRY.active_name:
+            MODEL_REGISTRY.activate(model_name)
+            message = f'Active model version is now {model_name}'
+        else:
+            warm_up_models(reload=True)  # Reload and warm before swapping in
+            message = 'Models reloaded successfully'
         
         return jsonify({
             'success': True,
-            'message': 'Models reloaded successfully'
+            'message': message,
+            'models': MODEL_REGISTRY.status()
         }), 200
         
+    except UnknownModelError as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 400
+        
     except Exception as e:
         print(f"ERROR: Error reloading models: {e}")
         return jsonify({
             'success': False,
             'error': str(e)
         }), 500
+
+
+@forecast_bp.route('/models', methods=['GET'])
+def model_versions():
+    """
+    Model versions on disk and in memory
+    
+    Response:
+    {
+        "success": true,
+        "models": {"active": "saved_models",
+                   "resident": [{"name": "saved_models", "model_version": "3f2a..."}],
+                   "available": ["saved_models", "saved_models_backup", "saved_models_backup2"],
+                   "max_resident": 2, "loads": 1, "swaps": 0, "evictions": 0}
+    }
+    """
+    return jsonify({
+        'success': True,
+        'models': MODEL_REGISTRY.status()
+    }), 200
+
+
+@forecast_bp.route('/shadow', methods=['GET'])
+def shadow_results():
+    """
+    Shadow scoring comparisons of the candidate model against the live one
+    
+    Query Parameters:
+        limit: Number of recent runs to include (default: 10)
+    
+    Response:
+    {
+        "success": true,
+        "candidate": "saved_models_backup",
+        "summary": {"submitted": 3, "completed": 3, "dropped": 0, ...,
+                    "candidates": [{"runs": 3, "mean_abs_delta": 0.8,
+                                    "mean_total_delta_pct": -1.2,
+                                    "median_latency_ms": {"live": 41.0, "candidate": 38.5}, ...}]},
+        "runs": [{"live_model": {...}, "candidate_model": {...}, "latency_ms": {...},
+                  "totals": {...}, "products": [{"product_name": "...", "delta": 12.0, ...}]}]
+    }
+    """
+    try:
+        limit = int(request.args.get('limit', 10))
+    except ValueError:
+        return jsonify({
+            'success': False,
+            'error': 'limit must be an integer'
+        }), 400
+    
+    return jsonify({
+        'success': True,
+        'candidate': SHADOW_MODEL['name'],
+        'summary': SHADOW_SCORER.summary(),
+        'runs': SHADOW_SCORER.records(limit) if limit > 0 else []
+    }), 200
+
+
+@forecast_bp.route('/shadow', methods=['POST'])
+def set_shadow_model():
+    """
+    Choose the candidate model version scored in the shadow of live forecasts
+    
+    Live forecasts computed from then on (cache misses, direct mode) are
+    re-scored by the candidate in the background; responses are unchanged.
+    
+    Request Body:
+    {
+        "model": "saved_models_backup"  // null turns shadow scoring off
+    }
+    """
+    try:
+        data = request.get_json(silent=True) or {}
+        model_name = data.get('model')
+        
+        if model_name is not None:
+            MODEL_REGISTRY.model_dir(model_name)  # Validate before enabling
+        SHADOW_MODEL['name'] = model_name
+        
+        return jsonify({
+            'success': True,
+            'candidate': model_name,
+            'message': f'Shadow scoring {model_name}' if model_name else 'Shadow scoring disabled'
+        }), 200
+        
+    except UnknownModelError as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 400
+
+
+@forecast_bp.route('/metrics', methods=['GET'])
+def forecast_metrics():
+    """
+    Rolling per-stage timings of forecast runs and API requests
+    
+    Stages are named <run>.<stage>: generate_forecast.* (engine stages and
+    per-model predict_lgb/xgb/catboost), load_features.* (snapshot read or
+    CSV load and feature engineering), api.generate.* and
+    api.generate_with_reorder.* (models, forecast incl. cache lookup,
+    reorder, serialize, total). Percentiles cover the last
+    FORECAST_METRICS_WINDOW samples of each stage.
+    
+    Query Parameters:
+        prefix: Only stages starting with this (e.g. "generate_forecast")
+    
+    Response:
+    {
+        "success": true,
+        "trace_memory": false,
+        "window": 500,
+        "stages": {
+            "generate_forecast.future_features": {"count": 12, "samples": 12, "mean_ms": 41.2,
+                                                  "p50_ms": 40.1, "p90_ms": 45.0, "p95_ms": 47.3,
+                                                  "p99_ms": 52.8, "max_ms": 54.1},
+            ...
+        }
+    }
+    """
+    return jsonify({
+        'success': True,
+        'trace_memory': FORECAST_METRICS.trace_memory,
+        'window': FORECAST_METRICS.window,
+        'stages': FORECAST_METRICS.summary(request.args.get('prefix', ''))
+    }), 200
+
+
+@forecast_bp.route('/metrics/reset', methods=['POST'])
+def reset_forecast_metrics():
+    """
+    Clear stage timings, returning their final statistics
+    
+    Reading and clearing happen in one step, so samples recorded meanwhile
+    are either returned here or kept for the next read.
+    
+    Request Body (optional):
+    {
+        "prefix": "api.generate"   // Only stages starting with this (default: all)
+    }
+    
+    Response:
+    {
+        "success": true,
+        "stages": { ...same as GET /metrics... }
+    }
+    """
+    data = request.get_json(silent=True) or {}
+    return jsonify({
+        'success': True,
+        'stages': FORECAST_METRICS.summary(data.get('prefix', ''), reset=True)
+    }), 200
+
+
+@forecast_bp.route('/cache', methods=['GET'])
+def forecast_cache_stats():
+    """
+    Forecast cache hit/miss counters
+    
+    Response:
+    {
+        "success": true,
+        "cache": {"entries": 2, "max_entries": 16, "hits": 14, "misses": 2,
+                  "hit_rate": 0.875, "evictions": 0, "invalidations": 1}
+    }
+    """
+    return jsonify({
+        'success': True,
+        'cache': FORECAST_CACHE.stats()
+    }), 200
+
+
+@forecast_bp.route('/cache/invalidate', methods=['POST'])
+def invalidate_forecast_cache():
+    """
+    Drop cached forecasts (call after ingesting new sales data)
+    
+    Forecasts are also keyed by the sales file's content hash, so a changed
+    CSV is never served stale; this endpoint frees the old entries immediately.
+    
+    Response:
+    {
+        "success": true,
+        "message": "Forecast cache cleared"
+    }
+    """
+    FORECAST_CACHE.invalidate()
+    return jsonify({
+        'success': True,
+        'message': 'Forecast cache cleared'
+    }), 200
@@ -1,5 +1,5 @@
 from datetime import datetime, timedelta
-import numpy as np
+from ml_models.pricing_engine import compute_discounts
 
 FESTIVAL_DATES_2023 = {
     "Diwali": "2023-11-12",
@@ -80,6 +80,16 @@ def get_festival_calendar(year):
     return calendars.get(year, {})
 
 
+def _to_date(check_date):
+    if check_date is None:
+        return datetime.now().date()
+    if isinstance(check_date, str):
+        return datetime.strptime(check_date, '%Y-%m-%d').date()
+    if isinstance(check_date, datetime):
+        return check_date.date()
+    return check_date
+
+
 def get_discount_for_product(product_category, festival_discount_percent=0, flash_sale_discount_percent=0, check_date=None):
     """
     Returns the applicable discount percentage for a product based on current date/time
@@ -93,97 +103,40 @@ def get_discount_for_product(product_category, festival_discount_percent=0, flas
     Returns:
         float: Discount percentage (0 if no discount applies)
     """
-    if check_date is None:
-        check_date = datetime.now().date()
-    elif isinstance(check_date, str):
-        check_date = datetime.strptime(check_date, '%Y-%m-%d').date()
-    elif isinstance(check_date, datetime):
-        check_date = check_date.date()
-    
-    discount = 0.0
-    
-    # FESTIVAL PREP DISCOUNTS (1-2 days before Diwali, Christmas, Navratri)
-    festival_calendar = get_festival_calendar(check_date.year)
-    eligible_festivals = {"Diwali", "Christmas", "Navratri"}
-    
-    for fest_name, fest_date_str in festival_calendar.items():
-        if fest_name not in eligible_festivals:
-            continue
-        
-        try:
-            fest_date = datetime.strptime(fest_date_str, '%Y-%m-%d').date()
-            days_before = (fest_date - check_date).days
-            
-            # Apply discount 1-2 days before the festival
-            if 1 <= days_before <= 2:
-                if festival_discount_percent > 0:
-                    # Use the discount from database if available
-                    discount = max(discount, festival_discount_percent)
-                else:
-                    # Use default discount percentages
-                    if product_category in ["Snacks", "Beverages"]:
-                        discount = max(discount, 15.0)
-                    else:
-                        discount = max(discount, 10.0)
-        except Exception as e:
-            print(f"Error processing festival {fest_name}: {e}")
-            continue
-    
-    # EVERY 3rd WEDNESDAY FLASH SALE (category rotates by month)
-    if check_date.weekday() == 2:  # Wednesday = 2
-        week_of_month = (check_date.day - 1) // 7 + 1
-        
-        if week_of_month == 3:  # 3rd week
-            # Category rotation by month
-            month_category_map = {
-                1: "Beverages", 2: "Snacks", 3: "Personal Care", 4: "Dairy",
-                5: "Beverages", 6: "Snacks", 7: "Personal Care", 8: "Dairy",
-                9: "Beverages", 10: "Snacks", 11: "Personal Care", 12: "Dairy"
-            }
-            
-            if product_category == month_category_map.get(check_date.month):
-                if flash_sale_discount_percent > 0:
-                    # Use the discount from database if available
-                    discount = max(discount, flash_sale_discount_percent)
-                else:
-                    # Use default flash sale discount
-                    discount = max(discount, 12.0)
-                    
-    
-    day_of_week = check_date.weekday()
-    daily_category_map = {
-        0: "Dairy", 1: "Beverages", 2: "Snacks", 3: "Personal Care",
-        4: "Staples", 5: "Snacks", 6: "Beverages"
-    }
-    if product_category == daily_category_map.get(day_of_week):
-        discount = max(discount, np.random.choice([2.0, 2.25, 2.5, 2.75, 3.0, 3.25, 3.5]))
-    
-    return discount
+    discount = compute_discounts(
+        _to_date(check_date), [product_category],
+        festival_discount_percent=festival_discount_percent or 0,
+        flash_sale_discount_percent=flash_sale_discount_percent or 0,
+        calendar_for_year=get_festival_calendar
+    )
+    return float(discount[0])
 
 
-def apply_discount_to_products(products):
+def apply_discount_to_products(products, check_date=None):
     """
     Apply dynamic discounts to a list of products based on current date
     
     Args:
         products: List of product dictionaries
+        check_date: Date to check (defaults to today)
     
     Returns:
         List of products with active_discount field added
     """
-    for product in products:
-        category = product.get('category', '')
-        festival_discount = product.get('festival_discount_percent', 0) or 0
-        flash_sale_discount = product.get('flash_sale_discount_percent', 0) or 0
-        
-        # Calculate active discount
-        active_discount = get_discount_for_product(
-            category, 
-            festival_discount, 
-            flash_sale_discount
-        )
-        
-        product['active_discount'] = active_discount
+    if not products:
+        return products
+    
+    # One pricing call for the whole list
+    discounts = compute_discounts(
+        _to_date(check_date),
+        [product.get('category', '') or '' for product in products],
+        festival_discount_percent=[product.get('festival_discount_percent', 0) or 0 for product in products],
+        flash_sale_discount_percent=[product.get('flash_sale_discount_percent', 0) or 0 for product in products],
+        calendar_for_year=get_festival_calendar
+    )
+    
+    for product, active_discount in zip(products, discounts):
+        product['active_discount'] = float(active_discount)
     
     return products
 
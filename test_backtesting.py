@@ -0,0 +1,114 @@
+"""
+Test Script for Rolling-Origin Backtesting
+Validates that a cutoff forecast matches a forecast on data ending at the
+cutoff, and that parallel backtests and their WAPE/bias tables are consistent
+"""
+
+import sys
+import os
+import tempfile
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+import pandas as pd
+from backend.ml_models.synthetic_data import generate_sales_data
+from backend.ml_models.feature_store import isolated_caches, load_features
+from backend.ml_models.forecast_engine import load_models, generate_forecast
+from backend.ml_models.save_trained_models import train_models
+from backend.ml_models.backtesting import (
+    select_cutoffs, forecast_at_cutoff, error_table, run_backtest, HISTORY_COLUMNS
+)
+
+
+def _write_history(work_dir, end_date='2025-11-14', train_end=None):
+    """Synthetic sales CSV, plus small models trained on the data up to train_end"""
+    df = generate_sales_data(num_skus=5, years=0.4, end_date=end_date, seed=4)
+    csv_path = os.path.join(work_dir, 'sales.csv')
+    df.to_csv(csv_path, index=False)
+
+    train_csv = os.path.join(work_dir, 'train.csv')
+    df[pd.to_datetime(df['sale_date']) <= pd.Timestamp(train_end or end_date)].to_csv(train_csv, index=False)
+    model_dir = os.path.join(work_dir, 'saved_models')
+    train_models(train_csv, model_dir, cores=1, num_boost_round=15)
+    return csv_path, model_dir
+
+
+def test_cutoff_forecast_matches_truncated_data():
+    """Masking the history at a cutoff equals forecasting from a CSV ending there"""
+
+    print("\n" + "="*80)
+    print("TEST 1: Cutoff Forecast vs Truncated Data")
+    print("="*80)
+
+    cutoffs = select_cutoffs('2025-01-01', '2025-03-31', num_cutoffs=20, step_days=14, horizon=7)
+    assert cutoffs[-1] == pd.Timestamp('2025-03-24') and cutoffs[0] >= pd.Timestamp('2025-01-30')
+    assert all(np.diff(cutoffs) == pd.Timedelta(days=14))
+
+    scored = pd.DataFrame({'category': ['A', 'A', 'B'], 'forecast': [8, 12, 0], 'actual': [10, 10, 0]})
+    table = error_table(scored, 'category')
+    assert table['wape'].iloc[0] == 20 and table['bias'].iloc[0] == 0 and np.isnan(table['wape'].iloc[1])
+    assert error_table(scored).iloc[0]['mae'] == 4 / 3
+
+    with tempfile.TemporaryDirectory() as work_dir, isolated_caches(work_dir):
+        csv_path, model_dir = _write_history(work_dir)
+        models = load_models(model_dir)
+        history = load_features(csv_path)[HISTORY_COLUMNS]
+
+        cutoff = pd.Timestamp('2025-10-20')
+        forecast = forecast_at_cutoff(history, cutoff, models, horizon=5)
+
+        raw = pd.read_csv(csv_path)
+        truncated_csv = os.path.join(work_dir, 'truncated.csv')
+        raw[pd.to_datetime(raw['sale_date']) <= cutoff].to_csv(truncated_csv, index=False)
+        expected = generate_forecast(truncated_csv, 5, models=models)
+
+        print(forecast.head().to_string())
+        assert len(forecast) == 5 * 5 and forecast['sale_date'].min() == cutoff + pd.Timedelta(days=1)
+        assert (forecast['product_name'].to_numpy() == expected['product_name'].to_numpy()).all()
+        assert (forecast['predicted_quantity'].to_numpy() == expected['predicted_quantity'].to_numpy()).all()
+
+    print("\n✅ Test 1 PASSED!\n")
+
+
+def test_parallel_backtest_tables():
+    """Worker processes reproduce the in-process backtest; tables add up"""
+
+    print("\n" + "="*80)
+    print("TEST 2: Parallel Backtest and Error Tables")
+    print("="*80)
+
+    with tempfile.TemporaryDirectory() as work_dir, isolated_caches(work_dir):
+        csv_path, model_dir = _write_history(work_dir, train_end='2025-10-31')
+
+        results = {
+            workers: run_backtest(csv_path, model_dir, num_cutoffs=4, step_days=7, horizon=7, workers=workers)
+            for workers in (1, 2)
+        }
+        pd.testing.assert_frame_equal(results[1]['predictions'], results[2]['predictions'])
+        result = results[2]
+        assert result['workers'] == 2
+
+        print(result['by_cutoff'].to_string(index=False))
+        print(result['by_category'].to_string(index=False))
+        predictions = result['predictions']
+        assert len(predictions) == 4 * 7 * 5
+        assert predictions['horizon_day'].between(1, 7).all()
+
+        overall = result['overall']
+        expected_wape = (predictions['forecast'] - predictions['actual']).abs().sum() / predictions['actual'].sum() * 100
+        assert np.isclose(overall['wape'], expected_wape)
+        for name in ('by_cutoff', 'by_horizon_day', 'by_category', 'by_product'):
+            assert result[name]['rows'].sum() == overall['rows']
+            assert np.isclose(result[name]['abs_error'].sum(), overall['abs_error'])
+
+        # Models saw data up to 2025-10-31: earlier cutoffs are in-sample
+        cutoffs = result['by_cutoff']
+        assert cutoffs['in_training'].tolist() == list(cutoffs['cutoff'] < pd.Timestamp('2025-10-31'))
+        assert cutoffs['in_training'].any() and not cutoffs['in_training'].all()
+
+    print("\n✅ Test 2 PASSED!\n")
+
+
+if __name__ == "__main__":
+    test_cutoff_forecast_matches_truncated_data()
+    test_parallel_backtest_tables()
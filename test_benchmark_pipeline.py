@@ -0,0 +1,117 @@
+"""
+Test Script for the Synthetic Data Generator and Pipeline Benchmarks
+Validates the CSV schema of generated data, benchmark result comparison
+and stage time limits
+"""
+
+import sys
+import os
+import copy
+import tempfile
+import time
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pandas as pd
+from backend.ml_models.synthetic_data import generate_sales_data, SALES_COLUMNS
+from backend.ml_models.benchmark_pipeline import (
+    run_benchmarks, save_results, load_results, compare_results, measure, StageTimeout
+)
+
+CSV_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'kirana_sales_data_v2.3_production_discount.csv')
+
+
+def test_synthetic_data_matches_schema():
+    """Generated data has the production columns, one row per SKU per day"""
+
+    print("\n" + "="*80)
+    print("TEST 1: Synthetic Data Schema")
+    print("="*80)
+
+    real_columns = list(pd.read_csv(CSV_PATH, nrows=1).columns)
+    df = generate_sales_data(num_skus=12, years=1.0, seed=3)
+    print(df.head(3).to_string())
+
+    assert list(df.columns) == real_columns == SALES_COLUMNS
+    assert len(df) == 12 * 365 and df['product_name'].nunique() == 12
+    assert (df['quantity_sold'] >= 0).all()
+    assert (df['final_price'] <= df['price']).all()
+    assert df['is_festival'].sum() > 0 and set(df.loc[df['is_festival'] == 1, 'festival_name']) != {''}
+
+    # Deterministic per seed; festivals can be switched off
+    assert df.equals(generate_sales_data(num_skus=12, years=1.0, seed=3))
+    assert generate_sales_data(num_skus=12, years=1.0, seed=3, festival_impacts={})['is_festival'].sum() == 0
+
+    print("\n✅ Test 1 PASSED!\n")
+
+
+def test_benchmark_results_compare():
+    """A small benchmark run is stored per commit and compared stage by stage"""
+
+    print("\n" + "="*80)
+    print("TEST 2: Benchmark Run and Comparison")
+    print("="*80)
+
+    results = run_benchmarks(sku_counts=[8], use_models=False, years=0.2)
+    stages = [s['stage'] for s in results['scales'][0]['stages']]
+    assert stages == ['read_sales_csv', 'create_features', 'generate_future_dates', 'prepare_future_features_with_lags']
+    assert all(s['seconds'] > 0 and s['status'] == 'ok' for s in results['scales'][0]['stages'])
+    assert results['complete']
+
+    with tempfile.TemporaryDirectory() as results_dir:
+        path = save_results(results, results_dir)
+        assert os.path.basename(path) == f"{results['commit']}.json"
+        baseline = load_results(results['commit'], results_dir)
+
+    slower = copy.deepcopy(baseline)
+    slower['scales'][0]['stages'][1]['seconds'] *= 2
+    table = compare_results(baseline, slower)
+    print(table.to_string(index=False))
+    assert table['regression'].tolist() == [False, True, False, False]
+
+    print("\n✅ Test 2 PASSED!\n")
+
+
+def test_stage_time_limit():
+    """Stages over the limit are recorded as timed out, dependents skipped, each scale saved"""
+
+    print("\n" + "="*80)
+    print("TEST 3: Stage Time Limit")
+    print("="*80)
+
+    started = time.perf_counter()
+    try:
+        measure(lambda: time.sleep(5), repeat=2, time_limit=0.2)
+        raise AssertionError("Stage should have timed out")
+    except StageTimeout:
+        pass
+    assert time.perf_counter() - started < 2
+
+    with tempfile.TemporaryDirectory() as results_dir:
+        saved = []
+
+        def save(partial):
+            path = save_results(partial, results_dir)
+            saved.append((len(load_results(path)['scales']), load_results(path)['complete']))
+
+        results = run_benchmarks(sku_counts=[9, 8], use_models=False, years=0.2,
+                                 stage_time_limit=1e-4, on_scale=save)
+        assert saved == [(1, False), (2, True)]
+
+    statuses = [s['status'] for s in results['scales'][0]['stages']]
+    print(f"Stage statuses: {statuses}")
+    assert statuses[0] == 'timed_out' and set(statuses[1:]) == {'skipped'}
+    assert results['scales'][0]['stages'][0]['seconds'] is None
+
+    # A stage that no longer finishes is a regression
+    baseline = run_benchmarks(sku_counts=[8], use_models=False, years=0.2)
+    table = compare_results(baseline, {**results, 'scales': results['scales'][:1]})
+    print(table.to_string(index=False))
+    assert table['regression'].all()
+
+    print("\n✅ Test 3 PASSED!\n")
+
+
+if __name__ == "__main__":
+    test_synthetic_data_matches_schema()
+    test_benchmark_results_compare()
+    test_stage_time_limit()
@@ -0,0 +1,109 @@
+"""
+Test Script for Typed Sales History Loader
+Validates schema dtypes, the binary cache and parity with the plain CSV read
+"""
+
+import sys
+import os
+import tempfile
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pandas as pd
+from backend.ml_models import data_loader
+from backend.ml_models.data_loader import read_sales_csv, to_plain_frame
+from backend.ml_models.data_manifest import write_data_manifest, read_data_manifest
+
+
+def _write_sales_csv(path):
+    """Small CSV with the production column layout"""
+    records = []
+    for date in pd.date_range('2025-10-01', periods=10):
+        for product_id, (name, category) in enumerate([('Amul Milk 1L', 'Dairy'), ('Lays Chips 50g', 'Snacks')], start=1):
+            records.append({
+                'sale_date': date.strftime('%Y-%m-%d'), 'product_id': product_id,
+                'product_name': name, 'category': category, 'season_affinity': 'all',
+                'price': 50 if product_id == 1 else 49.5, 'cost_price': 35, 'quantity_sold': 10 + product_id,
+                'discount_percent': 3.25, 'final_price': 48.38, 'revenue': 532.18, 'profit': 146.18,
+                'day_of_week': date.dayofweek, 'is_weekend': int(date.dayofweek >= 5),
+                'month': date.month, 'year': date.year, 'is_festival': 0,
+                'festival_name': 'Diwali' if date.day == 5 else ''
+            })
+    pd.DataFrame(records).to_csv(path, index=False)
+
+
+def test_typed_load_and_cache():
+    """Typed columns, cached reload and identical values to a plain read"""
+
+    print("\n" + "="*80)
+    print("TEST 1: Typed Load and Binary Cache")
+    print("="*80)
+
+    original_cache_dir = data_loader.SALES_CACHE_DIR
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        csv_path = os.path.join(tmp_dir, 'sales.csv')
+        _write_sales_csv(csv_path)
+        data_loader.SALES_CACHE_DIR = os.path.join(tmp_dir, 'cache')
+
+        df = read_sales_csv(csv_path)
+        assert isinstance(df['product_name'].dtype, pd.CategoricalDtype)
+        assert df['quantity_sold'].dtype == 'int32' and df['is_festival'].dtype == 'int8'
+        assert df['final_price'].dtype == 'float64' and df['price'].dtype == 'float64'
+        assert df['price'].max() == 50 and df['price'].min() == 49.5
+        assert pd.api.types.is_datetime64_any_dtype(df['sale_date'])
+        assert len(os.listdir(data_loader.SALES_CACHE_DIR)) == 1
+
+        cached = read_sales_csv(csv_path)
+        pd.testing.assert_frame_equal(df, cached)
+
+        plain = pd.read_csv(csv_path)
+        plain['sale_date'] = pd.to_datetime(plain['sale_date'])
+        plain = plain.sort_values('sale_date').reset_index(drop=True)
+        typed = to_plain_frame(cached)
+        for col in plain.columns:
+            assert (plain[col].fillna('').astype(str) == typed[col].fillna('').astype(str)).all() or \
+                (plain[col] == typed[col]).all(), f"{col} mismatch"
+
+    data_loader.SALES_CACHE_DIR = original_cache_dir
+
+    print("\n✅ Test 1 PASSED!\n")
+
+
+def test_data_manifest_tracks_changes():
+    """Manifest records the data summary and turns stale when the CSV changes"""
+
+    print("\n" + "="*80)
+    print("TEST 2: Data Manifest")
+    print("="*80)
+
+    original_cache_dir = data_loader.SALES_CACHE_DIR
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        csv_path = os.path.join(tmp_dir, 'sales.csv')
+        manifest_dir = os.path.join(tmp_dir, 'manifests')
+        data_loader.SALES_CACHE_DIR = os.path.join(tmp_dir, 'cache')
+        _write_sales_csv(csv_path)
+
+        assert read_data_manifest(csv_path, manifest_dir) is None
+
+        write_data_manifest(csv_path, read_sales_csv(csv_path, use_cache=False), manifest_dir)
+        manifest = read_data_manifest(csv_path, manifest_dir)
+        assert manifest['last_date'] == '2025-10-10' and manifest['first_date'] == '2025-10-01'
+        assert manifest['row_count'] == 20 and manifest['product_count'] == 2
+        assert len(manifest['content_hash']) == 64 and not manifest['stale']
+
+        with open(csv_path, 'a') as f:
+            f.write(open(csv_path).read().splitlines()[-1].replace('2025-10-10', '2025-10-11') + '\n')
+        assert read_data_manifest(csv_path, manifest_dir)['stale']
+
+        write_data_manifest(csv_path, manifest_dir=manifest_dir)
+        manifest = read_data_manifest(csv_path, manifest_dir)
+        assert manifest['last_date'] == '2025-10-11' and manifest['row_count'] == 21
+        assert not manifest['stale']
+
+    data_loader.SALES_CACHE_DIR = original_cache_dir
+
+    print("\n✅ Test 2 PASSED!\n")
+
+
+if __name__ == "__main__":
+    test_typed_load_and_cache()
+    test_data_manifest_tracks_changes()
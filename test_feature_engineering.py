@@ -0,0 +1,162 @@
+"""
+Test Script for Feature Engineering
+Validates the rolling kernel, panel input and incremental features
+"""
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pandas as pd
+import numpy as np
+from backend.ml_models.feature_engineering import (
+    create_features,
+    build_feature_state,
+    create_features_incremental
+)
+from backend.ml_models.rolling_stats import rolling_window_stats
+from backend.ml_models.sales_panel import SalesPanel
+
+
+def _mock_sales(num_days=60, seed=3):
+    """Build a small daily sales history for three products"""
+    rng = np.random.default_rng(seed)
+    products = [
+        ('Amul Milk 1L', 'Dairy', 'all', 50, 35),
+        ('Amul Butter 100g', 'Dairy', 'all', 60, 42),
+        ('Lays Chips 50g', 'Snacks', 'summer', 20, 14),
+    ]
+    records = []
+    for date in pd.date_range('2025-08-01', periods=num_days):
+        for product_id, (name, category, season, price, cost) in enumerate(products, start=1):
+            discount = float(rng.choice([0.0, 0.0, 2.5, 12.0]))
+            records.append({
+                'sale_date': date,
+                'product_id': product_id,
+                'product_name': name,
+                'category': category,
+                'season_affinity': season,
+                'price': price,
+                'cost_price': cost,
+                'quantity_sold': int(rng.integers(0, 60)),
+                'discount_percent': discount,
+                'final_price': round(price * (1 - discount / 100), 2),
+                'is_festival': int(rng.random() < 0.1),
+            })
+    return pd.DataFrame(records)
+
+
+def test_rolling_kernel_matches_pandas():
+    """Single-pass rolling stats should equal per-product pandas rolling windows"""
+
+    print("\n" + "="*80)
+    print("TEST 1: Rolling Kernel vs Pandas")
+    print("="*80)
+
+    df = _mock_sales(num_days=45)
+    codes, _ = pd.factorize(df['product_name'])
+    result = rolling_window_stats(df['quantity_sold'].to_numpy(dtype=float), codes, windows=[3, 7, 30])
+
+    grouped = df.groupby('product_name')['quantity_sold']
+    for window in [3, 7, 30]:
+        expected = {
+            'mean': grouped.transform(lambda x: x.rolling(window, min_periods=1).mean()),
+            'std': grouped.transform(lambda x: x.rolling(window, min_periods=1).std()),
+            'min': grouped.transform(lambda x: x.rolling(window, min_periods=1).min()),
+            'max': grouped.transform(lambda x: x.rolling(window, min_periods=1).max()),
+            'median': grouped.transform(lambda x: x.rolling(window, min_periods=1).median()),
+            'q25': grouped.transform(lambda x: x.rolling(window, min_periods=1).quantile(0.25)),
+            'q75': grouped.transform(lambda x: x.rolling(window, min_periods=1).quantile(0.75)),
+        }
+        for stat, values in expected.items():
+            assert np.allclose(result[f'rolling_{stat}_{window}'], values, equal_nan=True), f"rolling_{stat}_{window} mismatch"
+
+    print("\n✅ Test 1 PASSED!\n")
+
+
+def test_incremental_matches_full_rebuild():
+    """Features for appended days should equal a full create_features run"""
+
+    print("\n" + "="*80)
+    print("TEST 2: Incremental Features vs Full Rebuild")
+    print("="*80)
+
+    df = _mock_sales()
+    cutoff = df['sale_date'].max() - pd.Timedelta(days=5)
+    history = df[df['sale_date'] <= cutoff]
+    new_rows = df[df['sale_date'] > cutoff]
+
+    full = create_features(df).loc[new_rows.index]
+    state = build_feature_state(history)
+    incremental, new_state = create_features_incremental(new_rows, state)
+
+    numeric_cols = [col for col in full.columns if pd.api.types.is_numeric_dtype(full[col])]
+    mismatched = [
+        col for col in numeric_cols
+        if not np.allclose(full[col].astype(float), incremental[col].astype(float), equal_nan=True)
+    ]
+    print(f"Compared {len(numeric_cols)} numeric features for {len(new_rows)} new rows")
+    assert not mismatched, f"Mismatched features: {mismatched}"
+
+    # State now covers the appended days and keeps a bounded tail
+    assert new_state['last_date'] == df['sale_date'].max()
+    assert new_state['tail'].groupby('product_name').size().max() <= 30
+
+    print("\n✅ Test 2 PASSED!\n")
+
+
+def test_incremental_rejects_old_rows():
+    """Rows already folded into the state must not be appended again"""
+
+    print("\n" + "="*80)
+    print("TEST 3: Incremental Features Reject Old Rows")
+    print("="*80)
+
+    df = _mock_sales(num_days=20)
+    state = build_feature_state(df)
+
+    try:
+        create_features_incremental(df.tail(3), state)
+    except ValueError:
+        print("\n✅ Test 3 PASSED!\n")
+        return
+    raise AssertionError("Expected ValueError for rows already in the state")
+
+
+def test_panel_lags_use_calendar_days():
+    """A SalesPanel gives the same features on complete data and calendar lags across gaps"""
+
+    print("\n" + "="*80)
+    print("TEST 4: SalesPanel Input to create_features")
+    print("="*80)
+
+    df = _mock_sales(num_days=40)
+    key = ['product_name', 'sale_date']
+
+    from_frame = create_features(df).sort_values(key).reset_index(drop=True)
+    from_panel = create_features(SalesPanel.from_frame(df)).sort_values(key).reset_index(drop=True)
+    for col in ['lag_1', 'lag_7', 'rolling_mean_7', 'rolling_q75_30', 'ewm_7', 'product_encoded', 'same_dow_mean_4w']:
+        assert np.allclose(from_frame[col], from_panel[col], equal_nan=True), f"{col} mismatch"
+
+    # Drop one day of milk sales: the next day's lag_1 is a missing calendar day
+    gap_date = df['sale_date'].min() + pd.Timedelta(days=20)
+    milk = df['product_name'] == 'Amul Milk 1L'
+    with_gap = df[~(milk & (df['sale_date'] == gap_date))]
+    features = create_features(SalesPanel.from_frame(with_gap))
+    after_gap = features[(features['product_name'] == 'Amul Milk 1L') &
+                         (features['sale_date'] == gap_date + pd.Timedelta(days=1))].iloc[0]
+    expected_lag_2 = df.loc[milk & (df['sale_date'] == gap_date - pd.Timedelta(days=1)), 'quantity_sold'].iloc[0]
+
+    assert np.isnan(after_gap['lag_1']), "lag_1 should point at the missing day"
+    assert after_gap['lag_3'] == df.loc[milk & (df['sale_date'] == gap_date - pd.Timedelta(days=2)), 'quantity_sold'].iloc[0]
+    assert len(features) == len(with_gap)
+    print(f"Day before gap sold {expected_lag_2}; lag_1 after gap is NaN")
+
+    print("\n✅ Test 4 PASSED!\n")
+
+
+if __name__ == "__main__":
+    test_rolling_kernel_matches_pandas()
+    test_incremental_matches_full_rebuild()
+    test_incremental_rejects_old_rows()
+    test_panel_lags_use_calendar_days()
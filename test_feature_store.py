@@ -0,0 +1,146 @@
+"""
+Test Script for the Feature Store
+Validates that snapshots round-trip exactly, are invalidated by new data or
+a new feature version, and that a corrupt snapshot is rebuilt
+"""
+
+import sys
+import os
+import tempfile
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pandas as pd
+from backend.ml_models import feature_store
+from backend.ml_models.feature_store import load_features, get_feature_key, store_features, isolated_caches
+
+SALES_CSV = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'kirana_sales_data_v2.3_production_discount.csv')
+
+
+class _CountingBuilds:
+    """Wraps feature_store.create_features to count feature rebuilds"""
+
+    def __init__(self):
+        self.calls = 0
+        self.create_features = feature_store.create_features
+
+    def __call__(self, df):
+        self.calls += 1
+        return self.create_features(df)
+
+    def __enter__(self):
+        feature_store.create_features = self
+        return self
+
+    def __exit__(self, *exc):
+        feature_store.create_features = self.create_features
+
+
+def _write_history(work_dir):
+    """Last 75 days of three products from the production CSV"""
+    df = pd.read_csv(SALES_CSV)
+    df = df[df['product_id'].isin([1, 2, 3])]
+    df = df[pd.to_datetime(df['sale_date']) > pd.to_datetime(df['sale_date']).max() - pd.Timedelta(days=75)]
+    csv_path = os.path.join(work_dir, 'sales.csv')
+    df.to_csv(csv_path, index=False)
+    return csv_path
+
+
+def _snapshots():
+    return sorted(os.listdir(feature_store.FEATURE_STORE_DIR))
+
+
+def test_snapshot_round_trip():
+    """A stored snapshot reads back identical to the features it was built from"""
+
+    print("\n" + "="*80)
+    print("TEST 1: Snapshot Round Trip")
+    print("="*80)
+
+    with tempfile.TemporaryDirectory() as work_dir, isolated_caches(work_dir), _CountingBuilds() as builds:
+        csv_path = _write_history(work_dir)
+
+        built = load_features(csv_path)
+        cached = load_features(csv_path)
+        assert builds.calls == 1 and len(_snapshots()) == 1
+        pd.testing.assert_frame_equal(built, cached)
+
+        # Features stored from outside (e.g. the benchmark) are served as-is
+        os.remove(os.path.join(feature_store.FEATURE_STORE_DIR, _snapshots()[0]))
+        assert store_features(csv_path, built) == get_feature_key(csv_path)
+        pd.testing.assert_frame_equal(load_features(csv_path), built)
+        assert builds.calls == 1
+        print(f"{len(built):,} feature rows round-tripped through {_snapshots()[0]}")
+
+    print("\n✅ Test 1 PASSED!\n")
+
+
+def test_snapshot_invalidation():
+    """Changed CSV content or a new FEATURE_VERSION builds a new snapshot"""
+
+    print("\n" + "="*80)
+    print("TEST 2: Snapshot Invalidation")
+    print("="*80)
+
+    feature_version = feature_store.FEATURE_VERSION
+    try:
+        with tempfile.TemporaryDirectory() as work_dir, isolated_caches(work_dir), _CountingBuilds() as builds:
+            csv_path = _write_history(work_dir)
+            original = load_features(csv_path)
+            key = get_feature_key(csv_path)
+
+            # Same content rewritten: same key, no rebuild
+            pd.read_csv(csv_path).to_csv(csv_path, index=False)
+            assert get_feature_key(csv_path) == key
+            load_features(csv_path)
+            assert builds.calls == 1
+
+            # One more day of sales: new key and a rebuild that includes it
+            df = pd.read_csv(csv_path)
+            last_day = df[df['sale_date'] == df['sale_date'].max()].copy()
+            last_day['sale_date'] = (pd.Timestamp(last_day['sale_date'].iloc[0]) + pd.Timedelta(days=1)).strftime('%Y-%m-%d')
+            pd.concat([df, last_day]).to_csv(csv_path, index=False)
+            assert get_feature_key(csv_path) != key
+            updated = load_features(csv_path)
+            assert builds.calls == 2 and len(updated) == len(original) + len(last_day)
+
+            # New feature code version: same data, rebuilt
+            feature_store.FEATURE_VERSION = feature_version + 1
+            load_features(csv_path)
+            assert builds.calls == 3 and len(_snapshots()) == 3
+            print(f"Snapshots: {_snapshots()}")
+    finally:
+        feature_store.FEATURE_VERSION = feature_version
+
+    print("\n✅ Test 2 PASSED!\n")
+
+
+def test_corrupt_snapshot_rebuilds():
+    """An unreadable snapshot falls back to building the features again"""
+
+    print("\n" + "="*80)
+    print("TEST 3: Corrupt Snapshot")
+    print("="*80)
+
+    with tempfile.TemporaryDirectory() as work_dir, isolated_caches(work_dir), _CountingBuilds() as builds:
+        csv_path = _write_history(work_dir)
+        built = load_features(csv_path)
+
+        snapshot_path = os.path.join(feature_store.FEATURE_STORE_DIR, _snapshots()[0])
+        with open(snapshot_path, 'wb') as f:
+            f.write(b'not a feather file')
+
+        rebuilt = load_features(csv_path)
+        assert builds.calls == 2
+        pd.testing.assert_frame_equal(rebuilt, built)
+
+        # The rebuild replaced the corrupt file
+        pd.testing.assert_frame_equal(load_features(csv_path), built)
+        assert builds.calls == 2
+
+    print("\n✅ Test 3 PASSED!\n")
+
+
+if __name__ == "__main__":
+    test_snapshot_round_trip()
+    test_snapshot_invalidation()
+    test_corrupt_snapshot_rebuilds()
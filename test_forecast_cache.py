@@ -0,0 +1,90 @@
+"""
+Test Script for Forecast Result Cache
+Validates LRU eviction, counters, invalidation and single computation per key
+"""
+
+import sys
+import os
+import threading
+import time
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pandas as pd
+from backend.ml_models.forecast_cache import ForecastCache
+
+
+def _forecast(num_days):
+    return pd.DataFrame({'predicted_quantity': list(range(num_days))})
+
+
+def test_lru_eviction_and_invalidation():
+    """Least recently used forecasts are evicted, invalidation empties the cache"""
+
+    print("\n" + "="*80)
+    print("TEST 1: LRU Eviction and Invalidation")
+    print("="*80)
+
+    cache = ForecastCache(max_entries=2)
+    calls = []
+
+    def compute(num_days):
+        calls.append(num_days)
+        return _forecast(num_days)
+
+    for num_days in [7, 14, 7, 30, 7, 14]:
+        cache.get_or_compute(('data', 'models', num_days), lambda: compute(num_days))
+
+    # 14 was evicted by 30 (7 was used more recently), so it is computed again
+    assert calls == [7, 14, 30, 14], calls
+    stats = cache.stats()
+    assert stats['hits'] == 2 and stats['misses'] == 4
+    assert stats['evictions'] == 2 and stats['entries'] == 2
+
+    # Returned frames are copies: callers cannot corrupt the cached forecast
+    served = cache.get_or_compute(('data', 'models', 7), lambda: compute(7))
+    served['predicted_quantity'] = -1
+    assert (cache.get_or_compute(('data', 'models', 7), lambda: compute(7))['predicted_quantity'] >= 0).all()
+
+    cache.invalidate()
+    cache.get_or_compute(('data', 'models', 7), lambda: compute(7))
+    assert calls[-1] == 7 and cache.stats()['invalidations'] == 1
+    print(f"Stats: {cache.stats()}")
+
+    print("\n✅ Test 1 PASSED!\n")
+
+
+def test_concurrent_requests_compute_once():
+    """Simultaneous requests for the same forecast share one computation"""
+
+    print("\n" + "="*80)
+    print("TEST 2: Concurrent Requests Compute Once")
+    print("="*80)
+
+    cache = ForecastCache()
+    calls = []
+
+    def slow_compute():
+        calls.append(1)
+        time.sleep(0.2)
+        return _forecast(7)
+
+    results = []
+    threads = [
+        threading.Thread(target=lambda: results.append(cache.get_or_compute(('data', 'models', 7), slow_compute)))
+        for _ in range(5)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(calls) == 1, f"Expected one computation, got {len(calls)}"
+    assert len(results) == 5 and all(len(result) == 7 for result in results)
+    assert cache.stats()['misses'] == 1 and cache.stats()['hits'] == 4
+
+    print("\n✅ Test 2 PASSED!\n")
+
+
+if __name__ == "__main__":
+    test_lru_eviction_and_invalidation()
+    test_concurrent_requests_compute_once()
@@ -0,0 +1,332 @@
+"""
+Test Script for Future Feature Preparation
+Validates lag/rolling features built for the forecast horizon
+"""
+
+import sys
+import os
+import tempfile
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pandas as pd
+import numpy as np
+from backend.ml_models.forecast_engine import (
+    prepare_future_features_with_lags, predict_recursive, generate_future_dates,
+    filter_history, compute_category_stats, UnknownFilterError
+)
+from backend.ml_models.feature_engineering import detect_festival_for_date, calculate_discount_for_date
+from backend.ml_models.inventory_reorder import calculate_reorder_recommendations
+from backend.ml_models.sales_panel import SalesPanel
+from backend.ml_models.synthetic_data import generate_sales_data
+from backend.ml_models.feature_store import isolated_caches
+from backend.ml_models.forecast_engine import generate_forecast
+
+
+def _mock_history(quantities_by_product, start='2025-10-01'):
+    """Build a minimal historical frame from {product: [quantities]}"""
+    records = []
+    for product, quantities in quantities_by_product.items():
+        for i, qty in enumerate(quantities):
+            records.append({
+                'sale_date': pd.Timestamp(start) + pd.Timedelta(days=i),
+                'product_name': product,
+                'category': 'Snacks',
+                'quantity_sold': qty
+            })
+    return pd.DataFrame(records)
+
+
+def _mock_future(products, num_days=3, start='2025-12-01'):
+    """Build a minimal future frame for the given products"""
+    records = []
+    for product in products:
+        for date in pd.date_range(start, periods=num_days):
+            records.append({
+                'sale_date': date,
+                'product_name': product,
+                'category': 'Snacks',
+                'season_affinity': 'all',
+                'price': 20.0,
+                'cost_price': 15.0,
+                'discount_percent': 0.0,
+                'final_price': 20.0,
+                'is_festival': 0,
+                'festival_name': '',
+                'days_to_festival': 999,
+                'day_of_week': date.dayofweek,
+                'month': date.month,
+                'year': date.year,
+                'is_weekend': int(date.dayofweek >= 5),
+                'quantity_sold': 0
+            })
+    return pd.DataFrame(records)
+
+
+def test_lag_and_rolling_features():
+    """Lags and rolling stats should match the last observed history"""
+
+    print("\n" + "="*80)
+    print("TEST 1: Lag and Rolling Features (Full History)")
+    print("="*80)
+
+    rng = np.random.default_rng(7)
+    long_history = rng.integers(5, 60, size=45).tolist()
+    historical_df = _mock_history({'Lays Chips 50g': long_history})
+    future_df = _mock_future(['Lays Chips 50g'])
+
+    result = prepare_future_features_with_lags(future_df, historical_df)
+    last_values = np.array(long_history[-30:], dtype=float)
+
+    for lag in [1, 3, 7, 14, 21, 30]:
+        assert (result[f'lag_{lag}'] == last_values[-lag]).all(), f"lag_{lag} mismatch"
+
+    for window in [3, 7, 14, 30]:
+        window_values = last_values[-window:]
+        assert np.allclose(result[f'rolling_mean_{window}'], np.mean(window_values))
+        assert np.allclose(result[f'rolling_std_{window}'], np.std(window_values))
+        assert np.allclose(result[f'rolling_median_{window}'], np.median(window_values))
+        assert np.allclose(result[f'rolling_q25_{window}'], np.percentile(window_values, 25))
+        assert np.allclose(result[f'rolling_q75_{window}'], np.percentile(window_values, 75))
+
+    print("\n✅ Test 1 PASSED!\n")
+
+
+def test_short_history_fallbacks():
+    """Products with short history fall back to the available values"""
+
+    print("\n" + "="*80)
+    print("TEST 2: Short History Fallbacks")
+    print("="*80)
+
+    historical_df = _mock_history({
+        'New Product': [4, 8, 6, 10, 2],
+        'Lays Chips 50g': list(range(1, 41))
+    })
+    future_df = _mock_future(['New Product', 'Lays Chips 50g'])
+
+    result = prepare_future_features_with_lags(future_df, historical_df)
+    new_product = result[result['product_name'] == 'New Product'].iloc[0]
+
+    # Missing lags are zero-filled, differences use the fallback chain
+    assert new_product['lag_1'] == 2
+    assert new_product['lag_3'] == 6
+    assert new_product['lag_7'] == 0
+    assert new_product['lag_diff_7_1'] == 0
+
+    # Windows wider than the history use all values, quantiles use min/max
+    assert new_product['rolling_mean_7'] == np.mean([4, 8, 6, 10, 2])
+    assert new_product['rolling_q25_7'] == 2
+    assert new_product['rolling_q75_7'] == 10
+    assert new_product['rolling_q25_3'] == np.percentile([6, 10, 2], 25)
+
+    print("\n✅ Test 2 PASSED!\n")
+
+
+def test_panel_inputs_match_frames():
+    """Forecast features and reorder plans accept SalesPanel inputs"""
+
+    print("\n" + "="*80)
+    print("TEST 3: SalesPanel Inputs")
+    print("="*80)
+
+    rng = np.random.default_rng(11)
+    historical_df = _mock_history({
+        'Amul Milk 1L': rng.integers(20, 60, size=40).tolist(),
+        'Lays Chips 50g': rng.integers(5, 30, size=40).tolist()
+    })
+    future_df = _mock_future(['Amul Milk 1L', 'Lays Chips 50g'], num_days=7)
+
+    from_frame = prepare_future_features_with_lags(future_df, historical_df)
+    from_panel = prepare_future_features_with_lags(future_df, SalesPanel.from_frame(historical_df))
+    numeric_cols = [col for col in from_frame.columns if pd.api.types.is_numeric_dtype(from_frame[col])]
+    for col in numeric_cols:
+        assert np.allclose(from_frame[col], from_panel[col]), f"{col} mismatch"
+
+    forecast_df = future_df[['sale_date', 'product_name', 'category']].copy()
+    forecast_df['predicted_quantity'] = rng.integers(0, 40, size=len(forecast_df))
+    current_stock = {'Amul Milk 1L': 30, 'Lays Chips 50g': 80}
+    expected = calculate_reorder_recommendations(forecast_df, current_stock)
+    result = calculate_reorder_recommendations(SalesPanel.from_frame(forecast_df, 'predicted_quantity'), current_stock)
+    pd.testing.assert_frame_equal(expected, result)
+
+    print("\n✅ Test 3 PASSED!\n")
+
+
+class _NextDayModel:
+    """Stand-in model predicting yesterday's sales plus one"""
+    best_iteration = None
+
+    def predict(self, X, **kwargs):
+        return X['lag_1'].to_numpy() + 1
+
+
+def test_recursive_feeds_predictions_into_lags():
+    """Each recursive step sees the previous step's predictions as lag_1"""
+
+    print("\n" + "="*80)
+    print("TEST 4: Recursive Multi-Step Prediction")
+    print("="*80)
+
+    historical_df = _mock_history({
+        'Amul Milk 1L': [20] * 35,
+        'Lays Chips 50g': [5] * 35
+    })
+    future_df = _mock_future(['Amul Milk 1L', 'Lays Chips 50g'], num_days=5)
+    features = prepare_future_features_with_lags(future_df, historical_df)
+    models = {
+        'lgb_model': _NextDayModel(),
+        'ensemble_weights': np.array([1.0, 0.0, 0.0]),
+        'ensemble_type': 'Optimized Weights',
+        'meta_model': None
+    }
+
+    predictions = predict_recursive(features, historical_df, models, ['lag_1', 'lag_7', 'rolling_mean_3'])
+    milk = (features['product_name'] == 'Amul Milk 1L').to_numpy()
+    assert list(predictions[milk]) == [21, 22, 23, 24, 25]
+    assert list(predictions[~milk]) == [6, 7, 8, 9, 10]
+
+    print("\n✅ Test 4 PASSED!\n")
+
+
+def test_future_frame_matches_per_row_rules():
+    """Cross-joined future frame follows the festival calendar and discount rules"""
+
+    print("\n" + "="*80)
+    print("TEST 5: Vectorized Future Frame")
+    print("="*80)
+
+    product_info = {
+        'Amul Milk 1L': {'category': 'Dairy', 'season_affinity': 'all', 'price': 60, 'cost_price': 50},
+        'Lays Chips 50g': {'category': 'Snacks', 'season_affinity': 'all', 'price': 20, 'cost_price': 15},
+        'Tata Salt 1kg': {'category': 'Staples', 'season_affinity': 'all', 'price': 28, 'cost_price': 22},
+    }
+    future_df = generate_future_dates('2025-12-10', num_days=30, product_info_dict=product_info)
+
+    assert len(future_df) == 90
+    assert list(future_df['product_name'][:30]) == ['Amul Milk 1L'] * 30
+    assert future_df['sale_date'].iloc[0] == pd.Timestamp('2025-12-11')
+
+    # Christmas (2025-12-25, 3 prep days: Dairy, Snacks) and New Year Eve
+    # (2025-12-31, 2 prep days: Snacks); Staples has no festival in the window
+    expected_festivals = {
+        ('Dairy', '2025-12-22'): ('Christmas', 3), ('Dairy', '2025-12-23'): ('Christmas', 2),
+        ('Dairy', '2025-12-24'): ('Christmas', 1), ('Dairy', '2025-12-25'): ('Christmas', 0),
+        ('Snacks', '2025-12-22'): ('Christmas', 3), ('Snacks', '2025-12-23'): ('Christmas', 2),
+        ('Snacks', '2025-12-24'): ('Christmas', 1), ('Snacks', '2025-12-25'): ('Christmas', 0),
+        ('Snacks', '2025-12-29'): ('New Year Eve', 2), ('Snacks', '2025-12-30'): ('New Year Eve', 1),
+        ('Snacks', '2025-12-31'): ('New Year Eve', 0),
+    }
+    # Discount rules: Christmas prep (1-2 days before: 15% Snacks, 10% others),
+    # 3rd-Wednesday flash sale (December: Dairy, 12%), daily rotation by weekday
+    prep_days = {'2025-12-23', '2025-12-24'}
+    rotation_days = {'Dairy': {0}, 'Snacks': {2, 5}, 'Staples': {4}}
+
+    for row in future_df.itertuples():
+        date = row.sale_date.strftime('%Y-%m-%d')
+        festival = expected_festivals.get((row.category, date))
+        if festival:
+            assert (row.is_festival, row.festival_name, row.days_to_festival) == (1, *festival), row
+        else:
+            assert (row.is_festival, row.festival_name, row.days_to_festival) == (0, '', 999), row
+
+        if date in prep_days:
+            assert row.discount_percent == (15.0 if row.category == 'Snacks' else 10.0), row
+        elif date == '2025-12-17' and row.category == 'Dairy':
+            assert row.discount_percent == 12.0, row
+        elif row.day_of_week in rotation_days[row.category]:
+            assert row.discount_percent in [2.0, 2.25, 2.5, 2.75, 3.0, 3.25, 3.5], row
+        else:
+            assert row.discount_percent == 0, row
+
+        assert np.isclose(row.final_price, row.price * (1 - row.discount_percent / 100))
+        assert row.day_of_week == row.sale_date.dayofweek
+        assert row.is_weekend == int(row.sale_date.dayofweek >= 5)
+
+    # The per-row helpers agree with the frame
+    assert detect_festival_for_date('2025-12-24', 'Snacks') == (1, 'Christmas', 1)
+    assert calculate_discount_for_date('2025-12-23', 'Snacks') == 15.0
+
+    print("\n✅ Test 5 PASSED!\n")
+
+
+def test_product_subset_matches_full_features():
+    """Features for a product subset equal the full run's rows for those products"""
+
+    print("\n" + "="*80)
+    print("TEST 6: Product Subset Features")
+    print("="*80)
+
+    history = _mock_history({
+        'Chips': list(range(1, 41)),
+        'Cookies': [5] * 40,
+        'Namkeen': [30, 10] * 20
+    })
+    full = prepare_future_features_with_lags(_mock_future(['Chips', 'Cookies', 'Namkeen']), history)
+
+    subset_history = filter_history(history, products=['Cookies'])
+    assert set(subset_history['product_name']) == {'Cookies'}
+    subset = prepare_future_features_with_lags(
+        _mock_future(['Cookies']), subset_history, compute_category_stats(history)
+    )
+    expected = full[full['product_name'] == 'Cookies'].reset_index(drop=True)
+    pd.testing.assert_frame_equal(subset.reset_index(drop=True), expected)
+
+    # Without the full-history category statistics the encoding would drift
+    drifted = prepare_future_features_with_lags(_mock_future(['Cookies']), subset_history)
+    assert drifted['category_encoded'].iloc[0] != expected['category_encoded'].iloc[0]
+
+    try:
+        filter_history(history, categories=['Dairy'])
+        raise AssertionError("Expected UnknownFilterError for an unknown category")
+    except UnknownFilterError as e:
+        print(f"Rejected: {e}")
+
+    print("\n✅ Test 6 PASSED!\n")
+
+
+class _RollingMeanModel:
+    """Stand-in booster: predicts each row's 7-day rolling mean"""
+    best_iteration = 0
+
+    def predict(self, X, num_iteration=None):
+        return X['rolling_mean_7'].to_numpy()
+
+
+def test_subset_horizon_starts_after_dataset_end():
+    """A product that stopped selling early is forecast over the same dates as the full run"""
+
+    print("\n" + "="*80)
+    print("TEST 7: Subset Forecast Horizon")
+    print("="*80)
+
+    df = generate_sales_data(num_skus=4, years=0.3, seed=5)
+    stale_product = df['product_name'].iloc[0]
+    df = df[~((df['product_name'] == stale_product) & (pd.to_datetime(df['sale_date']) > '2025-11-04'))]
+    models = {
+        'lgb_model': _RollingMeanModel(), 'xgb_model': None, 'catboost_model': None,
+        'ensemble_weights': [1.0, 0.0, 0.0], 'ensemble_type': 'Weighted', 'meta_model': None,
+        'feature_cols': ['lag_1', 'rolling_mean_7', 'discount_percent'], 'model_version': 'test'
+    }
+
+    with tempfile.TemporaryDirectory() as work_dir, isolated_caches(work_dir):
+        csv_path = os.path.join(work_dir, 'sales.csv')
+        df.to_csv(csv_path, index=False)
+        full = generate_forecast(csv_path, num_days=5, models=models)
+        subset = generate_forecast(csv_path, num_days=5, models=models, products=[stale_product])
+
+    print(subset.to_string())
+    assert subset['sale_date'].min() == pd.Timestamp('2025-11-15')
+    expected = full[full['product_name'] == stale_product].reset_index(drop=True)
+    pd.testing.assert_frame_equal(subset.reset_index(drop=True), expected)
+
+    print("\n✅ Test 7 PASSED!\n")
+
+
+if __name__ == "__main__":
+    test_lag_and_rolling_features()
+    test_short_history_fallbacks()
+    test_panel_inputs_match_frames()
+    test_recursive_feeds_predictions_into_lags()
+    test_future_frame_matches_per_row_rules()
+    test_product_subset_matches_full_features()
+    test_subset_horizon_starts_after_dataset_end()
@@ -0,0 +1,85 @@
+"""
+Test Script for Forecast Stage Metrics
+Validates lap timing, rolling-window percentiles, prefix reads/resets and
+optional memory peaks
+"""
+
+import sys
+import os
+import time
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+from backend.ml_models.forecast_metrics import ForecastMetrics
+
+
+def test_rolling_percentiles_and_laps():
+    """Percentiles cover only the window; laps record per-stage durations"""
+
+    print("\n" + "="*80)
+    print("TEST 1: Rolling Percentiles and Stage Laps")
+    print("="*80)
+
+    metrics = ForecastMetrics(window=100, trace_memory=False)
+    for ms in range(1, 201):  # Only 101..200 stay in the window
+        metrics.record('run.stage', ms / 1000)
+
+    stats = metrics.summary()['run.stage']
+    print(f"Stats: {stats}")
+    assert stats['count'] == 200 and stats['samples'] == 100
+    assert stats['max_ms'] == 200 and stats['p50_ms'] == np.percentile(np.arange(101, 201), 50)
+    assert stats['p50_ms'] < stats['p90_ms'] < stats['p99_ms'] <= stats['max_ms']
+    assert 'peak_mb_p50' not in stats
+
+    timer = metrics.timer('forecast')
+    time.sleep(0.02)
+    timer.lap('slow')
+    timer.lap('fast')
+    total = timer.finish()
+
+    stats = metrics.summary()
+    assert stats['forecast.slow']['p50_ms'] >= 20 > stats['forecast.fast']['p50_ms']
+    assert total >= timer.laps['slow'] + timer.laps['fast']
+    assert set(stats) == {'run.stage', 'forecast.slow', 'forecast.fast', 'forecast.total'}
+
+    # Prefix filters reads and resets; a read-and-reset returns what it cleared
+    assert set(metrics.summary('forecast.')) == {'forecast.slow', 'forecast.fast', 'forecast.total'}
+    cleared = metrics.summary('forecast.', reset=True)
+    assert cleared['forecast.slow'] == stats['forecast.slow']
+    assert set(metrics.summary()) == {'run.stage'}
+
+    metrics.reset()
+    assert metrics.summary() == {}
+
+    print("\n✅ Test 1 PASSED!\n")
+
+
+def test_memory_peaks_when_tracing():
+    """With trace_memory, each lap records the peak allocated during the stage"""
+
+    print("\n" + "="*80)
+    print("TEST 2: Per-Stage Memory Peaks")
+    print("="*80)
+
+    metrics = ForecastMetrics(trace_memory=True)
+    try:
+        timer = metrics.timer('forecast')
+        data = np.ones(4 * 1024 ** 2 // 8)  # 4 MB
+        del data
+        timer.lap('allocate')
+        timer.lap('idle')
+    finally:
+        metrics.set_trace_memory(False)
+
+    stats = metrics.summary()
+    print(f"Peaks: allocate {stats['forecast.allocate']['peak_mb_max']} MB, "
+          f"idle {stats['forecast.idle']['peak_mb_max']} MB")
+    assert stats['forecast.allocate']['peak_mb_max'] >= 4
+    assert stats['forecast.idle']['peak_mb_max'] < 4
+
+    print("\n✅ Test 2 PASSED!\n")
+
+
+if __name__ == "__main__":
+    test_rolling_percentiles_and_laps()
+    test_memory_peaks_when_tracing()
@@ -0,0 +1,180 @@
+"""
+Test Script for the Forecast API Routes
+Validates client vs server error mapping of the forecast endpoints and
+that every response format carries the same rows
+"""
+
+import sys
+import os
+import json
+import tempfile
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), 'backend'))
+
+import numpy as np
+import pandas as pd
+from flask import Flask
+from routes import forecast_routes
+from ml_models.forecast_engine import UnknownFilterError
+from ml_models.model_registry import ModelRegistry
+from ml_models.forecast_metrics import FORECAST_METRICS
+from ml_models.synthetic_data import generate_sales_data
+
+
+def _client(base_dir):
+    """Test client for the forecast blueprint, with fake models in the registry"""
+    os.makedirs(os.path.join(base_dir, 'saved_models'))
+    open(os.path.join(base_dir, 'saved_models', 'lgb_model.pkl'), 'wb').close()
+    forecast_routes.MODEL_REGISTRY = ModelRegistry(
+        base_dir=base_dir, loader=lambda model_dir: {'model_version': 'v1', 'feature_cols': None}
+    )
+    app = Flask(__name__)
+    app.register_blueprint(forecast_routes.forecast_bp, url_prefix='/api/forecast')
+    return app.test_client()
+
+
+def test_client_and_server_errors():
+    """Unknown filters/models are 400s; failures inside the forecast stay 500s"""
+
+    print("\n" + "="*80)
+    print("TEST 1: Client vs Server Errors")
+    print("="*80)
+
+    get_cached_forecast = forecast_routes.get_cached_forecast
+    try:
+        with tempfile.TemporaryDirectory() as base_dir:
+            client = _client(base_dir)
+
+            def unknown_product(*args, **kwargs):
+                raise UnknownFilterError("Unknown product(s): Moon Cheese")
+
+            def internal_error(*args, **kwargs):
+                raise ValueError("Input contains NaN")
+
+            for endpoint in ('/api/forecast/generate', '/api/forecast/generate-with-reorder'):
+                forecast_routes.get_cached_forecast = unknown_product
+                response = client.post(endpoint, json={'products': ['Moon Cheese']})
+                assert response.status_code == 400 and 'Moon Cheese' in response.get_json()['error']
+
+                response = client.post(endpoint, json={'model': 'saved_models_missing'})
+                assert response.status_code == 400 and 'Unknown model version' in response.get_json()['error']
+
+                forecast_routes.get_cached_forecast = internal_error
+                response = client.post(endpoint, json={})
+                print(f"{endpoint}: internal ValueError -> {response.status_code}")
+                assert response.status_code == 500
+    finally:
+        forecast_routes.get_cached_forecast = get_cached_forecast
+
+    print("\n✅ Test 1 PASSED!\n")
+
+
+def _fake_forecast(num_days=30):
+    """Forecast frame with the real output columns (50 products: spans NDJSON chunks)"""
+    history = generate_sales_data(num_skus=50, years=0.1, seed=6)
+    products = history.groupby('product_name', sort=False)[['category', 'price']].first()
+    dates = pd.date_range('2025-11-15', periods=num_days)
+    rng = np.random.default_rng(6)
+    forecast = pd.DataFrame({
+        'sale_date': np.tile(dates.values, len(products)),
+        'product_name': np.repeat(products.index.to_numpy(), num_days),
+        'category': np.repeat(products['category'].to_numpy(), num_days),
+        'price': np.repeat(products['price'].to_numpy(dtype=float), num_days),
+        'discount_percent': rng.choice([0.0, 2.5, 12.0], len(products) * num_days),
+        'is_festival': rng.integers(0, 2, len(products) * num_days),
+        'predicted_quantity': rng.integers(0, 40, len(products) * num_days)
+    })
+    forecast['final_price'] = forecast['price'] * (1 - forecast['discount_percent'] / 100)
+    forecast['festival_name'] = np.where(forecast['is_festival'] == 1, 'Diwali', '')
+    forecast['forecasted_revenue'] = forecast['predicted_quantity'] * forecast['final_price']
+    return forecast
+
+
+def test_response_formats_round_trip():
+    """columnar and streamed ndjson carry exactly the rows of the default JSON"""
+
+    print("\n" + "="*80)
+    print("TEST 2: Response Formats Round Trip")
+    print("="*80)
+
+    forecast = _fake_forecast()
+    assert len(forecast) > forecast_routes.NDJSON_CHUNK_ROWS
+    current_stock = {name: 20 for name in forecast['product_name'].unique()}
+
+    get_cached_forecast = forecast_routes.get_cached_forecast
+    precomputed_dir = forecast_routes.PRECOMPUTED_FORECASTS.base_dir
+    try:
+        with tempfile.TemporaryDirectory() as base_dir:
+            client = _client(base_dir)
+            forecast_routes.get_cached_forecast = lambda *args, **kwargs: forecast
+            forecast_routes.PRECOMPUTED_FORECASTS.base_dir = os.path.join(base_dir, 'precomputed')
+
+            for endpoint, tables in (('generate', ['forecast']), ('generate-with-reorder', ['forecast', 'reorder'])):
+                url = f'/api/forecast/{endpoint}'
+                body = {'current_stock': current_stock}
+                expected = client.post(url, json=body).get_json()
+                assert len(expected['forecast']) == len(forecast)
+
+                columnar = client.post(f'{url}?format=columnar', json=body).get_json()
+                assert columnar['format'] == 'columnar'
+                for table in tables:
+                    fields = columnar[table]['columns']
+                    data = columnar[table]['data']
+                    rows = [dict(zip(fields, values)) for values in zip(*(data[f] for f in fields))]
+                    assert rows == expected[table]
+
+                # Serialization of a stream is timed when the stream has been written
+                FORECAST_METRICS.reset()
+                stage = f"api.{endpoint.replace('-', '_')}.serialize"
+                response = client.post(f'{url}?format=ndjson', json=body, buffered=False)
+                assert response.mimetype == 'application/x-ndjson'
+                assert stage not in FORECAST_METRICS.summary()
+                lines = [json.loads(line) for line in response.get_data(as_text=True).splitlines()]
+                assert FORECAST_METRICS.summary()[stage]['count'] == 1
+
+                for table in tables:
+                    rows = [{k: v for k, v in line.items() if k != 'type'} for line in lines if line['type'] == table]
+                    assert rows == expected[table]
+                summary = lines[-1]
+                assert summary['type'] == 'summary' and summary['success']
+                assert all(summary[key] == value for key, value in expected.items() if key not in tables)
+                print(f"{endpoint}: {len(lines)} ndjson lines match the JSON response")
+    finally:
+        forecast_routes.get_cached_forecast = get_cached_forecast
+        forecast_routes.PRECOMPUTED_FORECASTS.base_dir = precomputed_dir
+
+    print("\n✅ Test 2 PASSED!\n")
+
+
+def test_metrics_reset_is_post_only():
+    """GET /metrics only reads; POST /metrics/reset clears the stages under a prefix"""
+
+    print("\n" + "="*80)
+    print("TEST 3: Metrics Read and Reset")
+    print("="*80)
+
+    with tempfile.TemporaryDirectory() as base_dir:
+        client = _client(base_dir)
+        FORECAST_METRICS.reset()
+        FORECAST_METRICS.record('api.generate.total', 0.01)
+        FORECAST_METRICS.record('generate_forecast.total', 0.02)
+
+        stages = client.get('/api/forecast/metrics?prefix=api.&reset=1').get_json()['stages']
+        assert list(stages) == ['api.generate.total']
+        assert set(FORECAST_METRICS.summary()) == {'api.generate.total', 'generate_forecast.total'}
+        assert client.get('/api/forecast/metrics/reset').status_code == 405
+
+        response = client.post('/api/forecast/metrics/reset', json={'prefix': 'api.'})
+        print(f"Reset: {response.get_json()}")
+        assert list(response.get_json()['stages']) == ['api.generate.total']
+        assert set(FORECAST_METRICS.summary()) == {'generate_forecast.total'}
+
+        client.post('/api/forecast/metrics/reset')
+        assert FORECAST_METRICS.summary() == {}
+
+    print("\n✅ Test 3 PASSED!\n")
+
+
+if __name__ == "__main__":
+    test_client_and_server_errors()
+    test_response_formats_round_trip()
+    test_metrics_reset_is_post_only()
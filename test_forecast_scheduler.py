@@ -0,0 +1,125 @@
+"""
+Test Script for Scheduled Forecast Precomputation
+Validates persisted forecasts/reorder plans, the daily run time and that
+one process per store runs the scheduler
+"""
+
+import sys
+import os
+import tempfile
+from datetime import datetime
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pandas as pd
+from backend.ml_models.forecast_scheduler import (
+    ForecastScheduler, PrecomputedForecasts, next_run_time
+)
+
+
+def _mock_forecast(num_days):
+    """Forecast frame in the generate_forecast output layout"""
+    records = []
+    for product, category in [('Amul Milk 1L', 'Dairy'), ('Lays Chips 50g', 'Snacks')]:
+        for i, date in enumerate(pd.date_range('2025-12-01', periods=num_days)):
+            records.append({
+                'sale_date': date,
+                'product_name': product,
+                'category': category,
+                'price': 20.0,
+                'discount_percent': 0.0,
+                'final_price': 20.0,
+                'is_festival': 0,
+                'festival_name': '',
+                'predicted_quantity': 10 + i,
+                'forecasted_revenue': 20.0 * (10 + i)
+            })
+    return pd.DataFrame(records)
+
+
+def test_precompute_and_serve():
+    """One run per version; forecasts and matching reorder plans are served from disk"""
+
+    print("\n" + "="*80)
+    print("TEST 1: Precompute and Serve")
+    print("="*80)
+
+    stock = {'Amul Milk 1L': 12, 'Lays Chips 50g': 90}
+    calls = []
+
+    def compute(num_days):
+        calls.append(num_days)
+        return _mock_forecast(num_days)
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        store = PrecomputedForecasts(tmp_dir)
+        scheduler = ForecastScheduler(
+            get_version=lambda: 'data1-model1',
+            compute_forecast=compute,
+            stock_provider=lambda: stock,
+            store=store
+        )
+
+        assert scheduler.run_once() is True
+        assert scheduler.run_once() is False, "Second run for the same version should be skipped"
+        assert calls == [7, 30]
+
+        pd.testing.assert_frame_equal(store.load_forecast('data1-model1', 7), _mock_forecast(7))
+        assert store.load_forecast('data1-model1', 14) is None
+        assert store.load_forecast('data2-model1', 7) is None
+
+        reorder = store.load_reorder('data1-model1', 7, stock)
+        assert reorder is not None and set(reorder['product_name']) == set(stock)
+        # Different stock levels or parameters must not reuse the stored plan
+        assert store.load_reorder('data1-model1', 7, {**stock, 'Amul Milk 1L': 0}) is None
+        assert store.load_reorder('data1-model1', 7, stock, safety_stock=10) is None
+
+    print("\n✅ Test 1 PASSED!\n")
+
+
+def test_next_run_time():
+    """The next run is the upcoming cutoff, rolling over to tomorrow"""
+
+    print("\n" + "="*80)
+    print("TEST 2: Next Run Time")
+    print("="*80)
+
+    assert next_run_time(datetime(2025, 11, 10, 21, 0), cutoff='22:00') == datetime(2025, 11, 10, 22, 0)
+    assert next_run_time(datetime(2025, 11, 10, 22, 0), cutoff='22:00') == datetime(2025, 11, 11, 22, 0)
+    assert next_run_time(datetime(2025, 11, 10, 23, 5), cutoff='06:30') == datetime(2025, 11, 11, 6, 30)
+
+    print("\n✅ Test 2 PASSED!\n")
+
+
+def test_one_scheduler_per_store():
+    """A second scheduler on the same store (another worker) stays idle until the first stops"""
+
+    print("\n" + "="*80)
+    print("TEST 3: One Scheduler per Store")
+    print("="*80)
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        schedulers = [
+            ForecastScheduler(
+                get_version=lambda: 'data1-model1', compute_forecast=_mock_forecast,
+                store=PrecomputedForecasts(tmp_dir)
+            )
+            for _ in range(2)
+        ]
+        try:
+            assert schedulers[0].start() is True
+            assert schedulers[1].start() is False
+            assert schedulers[0].status()['running'] and not schedulers[1].status()['running']
+
+            schedulers[0].stop()
+            assert schedulers[1].start() is True and schedulers[1].status()['running']
+        finally:
+            for scheduler in schedulers:
+                scheduler.stop()
+
+    print("\n✅ Test 3 PASSED!\n")
+
+
+if __name__ == "__main__":
+    test_precompute_and_serve()
+    test_next_run_time()
+    test_one_scheduler_per_store()
@@ -0,0 +1,154 @@
+"""
+Test Script for Native Model Artifacts
+Validates export/load round trip, checksums, malformed manifests and the
+load_models fallback
+"""
+
+import sys
+import os
+import json
+import shutil
+import tempfile
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pandas as pd
+import numpy as np
+import joblib
+from backend.ml_models.forecast_engine import load_models
+from backend.ml_models.model_artifacts import (
+    export_native_models, load_native_models, ModelArtifactError, NATIVE_FILES, MANIFEST_NAME
+)
+
+
+def _train_small_models(model_dir):
+    """Fit tiny LightGBM/XGBoost/CatBoost models and pickle them like the training notebook"""
+    import lightgbm as lgb
+    import xgboost as xgb
+    from catboost import CatBoostRegressor
+
+    rng = np.random.default_rng(5)
+    X = pd.DataFrame(rng.random((200, 4)), columns=['lag_1', 'lag_7', 'rolling_mean_7', 'price'])
+    y = 10 * X['lag_1'] + 5 * X['rolling_mean_7'] + rng.random(200)
+
+    joblib.dump(lgb.train({'verbose': -1, 'num_leaves': 7}, lgb.Dataset(X, y), num_boost_round=20),
+                os.path.join(model_dir, 'lgb_model.pkl'))
+    joblib.dump(xgb.train({'max_depth': 3}, xgb.DMatrix(X, y), num_boost_round=20),
+                os.path.join(model_dir, 'xgb_model.pkl'))
+    joblib.dump(CatBoostRegressor(iterations=20, depth=3, verbose=0, allow_writing_files=False).fit(X, y),
+                os.path.join(model_dir, 'catboost_model.pkl'))
+    joblib.dump({'type': 'Optimized Weights', 'weights': np.array([0.5, 0.2, 0.3]), 'meta_model': None},
+                os.path.join(model_dir, 'ensemble_config.pkl'))
+    joblib.dump(list(X.columns), os.path.join(model_dir, 'feature_cols.pkl'))
+    return X
+
+
+def test_native_round_trip():
+    """Native artifacts predict exactly like the pickled models"""
+
+    print("\n" + "="*80)
+    print("TEST 1: Native Export / Load Round Trip")
+    print("="*80)
+
+    import xgboost as xgb
+
+    with tempfile.TemporaryDirectory() as pickle_dir, tempfile.TemporaryDirectory() as native_dir:
+        X = _train_small_models(pickle_dir)
+        pickled = load_models(pickle_dir)
+        manifest = export_native_models(pickled, native_dir)
+        native = load_models(native_dir)
+
+        assert set(manifest['artifacts']) == set(NATIVE_FILES)
+        assert native['feature_cols'] == pickled['feature_cols']
+        assert np.allclose(native['ensemble_weights'], pickled['ensemble_weights'])
+        assert np.array_equal(native['lgb_model'].predict(X), pickled['lgb_model'].predict(X))
+        assert np.array_equal(native['xgb_model'].predict(xgb.DMatrix(X)), pickled['xgb_model'].predict(xgb.DMatrix(X)))
+        assert np.array_equal(native['catboost_model'].predict(X), pickled['catboost_model'].predict(X))
+
+    print("\n✅ Test 1 PASSED!\n")
+
+
+def test_checksum_mismatch_falls_back_to_pickles():
+    """A corrupted native file is rejected and load_models uses the pickles"""
+
+    print("\n" + "="*80)
+    print("TEST 2: Checksum Mismatch Fallback")
+    print("="*80)
+
+    with tempfile.TemporaryDirectory() as model_dir:
+        _train_small_models(model_dir)
+        export_native_models(load_models(model_dir), model_dir)
+
+        with open(os.path.join(model_dir, NATIVE_FILES['xgb_model']), 'ab') as f:
+            f.write(b'corrupted')
+
+        try:
+            load_native_models(model_dir)
+            raise AssertionError("Expected ModelArtifactError for a corrupted artifact")
+        except ModelArtifactError as e:
+            print(f"Rejected: {e}")
+
+        models = load_models(model_dir)
+        assert models['xgb_model'] is not None and len(models['feature_cols']) == 4
+
+    print("\n✅ Test 2 PASSED!\n")
+
+
+def test_malformed_manifest_falls_back_to_pickles():
+    """Broken or hand-edited manifests raise ModelArtifactError, never crash loading"""
+
+    print("\n" + "="*80)
+    print("TEST 3: Malformed Manifest Fallback")
+    print("="*80)
+
+    with tempfile.TemporaryDirectory() as model_dir:
+        _train_small_models(model_dir)
+        manifest = export_native_models(load_models(model_dir), model_dir)
+        manifest_path = os.path.join(model_dir, MANIFEST_NAME)
+
+        def without(*keys):
+            edited = json.loads(json.dumps(manifest))
+            parent = edited
+            for key in keys[:-1]:
+                parent = parent[key]
+            del parent[keys[-1]]
+            return json.dumps(edited)
+
+        broken = {
+            'not JSON': '{"format_version": 1, "artifacts": ',
+            'not an object': '[1]',
+            'no artifacts': without('artifacts'),
+            'no XGBoost artifact': without('artifacts', 'xgb_model'),
+            'no checksum': without('artifacts', 'lgb_model', 'sha256'),
+            'no ensemble': without('ensemble'),
+            'no feature_cols': without('feature_cols'),
+        }
+        for case, text in broken.items():
+            with open(manifest_path, 'w') as f:
+                f.write(text)
+            try:
+                load_native_models(model_dir)
+                raise AssertionError(f"Expected ModelArtifactError: {case}")
+            except ModelArtifactError as e:
+                print(f"{case}: {e}")
+            models = load_models(model_dir)
+            assert models['xgb_model'] is not None and len(models['feature_cols']) == 4
+
+        # Stacking ensemble whose meta-model pickle is gone
+        stacked = json.loads(json.dumps(manifest))
+        stacked['ensemble']['has_meta_model'] = True
+        with open(manifest_path, 'w') as f:
+            json.dump(stacked, f)
+        shutil.move(os.path.join(model_dir, 'ensemble_config.pkl'), os.path.join(model_dir, 'moved.pkl'))
+        try:
+            load_native_models(model_dir)
+            raise AssertionError("Expected ModelArtifactError for a missing meta-model")
+        except ModelArtifactError as e:
+            print(f"missing meta-model: {e}")
+
+    print("\n✅ Test 3 PASSED!\n")
+
+
+if __name__ == "__main__":
+    test_native_round_trip()
+    test_checksum_mismatch_falls_back_to_pickles()
+    test_malformed_manifest_falls_back_to_pickles()
@@ -0,0 +1,122 @@
+"""
+Test Script for the Model Registry
+Validates single-flight loading, hot swap under load, pinning and LRU eviction
+"""
+
+import sys
+import os
+import tempfile
+import threading
+import time
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from backend.ml_models.model_registry import ModelRegistry, UnknownModelError
+
+
+def _make_versions(base_dir, names):
+    """Empty saved_models* directories that look like model versions"""
+    for name in names:
+        os.makedirs(os.path.join(base_dir, name))
+        open(os.path.join(base_dir, name, 'lgb_model.pkl'), 'wb').close()
+
+
+class _SlowLoader:
+    """Fake load_models(): counts loads and takes a while like the real one"""
+
+    def __init__(self, seconds=0.2):
+        self.seconds = seconds
+        self.calls = []
+        self._lock = threading.Lock()
+
+    def __call__(self, model_dir):
+        with self._lock:
+            self.calls.append(os.path.basename(model_dir))
+            load_number = len(self.calls)
+        time.sleep(self.seconds)
+        return {'model_version': f"{os.path.basename(model_dir)}#{load_number}"}
+
+
+def test_single_flight_and_hot_swap():
+    """Concurrent first requests load once; requests during a reload never fail"""
+
+    print("\n" + "="*80)
+    print("TEST 1: Single-Flight Load and Hot Swap")
+    print("="*80)
+
+    with tempfile.TemporaryDirectory() as base_dir:
+        _make_versions(base_dir, ['saved_models'])
+        loader = _SlowLoader()
+        registry = ModelRegistry(base_dir=base_dir, loader=loader)
+
+        results = []
+        threads = [threading.Thread(target=lambda: results.append(registry.get())) for _ in range(8)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        assert loader.calls == ['saved_models']
+        assert all(r is results[0] for r in results)
+
+        # Keep requesting while a reload runs: every request gets a model
+        served, errors = [], []
+        stop = threading.Event()
+
+        def _serve():
+            while not stop.is_set():
+                try:
+                    served.append(registry.get()['model_version'])
+                except Exception as e:
+                    errors.append(e)
+
+        workers = [threading.Thread(target=_serve) for _ in range(4)]
+        for w in workers:
+            w.start()
+        registry.reload()
+        time.sleep(0.05)
+        stop.set()
+        for w in workers:
+            w.join()
+
+        assert not errors
+        assert set(served) == {'saved_models#1', 'saved_models#2'}
+        assert registry.get()['model_version'] == 'saved_models#2'
+
+    print("\n✅ Test 1 PASSED!\n")
+
+
+def test_pinning_and_lru_eviction():
+    """Pinned versions load on demand, LRU eviction spares the active version"""
+
+    print("\n" + "="*80)
+    print("TEST 2: Pinning and LRU Eviction")
+    print("="*80)
+
+    with tempfile.TemporaryDirectory() as base_dir:
+        _make_versions(base_dir, ['saved_models', 'saved_models_backup', 'saved_models_backup2'])
+        registry = ModelRegistry(base_dir=base_dir, max_resident=2, loader=_SlowLoader(0))
+
+        registry.get()
+        assert registry.get('saved_models_backup')['model_name'] == 'saved_models_backup'
+        registry.get('saved_models_backup2')
+
+        status = registry.status()
+        assert [v['name'] for v in status['resident']] == ['saved_models', 'saved_models_backup2']
+        assert status['evictions'] == 1 and len(status['available']) == 3
+
+        registry.activate('saved_models_backup')
+        assert registry.get()['model_name'] == 'saved_models_backup'
+        assert registry.status()['active'] == 'saved_models_backup'
+
+        for bad_name in ['saved_models_missing', '../saved_models', 'other']:
+            try:
+                registry.get(bad_name)
+                raise AssertionError(f"Expected UnknownModelError for {bad_name}")
+            except UnknownModelError as e:
+                print(f"Rejected: {e}")
+
+    print("\n✅ Test 2 PASSED!\n")
+
+
+if __name__ == "__main__":
+    test_single_flight_and_hot_swap()
+    test_pinning_and_lru_eviction()
@@ -0,0 +1,132 @@
+"""
+Test Script for Model Warm-up Readiness
+Validates that /health/ready follows the model registry: boot warm-up,
+recovery after a failed warm-up, and warm-up disabled
+"""
+
+import sys
+import os
+import tempfile
+import time
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), 'backend'))
+
+from routes import forecast_routes
+from ml_models.model_registry import ModelRegistry
+
+
+class _FlakyLoader:
+    """Fake load_models(): fails the first `failures` calls"""
+
+    def __init__(self, failures=0):
+        self.failures = failures
+        self.calls = 0
+
+    def __call__(self, model_dir):
+        self.calls += 1
+        if self.calls <= self.failures:
+            raise OSError("model files not readable yet")
+        return {'model_version': f"v{self.calls}", 'feature_cols': None}
+
+
+def _use_registry(base_dir, loader, names=('saved_models',)):
+    """Point the routes at a fresh registry and reset the warm-up state"""
+    for name in names:
+        os.makedirs(os.path.join(base_dir, name))
+        open(os.path.join(base_dir, name, 'lgb_model.pkl'), 'wb').close()
+    forecast_routes.MODEL_REGISTRY = ModelRegistry(base_dir=base_dir, loader=loader)
+    forecast_routes.MODEL_WARMUP.update(
+        enabled=False, state='cold', load_seconds=None, warmup_seconds=None,
+        model_version=None, model_name=None, error=None, failed_at=None
+    )
+
+
+def test_boot_warmup_and_activation():
+    """Ready after the boot warm-up; the active version follows the registry activation (/reload-models)"""
+
+    print("\n" + "="*80)
+    print("TEST 1: Boot Warm-up and Activation")
+    print("="*80)
+
+    with tempfile.TemporaryDirectory() as base_dir:
+        _use_registry(base_dir, _FlakyLoader(), names=('saved_models', 'saved_models_backup'))
+
+        forecast_routes.start_model_warmup().join()
+        readiness = forecast_routes.get_model_readiness()
+        print(f"Readiness: {readiness}")
+        assert readiness['ready'] and readiness['state'] == 'ready'
+        assert readiness['model_name'] == 'saved_models' and readiness['load_seconds'] is not None
+
+        forecast_routes.MODEL_REGISTRY.activate('saved_models_backup')
+        readiness = forecast_routes.get_model_readiness()
+        assert readiness['ready'] and readiness['model_name'] == 'saved_models_backup'
+
+    print("\n✅ Test 1 PASSED!\n")
+
+
+def test_failed_warmup_recovers():
+    """A failed warm-up is not ready until a request loads the models or a retry succeeds"""
+
+    print("\n" + "="*80)
+    print("TEST 2: Failed Warm-up, then Recovery")
+    print("="*80)
+
+    retry_seconds = forecast_routes.MODEL_WARMUP_RETRY_SECONDS
+    try:
+        # Recovery through a request
+        with tempfile.TemporaryDirectory() as base_dir:
+            _use_registry(base_dir, _FlakyLoader(failures=1))
+            forecast_routes.start_model_warmup().join()
+            readiness = forecast_routes.get_model_readiness()
+            assert not readiness['ready'] and readiness['state'] == 'failed' and readiness['error']
+
+            forecast_routes.get_models()
+            readiness = forecast_routes.get_model_readiness()
+            print(f"After a request: {readiness}")
+            assert readiness['ready'] and readiness['model_version'] == 'v2'
+
+        # Recovery through the readiness probe's background retry
+        with tempfile.TemporaryDirectory() as base_dir:
+            _use_registry(base_dir, _FlakyLoader(failures=1))
+            forecast_routes.MODEL_WARMUP_RETRY_SECONDS = 0
+            forecast_routes.start_model_warmup().join()
+
+            readiness = forecast_routes.get_model_readiness()  # Starts the retry
+            assert not readiness['ready']
+            deadline = time.time() + 5
+            while not readiness['ready'] and time.time() < deadline:
+                time.sleep(0.01)
+                readiness = forecast_routes.get_model_readiness()
+            print(f"After a retry: {readiness}")
+            assert readiness['ready'] and readiness['model_version'] == 'v2'
+    finally:
+        forecast_routes.MODEL_WARMUP_RETRY_SECONDS = retry_seconds
+
+    print("\n✅ Test 2 PASSED!\n")
+
+
+def test_warmup_disabled_is_ready():
+    """Without warm-up the process is ready and the first request loads the models"""
+
+    print("\n" + "="*80)
+    print("TEST 3: Warm-up Disabled")
+    print("="*80)
+
+    with tempfile.TemporaryDirectory() as base_dir:
+        loader = _FlakyLoader()
+        _use_registry(base_dir, loader)
+
+        readiness = forecast_routes.get_model_readiness()
+        assert readiness['ready'] and readiness['state'] == 'lazy' and loader.calls == 0
+
+        forecast_routes.get_models()
+        readiness = forecast_routes.get_model_readiness()
+        print(f"After the first request: {readiness}")
+        assert readiness['state'] == 'ready' and readiness['model_version'] == 'v1'
+
+    print("\n✅ Test 3 PASSED!\n")
+
+
+if __name__ == "__main__":
+    test_boot_warmup_and_activation()
+    test_failed_warmup_recovers()
+    test_warmup_disabled_is_ready()
@@ -0,0 +1,216 @@
+"""
+Test Script for the Training Pipeline
+Validates that trained models load with load_models(), that parallel
+training reproduces sequential training, and warm-start retraining
+"""
+
+import sys
+import os
+import json
+import tempfile
+import time
+import types
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+import pandas as pd
+import xgboost as xgb
+from backend.ml_models import save_trained_models
+from backend.ml_models.synthetic_data import write_sales_csv
+from backend.ml_models.feature_store import isolated_caches
+from backend.ml_models.forecast_engine import load_models
+from backend.ml_models.ensemble_inference import predict_ensemble
+from backend.ml_models.save_trained_models import (
+    train_models, retrain_incremental, prepare_training_data, thread_budget,
+    TRAINERS, TRAINING_REPORT_NAME, RETRAIN_VERSION_PREFIX, TRAIN_VERSION_PREFIX
+)
+
+
+def test_trained_models_load_and_predict():
+    """A training run writes the load_models() layout (pickles and native)"""
+
+    print("\n" + "="*80)
+    print("TEST 1: Train, Save and Load")
+    print("="*80)
+
+    assert thread_budget(8) == [3, 3, 2] and thread_budget(1) == [1, 1, 1]
+
+    with tempfile.TemporaryDirectory() as work_dir, isolated_caches(work_dir):
+        csv_path = os.path.join(work_dir, 'sales.csv')
+        write_sales_csv(csv_path, num_skus=6, years=0.5, seed=1)
+        model_dir = os.path.join(work_dir, 'saved_models')
+
+        report = train_models(csv_path, model_dir, cores=1, native=True, num_boost_round=20)
+        data = prepare_training_data(csv_path)
+
+        # Every day after the 30-day lag warm-up is used, not just festival days
+        used_rows = report['data']['train_rows'] + report['data']['validation_rows']
+        assert used_rows == 6 * (round(0.5 * 365) - 30)
+        with open(os.path.join(model_dir, TRAINING_REPORT_NAME)) as f:
+            assert json.load(f)['ensemble_type'] == report['ensemble_type']
+
+        native = load_models(model_dir)
+        pickled = load_models(model_dir, prefer_native=False)
+        assert native['feature_cols'] == data['feature_cols'] and native['ensemble_type'] == report['ensemble_type']
+
+        pred_native, _ = predict_ensemble(native, data['X_val'])
+        pred_pickled, _ = predict_ensemble(pickled, data['X_val'])
+        print(f"Ensemble: {report['ensemble_type']}, validation R²: "
+              f"{report['validation_metrics']['ensemble'][report['ensemble_type']]['R2']:.3f}")
+        assert len(pred_native) == len(data['y_val'])
+        assert np.allclose(pred_native, pred_pickled)
+
+        # Without a model_dir the live saved_models is left alone: a new version is written
+        default_model_dir = save_trained_models.DEFAULT_MODEL_DIR
+        save_trained_models.DEFAULT_MODEL_DIR = model_dir
+        try:
+            before = os.path.getmtime(os.path.join(model_dir, 'lgb_model.pkl'))
+            report = train_models(csv_path, cores=1, num_boost_round=5)
+        finally:
+            save_trained_models.DEFAULT_MODEL_DIR = default_model_dir
+        assert os.path.basename(report['model_dir']).startswith(TRAIN_VERSION_PREFIX)
+        assert os.path.dirname(report['model_dir']) == work_dir
+        assert os.path.getmtime(os.path.join(model_dir, 'lgb_model.pkl')) == before
+        assert load_models(report['model_dir'])['feature_cols'] == data['feature_cols']
+
+    print("\n✅ Test 1 PASSED!\n")
+
+
+def test_parallel_training_matches_sequential():
+    """Models trained in worker processes equal models trained in-process"""
+
+    print("\n" + "="*80)
+    print("TEST 2: Parallel vs Sequential Training")
+    print("="*80)
+
+    with tempfile.TemporaryDirectory() as work_dir, isolated_caches(work_dir):
+        csv_path = os.path.join(work_dir, 'sales.csv')
+        write_sales_csv(csv_path, num_skus=4, years=0.4, seed=2)
+
+        reports, predictions = {}, {}
+        for parallel in (False, True):
+            model_dir = os.path.join(work_dir, f'saved_models_{parallel}')
+            reports[parallel] = train_models(csv_path, model_dir, cores=3, parallel=parallel, num_boost_round=15)
+            predictions[parallel], _ = predict_ensemble(load_models(model_dir), prepare_training_data(csv_path)['X_val'])
+
+        assert reports[True]['parallel'] and not reports[False]['parallel']
+        assert [m['threads'] for m in reports[True]['base_models'].values()] == [1, 1, 1]
+        assert np.allclose(predictions[True], predictions[False])
+
+    print("\n✅ Test 2 PASSED!\n")
+
+
+def test_incremental_retrain_adds_trees():
+    """Warm start continues the base trees into a new version; the budget caps it"""
+
+    print("\n" + "="*80)
+    print("TEST 3: Incremental Retraining")
+    print("="*80)
+
+    with tempfile.TemporaryDirectory() as work_dir, isolated_caches(work_dir):
+        csv_path = os.path.join(work_dir, 'sales.csv')
+        write_sales_csv(csv_path, num_skus=6, years=0.5, seed=1)
+        base_dir = os.path.join(work_dir, 'saved_models')
+        train_models(csv_path, base_dir, cores=1, num_boost_round=20)
+        base = load_models(base_dir)
+        base_trees = {
+            'lgb': base['lgb_model'].best_iteration,
+            'xgb': base['xgb_model'].best_iteration + 1,
+            'catboost': base['catboost_model'].tree_count_
+        }
+
+        report = retrain_incremental(csv_path, base_dir, window_days=60, num_boost_round=15, cores=1)
+        assert os.path.dirname(report['model_dir']) == work_dir
+        assert os.path.basename(report['model_dir']).startswith(RETRAIN_VERSION_PREFIX)
+        assert report['mode'] == 'incremental' and report['data']['first_date'] > '2025-09-01'
+        assert report['base_model']['model_version'] == base['model_version']
+
+        updated = load_models(report['model_dir'])
+        trees = {
+            'lgb': updated['lgb_model'].num_trees(),
+            'xgb': updated['xgb_model'].num_boosted_rounds(),
+            'catboost': updated['catboost_model'].tree_count_
+        }
+        print(f"Trees: {base_trees} -> {trees}")
+        assert all(base_trees[name] < trees[name] <= base_trees[name] + 15 for name in trees)
+        metrics = report['validation_metrics']['ensemble']
+        print(f"Validation RMSE: {metrics['base_version']['RMSE']:.3f} -> {metrics['updated']['RMSE']:.3f}")
+
+        # An exhausted budget stops every model after its first new tree
+        report = retrain_incremental(
+            csv_path, base_dir, os.path.join(work_dir, 'budget'), window_days=60,
+            num_boost_round=500, time_budget=0, cores=1
+        )
+        capped = load_models(report['model_dir'])
+        assert capped['lgb_model'].num_trees() == base_trees['lgb'] + 1
+        assert capped['xgb_model'].num_boosted_rounds() == base_trees['xgb'] + 1
+        assert capped['catboost_model'].tree_count_ == base_trees['catboost'] + 1
+
+    print("\n✅ Test 3 PASSED!\n")
+
+
+class _RoundClock:
+    """Fake time.time(): passes the deadline (1.0) on the n-th call, one call per round"""
+
+    def __init__(self, rounds):
+        self.rounds = rounds
+        self.calls = 0
+
+    def __call__(self):
+        self.calls += 1
+        return 0.0 if self.calls < self.rounds else 10.0
+
+
+def test_time_budget_keeps_best_iteration():
+    """A deadline after validation stopped improving keeps the best round, not the last"""
+
+    print("\n" + "="*80)
+    print("TEST 4: Time Budget Keeps the Best Iteration")
+    print("="*80)
+
+    rng = np.random.default_rng(0)
+    X_train = pd.DataFrame(rng.normal(size=(2000, 4)), columns=list('abcd'))
+    X_val = pd.DataFrame(rng.normal(size=(500, 4)), columns=list('abcd'))
+    signal = lambda X: 10 * X['a'] + 5 * X['b']
+    # Validation targets are a damped signal: fitting beyond the first rounds hurts
+    y_train, y_val = signal(X_train), 0.3 * signal(X_val)
+
+    def train(name, y_train, y_val):
+        real_time = save_trained_models.time
+        save_trained_models.time = types.SimpleNamespace(time=_RoundClock(60), perf_counter=time.perf_counter)
+        try:
+            return TRAINERS[name](X_train, y_train, X_val, y_val, 1, 500, deadline=1.0)
+        finally:
+            save_trained_models.time = real_time
+
+    model, _, val_pred, best_iteration = train('lgb', y_train, y_val)
+
+    # Same 60 rounds without a deadline: early stopping picks the best round itself
+    reference, _, reference_pred, reference_best = TRAINERS['lgb'](X_train, y_train, X_val, y_val, 1, 60)
+    print(f"LightGBM best iteration with deadline: {best_iteration}, without: {reference_best}, "
+          f"trees saved: {model.num_trees()}")
+    assert best_iteration == reference_best == model.best_iteration < 40
+    assert model.num_trees() == best_iteration
+    assert np.allclose(val_pred, reference_pred)
+
+    # XGBoost (0-based best_iteration): the saved booster stops at the best round.
+    # max_delta_step caps each round's step, so scale the targets to overshoot within 60 rounds
+    y_train, y_val = y_train / 20, y_val / 20
+    model, _, val_pred, best_iteration = train('xgb', y_train, y_val)
+    reference, _, reference_pred, reference_best = TRAINERS['xgb'](X_train, y_train, X_val, y_val, 1, 60)
+    print(f"XGBoost best iteration with deadline: {best_iteration}, without: {reference_best}, "
+          f"trees saved: {model.num_boosted_rounds()}")
+    assert best_iteration == reference_best == model.best_iteration < 40
+    assert model.num_boosted_rounds() == best_iteration + 1
+    assert np.allclose(val_pred, reference_pred)
+    X_check = xgb.DMatrix(X_val)
+    assert np.allclose(model.predict(X_check), reference.predict(X_check))
+
+    print("\n✅ Test 4 PASSED!\n")
+
+
+if __name__ == "__main__":
+    test_trained_models_load_and_predict()
+    test_parallel_training_matches_sequential()
+    test_incremental_retrain_adds_trees()
+    test_time_budget_keeps_best_iteration()